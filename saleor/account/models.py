@@ -7,8 +7,9 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
-from django.db.models import Q, Value
+from django.db.models import Exists, OuterRef, Q, Value
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from django_countries.fields import Country, CountryField
@@ -19,6 +20,7 @@ from ..core.models import ModelWithMetadata
 from ..core.permissions import AccountPermissions, BasePermissionEnum
 from ..core.utils.json_serializer import CustomJsonEncoder
 from . import CustomerEvents
+from .search import USER_SEARCH_FIELDS, prepare_user_search_document_value
 from .validators import validate_possible_number
 
 
@@ -82,6 +84,15 @@ class Address(models.Model):
 
     __hash__ = models.Model.__hash__
 
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if not is_new:
+            # Users copy their default shipping address into the search document.
+            for user in User.objects.filter(default_shipping_address=self):
+                user.default_shipping_address = self
+                user.save(update_fields=["search_document"])
+
     def as_data(self):
         """Return the address as a dict suitable for passing as kwargs.
 
@@ -122,8 +133,14 @@ class UserManager(BaseUserManager):
         )
 
     def customers(self):
-        return self.get_queryset().filter(
-            Q(is_staff=False) | (Q(is_staff=True) & Q(orders__isnull=False))
+        # A subquery instead of a join with orders keeps the rows distinct.
+        orders = self.model.orders.rel.related_model.objects.filter(
+            user_id=OuterRef("pk")
+        )
+        return (
+            self.get_queryset()
+            .annotate(has_orders=Exists(orders.values("pk")))
+            .filter(Q(is_staff=False) | (Q(is_staff=True) & Q(has_orders=True)))
         )
 
     def staff(self):
@@ -148,6 +165,7 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
         Address, related_name="+", null=True, blank=True, on_delete=models.SET_NULL
     )
     avatar = VersatileImageField(upload_to="user-avatars", blank=True, null=True)
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     USERNAME_FIELD = "email"
 
@@ -159,6 +177,33 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             (AccountPermissions.MANAGE_USERS.codename, "Manage customers."),
             (AccountPermissions.MANAGE_STAFF.codename, "Manage staff."),
         )
+        indexes = [
+            GinIndex(
+                name="user_search_gin",
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if not set(update_fields) & {*USER_SEARCH_FIELDS, "search_document"}:
+                super().save(*args, **kwargs)
+                return
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        is_new = self._state.adding
+        previous_document = self.search_document
+        self.search_document = prepare_user_search_document_value(self)
+        super().save(*args, **kwargs)
+        if not is_new and self.search_document != previous_document:
+            self.update_orders_search_document()
+
+    def update_orders_search_document(self):
+        # Orders copy the customer's name and email into their search document.
+        from ..order.search import update_orders_search_document
+
+        update_orders_search_document(self.orders.select_related("user"))
 
     def get_full_name(self):
         if self.first_name or self.last_name:
@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING, Iterable, List
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import User
+
+# Fields of the user and its default shipping address that the search document
+# is built from. Saving any of them refreshes the document.
+USER_SEARCH_FIELDS = (
+    "email",
+    "first_name",
+    "last_name",
+    "default_shipping_address",
+)
+
+
+def prepare_user_search_document_value(user: "User") -> str:
+    """Return the lower-cased text that customer and staff search matches against.
+
+    Values are separated by new lines so a phrase never matches across two of them.
+    """
+    values: List[str] = [user.email, user.first_name, user.last_name]
+    address = user.default_shipping_address
+    if address:
+        values += [
+            address.first_name,
+            address.last_name,
+            address.city,
+            address.country.code,
+            str(address.country.name),
+        ]
+    return "\n".join(value for value in values if value).lower()
+
+
+def update_users_search_document(users: Iterable["User"]):
+    from .models import User
+
+    users = list(users)
+    for user in users:
+        user.search_document = prepare_user_search_document_value(user)
+    User.objects.bulk_update(users, ["search_document"], batch_size=500)
@@ -0,0 +1,20 @@
+"""ASGI config for saleor project.
+
+It exposes the ASGI callable as a module-level variable named ``application``
+and can be served by any ASGI server, e.g. ``uvicorn saleor.asgi:application``.
+
+Requests are handled by the same synchronous views as under WSGI, which Django
+runs in a worker thread. Enable ``GRAPHQL_CONCURRENT_EXECUTION`` to fan out
+batched operations and top-level query fields to a pool of threads; calls to
+external services made by resolvers remain blocking.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+from saleor.asgi.health_check import health_check
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "saleor.settings")
+
+application = get_asgi_application()
+application = health_check(application, "/health/")
@@ -0,0 +1,15 @@
+def health_check(application, health_url):
+    async def health_check_wrapper(scope, receive, send):
+        if scope.get("type") == "http" and scope.get("path") == health_url:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/plain")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await application(scope, receive, send)
+
+    return health_check_wrapper
@@ -107,6 +107,14 @@ class Checkout(ModelWithMetadata):
     def __repr__(self):
         return "Checkout(quantity=%s)" % (self.quantity,)
 
+    def save(self, *args, **kwargs):
+        # `last_change` versions the cached prices of the checkout, so every
+        # save has to bump it.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "last_change" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "last_change"]
+        super().save(*args, **kwargs)
+
     def __iter__(self):
         return iter(self.lines.all())
 
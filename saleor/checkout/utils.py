@@ -1,7 +1,7 @@
 """Checkout-related utility functions."""
 from datetime import date
 from decimal import Decimal
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -40,7 +40,7 @@ from ..order.emails import send_order_confirmation, send_staff_order_confirmatio
 from ..order.models import Order, OrderLine
 from ..plugins.manager import get_plugins_manager
 from ..shipping.models import ShippingMethod
-from ..warehouse.availability import check_stock_quantity
+from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from ..warehouse.management import allocate_stock
 from . import AddressType
 from .models import Checkout, CheckoutLine
@@ -101,24 +101,72 @@ def update_checkout_quantity(checkout):
     manager.checkout_quantity_changed(checkout)
 
 
-def check_variant_in_stock(
-    checkout, variant, quantity=1, replace=False, check_quantity=True
-) -> Tuple[int, Optional[CheckoutLine]]:
-    """Check if a given variant is in stock and return the new quantity + line."""
-    line = checkout.lines.filter(variant=variant).first()
-    line_quantity = 0 if line is None else line.quantity
-
-    new_quantity = quantity if replace else (quantity + line_quantity)
+def add_variants_to_checkout(
+    checkout, variants, quantities, replace=False, check_quantity=True
+):
+    """Add product variants to checkout in bulk.
 
-    if new_quantity < 0:
-        raise ValueError(
-            "%r is not a valid quantity (results in %r)" % (quantity, new_quantity)
+    Existing lines are loaded once, the stock of all variants is checked in
+    a single query and the checkout quantity is updated once at the end.
+    Quantities of a variant given more than once are summed up, or the last
+    one is used if `replace` is truthy.
+    """
+    lines_by_variant: Dict[int, CheckoutLine] = {}
+    for line in checkout.lines.all():
+        lines_by_variant.setdefault(line.variant_id, line)
+
+    variants_by_pk = {}
+    new_quantities: Dict[int, int] = {}
+    for variant, quantity in zip(variants, quantities):
+        line = lines_by_variant.get(variant.pk)
+        line_quantity = new_quantities.get(
+            variant.pk, 0 if line is None else line.quantity
         )
+        new_quantity = quantity if replace else (quantity + line_quantity)
+        if new_quantity < 0:
+            raise ValueError(
+                "%r is not a valid quantity (results in %r)" % (quantity, new_quantity)
+            )
+        variants_by_pk[variant.pk] = variant
+        new_quantities[variant.pk] = new_quantity
+
+    if check_quantity:
+        variant_pks = [pk for pk, quantity in new_quantities.items() if quantity > 0]
+        if variant_pks:
+            check_stock_quantity_bulk(
+                [variants_by_pk[pk] for pk in variant_pks],
+                checkout.get_country(),
+                [new_quantities[pk] for pk in variant_pks],
+            )
 
-    if new_quantity > 0 and check_quantity:
-        check_stock_quantity(variant, checkout.get_country(), new_quantity)
+    lines_to_create = []
+    lines_to_update = []
+    line_pks_to_delete = []
+    for variant_pk, new_quantity in new_quantities.items():
+        line = lines_by_variant.get(variant_pk)
+        if new_quantity == 0:
+            if line is not None:
+                line_pks_to_delete.append(line.pk)
+        elif line is None:
+            lines_to_create.append(
+                CheckoutLine(
+                    checkout=checkout,
+                    variant=variants_by_pk[variant_pk],
+                    quantity=new_quantity,
+                )
+            )
+        elif line.quantity != new_quantity:
+            line.quantity = new_quantity
+            lines_to_update.append(line)
 
-    return new_quantity, line
+    if line_pks_to_delete:
+        CheckoutLine.objects.filter(pk__in=line_pks_to_delete).delete()
+    if lines_to_create:
+        CheckoutLine.objects.bulk_create(lines_to_create)
+    if lines_to_update:
+        CheckoutLine.objects.bulk_update(lines_to_update, ["quantity"])
+
+    update_checkout_quantity(checkout)
 
 
 def add_variant_to_checkout(
@@ -129,29 +177,10 @@ def add_variant_to_checkout(
     If `replace` is truthy then any previous quantity is discarded instead
     of added to.
     """
-
-    new_quantity, line = check_variant_in_stock(
-        checkout,
-        variant,
-        quantity=quantity,
-        replace=replace,
-        check_quantity=check_quantity,
+    add_variants_to_checkout(
+        checkout, [variant], [quantity], replace=replace, check_quantity=check_quantity,
     )
 
-    if line is None:
-        line = checkout.lines.filter(variant=variant).first()
-
-    if new_quantity == 0:
-        if line is not None:
-            line.delete()
-    elif line is None:
-        checkout.lines.create(checkout=checkout, variant=variant, quantity=new_quantity)
-    elif new_quantity > 0:
-        line.quantity = new_quantity
-        line.save(update_fields=["quantity"])
-
-    update_checkout_quantity(checkout)
-
 
 def _check_new_checkout_address(checkout, address, address_type):
     """Check if and address in checkout has changed and if to remove old one."""
@@ -0,0 +1,63 @@
+"""Routing of database reads to read replicas.
+
+Reads go to the primary database unless a replica was chosen for the current
+context with `use_read_database`. Writes always go to the primary, and so do
+reads made inside a transaction on the primary, such as the
+`select_for_update` paths of stock allocation; this keeps locked rows and rows
+written by the transaction consistent with what it reads.
+
+The chosen alias is stored in a context variable, so it doesn't leak between
+requests handled by the same thread.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_read_database: ContextVar[Optional[str]] = ContextVar("read_database", default=None)
+
+
+def get_read_database() -> Optional[str]:
+    """Return the alias of the replica chosen for the current context."""
+    return _read_database.get()
+
+
+@contextmanager
+def use_read_database(alias: Optional[str]):
+    """Route reads made in the block to the given database.
+
+    `None` routes reads to the primary database.
+    """
+    token = _read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_database.reset(token)
+
+
+def choose_replica() -> Optional[str]:
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas:
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = get_read_database()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Instances read from a replica would otherwise route reads of
+            # their relations to the replica.
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica are saved to the primary database.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
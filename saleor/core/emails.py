@@ -1,11 +1,12 @@
 from urllib.parse import urlsplit
 
-from django.contrib.sites.models import Site
+from ..site.snapshot import get_site_settings
 
 
 def get_email_context():
-    site: Site = Site.objects.get_current()
-    send_email_kwargs = {"from_email": site.settings.default_from_email}
+    site_settings = get_site_settings()
+    site = site_settings.site
+    send_email_kwargs = {"from_email": site_settings.default_from_email}
     email_template_context = {
         "domain": site.domain,
         "site_name": site.name,
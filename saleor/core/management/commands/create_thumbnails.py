@@ -1,9 +1,10 @@
 import logging
 
 from django.core.management.base import BaseCommand
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
 
-from ....product.models import ProductImage
+from ....account.models import User
+from ....product.models import Category, Collection, ProductImage
+from ...renditions import RenditionWarmer
 
 logger = logging.getLogger(__name__)
 
@@ -11,20 +12,42 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = "Generate thumbnails for all images"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes generating thumbnails.",
+        )
+
     def handle(self, *args, **options):
+        self.workers = options["workers"]
         self.warm_products()
+        self.warm_background_images()
+        self.warm_user_avatars()
 
-    def warm_products(self):
-        self.stdout.write("Products thumbnails generation:")
-        warmer = VersatileImageFieldWarmer(
-            instance_or_queryset=ProductImage.objects.all(),
-            rendition_key_set="products",
-            image_attr="image",
-            verbose=True,
+    def warm(self, queryset, size_set, image_attr):
+        warmer = RenditionWarmer(
+            size_set=size_set, image_attr=image_attr, workers=self.workers
         )
-        num_created, failed_to_create = warmer.warm()
+        num_created, failed_to_create = warmer.warm(queryset)
+        self.stdout.write("Created %d thumbnails" % num_created)
         self.log_failed_images(failed_to_create)
 
+    def warm_products(self):
+        self.stdout.write("Products thumbnails generation:")
+        self.warm(ProductImage.objects.all(), "products", "image")
+
+    def warm_background_images(self):
+        self.stdout.write("Background images thumbnails generation:")
+        for model in [Category, Collection]:
+            queryset = model.objects.exclude(background_image="")
+            self.warm(queryset, "background_images", "background_image")
+
+    def warm_user_avatars(self):
+        self.stdout.write("User avatars thumbnails generation:")
+        self.warm(User.objects.exclude(avatar=""), "user_avatars", "avatar")
+
     def log_failed_images(self, failed_to_create):
         if failed_to_create:
             self.stderr.write("Failed to generate thumbnails:")
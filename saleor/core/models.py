@@ -3,12 +3,17 @@ from typing import Any
 
 from django.contrib.postgres.fields import JSONField
 from django.db import models
-from django.db.models import F, Max, Q
+from django.db.models import Max, Q
 
 from . import JobStatus
 from .permissions import ProductPermissions
 from .utils.json_serializer import CustomJsonEncoder
 
+# Distance between the sort orders of consecutive new items. Sort orders are
+# sparse so that an item can be moved between two others by updating only its
+# own row; see `saleor.graphql.core.utils.reordering`.
+SORT_ORDER_GAP = 1024
+
 
 class SortableModel(models.Model):
     sort_order = models.IntegerField(editable=False, db_index=True, null=True)
@@ -28,16 +33,27 @@ class SortableModel(models.Model):
         if self.pk is None:
             qs = self.get_ordering_queryset()
             existing_max = self.get_max_sort_order(qs)
-            self.sort_order = 0 if existing_max is None else existing_max + 1
+            self.sort_order = (
+                0 if existing_max is None else existing_max + SORT_ORDER_GAP
+            )
         super().save(*args, **kwargs)
 
-    def delete(self, *args, **kwargs):
-        if self.sort_order is not None:
-            qs = self.get_ordering_queryset()
-            qs.filter(sort_order__gt=self.sort_order).update(
-                sort_order=F("sort_order") - 1
-            )
-        super().delete(*args, **kwargs)
+    @classmethod
+    def bulk_append(cls, instances, ordering_queryset=None):
+        """Create the instances at the end of their ordering queryset.
+
+        All the instances have to share the ordering queryset. Their sort
+        orders are assigned from a single aggregate instead of one per row.
+        """
+        if not instances:
+            return []
+        if ordering_queryset is None:
+            ordering_queryset = instances[0].get_ordering_queryset()
+        existing_max = instances[0].get_max_sort_order(ordering_queryset)
+        start = 0 if existing_max is None else existing_max + SORT_ORDER_GAP
+        for index, instance in enumerate(instances):
+            instance.sort_order = start + index * SORT_ORDER_GAP
+        return cls.objects.bulk_create(instances)
 
 
 class PublishedQuerySet(models.QuerySet):
@@ -0,0 +1,196 @@
+"""Renditions (resized copies) of uploaded images.
+
+Renditions are defined per size set in `VERSATILEIMAGEFIELD_RENDITION_KEY_SETS`.
+`RenditionWarmer` creates the missing ones for many images at once: it lists
+every storage directory once instead of checking each rendition separately and
+renders images in a pool of worker processes.
+
+Storefront requests never render images. With `QUEUE_MISSING_RENDITIONS`
+enabled, a rendition that isn't known to exist is queued for a Celery worker
+and the original image is served until it's ready.
+"""
+import logging
+import posixpath
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from versatileimagefield.settings import (
+    VERSATILEIMAGEFIELD_CACHE_LENGTH,
+    cache as rendition_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+RENDITION_QUEUED_KEY_PREFIX = "rendition_queued:"
+# How long a queued rendition isn't queued again.
+RENDITION_QUEUED_TIMEOUT = 60 * 10
+
+
+def get_size_keys(size_set: str) -> List[str]:
+    """Return rendition keys of the size set, e.g. `thumbnail__540x540`."""
+    return [key for _, key in settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS[size_set]]
+
+
+def get_rendition(image_file, size_key: str):
+    """Return the sized image of the given key.
+
+    It's only rendered if `create_on_demand` is set on the image file.
+    """
+    method, size = size_key.split("__")
+    return getattr(image_file, method)[size]
+
+
+def is_rendition_known(rendition) -> bool:
+    # The same flag versatileimagefield sets after rendering an image.
+    return bool(rendition.url and rendition_cache.get(rendition.url))
+
+
+def mark_renditions_known(renditions: Iterable):
+    urls = {rendition.url: 1 for rendition in renditions if rendition.url}
+    if urls:
+        rendition_cache.set_many(urls, VERSATILEIMAGEFIELD_CACHE_LENGTH)
+
+
+def queue_missing_rendition(image_file, size_key: str, rendition) -> bool:
+    """Queue rendering of the rendition unless it is already queued.
+
+    Return True if the task was sent.
+    """
+    from .tasks import create_renditions_task
+
+    if not cache.add(
+        RENDITION_QUEUED_KEY_PREFIX + rendition.name, 1, RENDITION_QUEUED_TIMEOUT
+    ):
+        return False
+    instance = image_file.instance
+    create_renditions_task.delay(
+        model=instance._meta.label,
+        pk=instance.pk,
+        image_attr=image_file.field.name,
+        size_keys=[size_key],
+    )
+    return True
+
+
+def create_renditions(
+    model: str, pk, image_attr: str, size_keys: List[str]
+) -> Tuple[int, List[str]]:
+    """Render the given renditions of a single image.
+
+    Return the number of created renditions and paths of the failed ones.
+    """
+    instance = apps.get_model(model).objects.filter(pk=pk).first()
+    image_file = getattr(instance, image_attr, None)
+    if not image_file:
+        return 0, []
+    image_file.create_on_demand = True
+    num_created = 0
+    failed = []
+    for size_key in size_keys:
+        try:
+            get_rendition(image_file, size_key)
+        except Exception:
+            logger.exception(
+                "Rendition generation failed",
+                extra={"path": image_file.name, "size_key": size_key},
+            )
+            failed.append("%s (%s)" % (image_file.name, size_key))
+        else:
+            num_created += 1
+    return num_created, failed
+
+
+class RenditionWarmer:
+    """Create missing renditions of many images of one model field."""
+
+    def __init__(
+        self,
+        size_set: str,
+        image_attr: str = "image",
+        workers: int = 1,
+        batch_size: int = 100,
+    ):
+        self.size_keys = get_size_keys(size_set)
+        self.image_attr = image_attr
+        self.workers = workers
+        self.batch_size = batch_size
+        # File names in storage directories, listed once per warmer.
+        self._listings: Dict[str, Set[str]] = {}
+
+    def _list_directory(self, storage, directory: str) -> Set[str]:
+        if directory not in self._listings:
+            try:
+                _dirs, files = storage.listdir(directory)
+            except (OSError, NotImplementedError):
+                files = []
+            self._listings[directory] = set(files)
+        return self._listings[directory]
+
+    def get_missing(self, instances) -> List[Tuple[object, List[str]]]:
+        """Return instances with keys of their renditions missing in storage."""
+        missing = []
+        existing = []
+        for instance in instances:
+            image_file = getattr(instance, self.image_attr)
+            if not image_file:
+                continue
+            image_file.create_on_demand = False
+            size_keys = []
+            for size_key in self.size_keys:
+                rendition = get_rendition(image_file, size_key)
+                directory, filename = posixpath.split(rendition.name)
+                files = self._list_directory(image_file.storage, directory)
+                if filename in files:
+                    existing.append(rendition)
+                else:
+                    size_keys.append(size_key)
+            if size_keys:
+                missing.append((instance, size_keys))
+        mark_renditions_known(existing)
+        return missing
+
+    def _iterate_missing(self, queryset):
+        last_pk = None
+        queryset = queryset.order_by("pk")
+        while True:
+            batch_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch_qs[: self.batch_size])
+            if not batch:
+                return
+            yield from self.get_missing(batch)
+            last_pk = batch[-1].pk
+
+    def warm(self, queryset) -> Tuple[int, List[str]]:
+        """Create the missing renditions of all images in the queryset.
+
+        Return the number of created renditions and paths of the failed ones,
+        the same as `VersatileImageFieldWarmer.warm`.
+        """
+        model = queryset.model._meta.label
+        tasks = (
+            (model, instance.pk, self.image_attr, size_keys)
+            for instance, size_keys in self._iterate_missing(queryset)
+        )
+        num_created = 0
+        failed: List[str] = []
+        if self.workers > 1:
+            # Listing storage is done; the missing renditions are collected
+            # upfront, so the forked workers don't share database connections.
+            tasks = list(tasks)  # type: ignore
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(create_renditions, *task) for task in tasks]
+                for future in as_completed(futures):
+                    created, task_failed = future.result()
+                    num_created += created
+                    failed.extend(task_failed)
+        else:
+            for task in tasks:
+                created, task_failed = create_renditions(*task)
+                num_created += created
+                failed.extend(task_failed)
+        return num_created, failed
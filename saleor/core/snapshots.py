@@ -0,0 +1,82 @@
+"""Process-level snapshots of rarely changing data.
+
+A snapshot keeps the result of an expensive build function in the memory of
+the current process. Each snapshot has a version stamp stored in the shared
+Django cache; bumping the stamp makes every process rebuild its copy on the
+next access, so a single cache read replaces the database queries.
+
+The version is bumped once the transaction that changed the data commits.
+Until then the process making the changes builds the snapshot from its own
+uncommitted data without keeping it, so a rollback leaves nothing stale
+behind. Processes rebuild their copies at least every `PROCESS_SNAPSHOT_MAX_AGE`
+seconds, which bounds the staleness when the cache isn't shared between
+processes or when the data is changed without invalidating the snapshot.
+"""
+import threading
+import time
+import uuid
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+T = TypeVar("T")
+
+SNAPSHOT_VERSION_KEY_PREFIX = "snapshot_version:"
+
+
+class VersionedSnapshot(Generic[T]):
+    def __init__(self, name: str, build: Callable[[], T]):
+        self.name = name
+        self.build = build
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._built_at = 0.0
+        self._value: Optional[T] = None
+
+    @property
+    def version_key(self) -> str:
+        return SNAPSHOT_VERSION_KEY_PREFIX + self.name
+
+    def get_version(self) -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            # Another process may have stored its version in the meantime.
+            if not cache.add(self.version_key, version, timeout=None):
+                version = cache.get(self.version_key, version)
+        return version
+
+    def get(self) -> T:
+        if self.has_pending_invalidation():
+            return self.build()
+        version = self.get_version()
+        if not self.is_current(version):
+            with self._lock:
+                if not self.is_current(version):
+                    self._value = self.build()
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._value  # type: ignore
+
+    def is_current(self, version: str) -> bool:
+        age = time.monotonic() - self._built_at
+        return version == self._version and age < settings.PROCESS_SNAPSHOT_MAX_AGE
+
+    def has_pending_invalidation(self) -> bool:
+        """Return True if the current transaction changed the snapshot data."""
+        connection = transaction.get_connection()
+        # Callbacks of rolled back transactions and savepoints are discarded.
+        return any(func == self._bump_version for _, func in connection.run_on_commit)
+
+    def invalidate(self):
+        """Make all processes rebuild the snapshot once the changes commit."""
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self):
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+    def invalidate_handler(self, *_args: Any, **_kwargs: Any):
+        """Invalidate the snapshot; suitable as a model signal receiver."""
+        self.invalidate()
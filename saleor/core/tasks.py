@@ -0,0 +1,10 @@
+from typing import List
+
+from ..celeryconf import app
+from .renditions import create_renditions
+
+
+@app.task
+def create_renditions_task(model: str, pk, image_attr: str, size_keys: List[str]):
+    """Render image renditions that were missing when they were requested."""
+    create_renditions(model, pk, image_attr, size_keys)
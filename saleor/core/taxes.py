@@ -4,9 +4,10 @@ from typing import Union
 
 from babel.numbers import get_currency_precision
 from django.conf import settings
-from django.contrib.sites.models import Site
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
+from ..site.snapshot import get_site_settings
+
 
 class TaxError(Exception):
     """Default tax error."""
@@ -26,15 +27,15 @@ def zero_taxed_money(currency: str = settings.DEFAULT_CURRENCY) -> TaxedMoney:
 
 
 def include_taxes_in_prices() -> bool:
-    return Site.objects.get_current().settings.include_taxes_in_prices
+    return get_site_settings().include_taxes_in_prices
 
 
 def display_gross_prices() -> bool:
-    return Site.objects.get_current().settings.display_gross_prices
+    return get_site_settings().display_gross_prices
 
 
 def charge_taxes_on_shipping() -> bool:
-    return Site.objects.get_current().settings.charge_taxes_on_shipping
+    return get_site_settings().charge_taxes_on_shipping
 
 
 def get_display_price(
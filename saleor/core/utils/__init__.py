@@ -14,7 +14,8 @@ from django_countries.fields import Country
 from django_prices_openexchangerates import exchange_currency
 from geolite2 import geolite2
 from prices import MoneyRange
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
+
+from ..renditions import RenditionWarmer
 
 georeader = geolite2.reader()
 logger = logging.getLogger(__name__)
@@ -109,11 +110,9 @@ def create_thumbnails(pk, model, size_set, image_attr=None):
     if image_instance.name == "":
         # There is no file, skip processing
         return
-    warmer = VersatileImageFieldWarmer(
-        instance_or_queryset=instance, rendition_key_set=size_set, image_attr=image_attr
-    )
+    warmer = RenditionWarmer(size_set=size_set, image_attr=image_attr)
     logger.info("Creating thumbnails for  %s", pk)
-    num_created, failed_to_create = warmer.warm()
+    num_created, failed_to_create = warmer.warm(model.objects.filter(pk=instance.pk))
     if num_created:
         logger.info("Created %d thumbnails", num_created)
     if failed_to_create:
@@ -66,6 +66,8 @@ from ...product.thumbnails import (
     create_collection_background_image_thumbnails,
     create_product_thumbnails,
 )
+from ...product.utils.attributes import update_products_attribute_values
+from ...shipping.index import shipping_zone_index
 from ...shipping.models import ShippingMethod, ShippingMethodType, ShippingZone
 from ...warehouse.management import increase_stock
 from ...warehouse.models import Stock, Warehouse
@@ -331,6 +333,7 @@ def create_products_by_schema(placeholder_dir, create_images):
     assign_attributes_to_variants(
         variant_attributes=types["product.assignedvariantattribute"]
     )
+    update_products_attribute_values(Product.objects.values_list("pk", flat=True))
     create_collections(
         data=types["product.collection"], placeholder_dir=placeholder_dir
     )
@@ -664,6 +667,8 @@ def create_shipping_zone(shipping_methods_names, countries, shipping_zone_name):
             for name in shipping_methods_names
         ]
     )
+    # Bulk created methods don't send the signals the index is invalidated by.
+    shipping_zone_index.invalidate()
     return "Shipping Zone: %s" % shipping_zone
 
 
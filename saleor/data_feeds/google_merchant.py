@@ -1,24 +1,43 @@
 import csv
 import gzip
-from typing import Iterable
+import json
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from io import StringIO
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.contrib.syndication.views import add_domain
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db import connections
+from django.db.models import Count, F, Max
 from django.utils import timezone
 from django.utils.encoding import smart_text
 
 from ..core.taxes import zero_money
 from ..discount import DiscountInfo
 from ..discount.utils import fetch_discounts
-from ..product.models import Attribute, AttributeValue, Category, ProductVariant
-from ..warehouse.availability import is_variant_in_stock
+from ..product.category_tree import category_tree
+from ..product.models import Attribute, AttributeValue, ProductVariant
+from ..warehouse.availability import get_variant_ids_in_stock, is_variant_in_stock
+
+logger = logging.getLogger(__name__)
 
 CATEGORY_SEPARATOR = " > "
 
 FILE_PATH = "google-feed.csv.gz"
 
+# Variants are split into shards of consecutive ids. Every shard is written to its
+# own gzip file by a worker and the files are concatenated into the final feed.
+SHARD_SIZE = 10000
+# Number of variants fetched (with their prefetched relations) in one query.
+CHUNK_SIZE = 500
+
 ATTRIBUTES = [
     "id",
     "title",
@@ -45,12 +64,42 @@ def get_feed_file_url():
     return default_storage.url(FILE_PATH)
 
 
+@dataclass
+class FeedContext:
+    """Data shared by all feed items, fetched once per feed or worker."""
+
+    discounts: List[DiscountInfo]
+    attributes_dict: Dict[str, int]
+    attribute_values_dict: Dict[str, str]
+    category_paths: Dict[int, str]
+    current_site: Site
+
+
+def get_feed_context() -> FeedContext:
+    return FeedContext(
+        discounts=list(fetch_discounts(timezone.now())),
+        attributes_dict={a.slug: a.pk for a in Attribute.objects.all()},
+        attribute_values_dict={
+            smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
+        },
+        category_paths=get_category_paths(),
+        current_site=Site.objects.get_current(),
+    )
+
+
+def get_category_paths() -> Dict[int, str]:
+    """Return the Google category path of every category."""
+    tree = category_tree.get()
+    return {pk: CATEGORY_SEPARATOR.join(tree.get_name_path(pk)) for pk in tree.parents}
+
+
 def get_feed_items():
     items = ProductVariant.objects.all()
     items = items.select_related("product")
     items = items.prefetch_related(
         "images",
         "product__category",
+        "product__collections",
         "product__images",
         "product__product_type__product_attributes",
         "product__product_type__variant_attributes",
@@ -58,6 +107,23 @@ def get_feed_items():
     return items
 
 
+def iterate_feed_items(
+    items, chunk_size: int = CHUNK_SIZE
+) -> Iterator[List[ProductVariant]]:
+    """Yield chunks of the items ordered by the primary key.
+
+    `iterator()` would skip `prefetch_related`, so chunks are fetched with keyset
+    pagination instead, and only one chunk is kept in memory at a time.
+    """
+    last_pk = 0
+    while True:
+        chunk = list(items.filter(pk__gt=last_pk).order_by("pk")[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
 def item_id(item: ProductVariant):
     return item.sku
 
@@ -139,8 +205,12 @@ def item_image_link(item: ProductVariant, current_site):
     return None
 
 
-def item_availability(item: ProductVariant):
-    if is_variant_in_stock(item, settings.DEFAULT_COUNTRY):
+def item_availability(item: ProductVariant, in_stock_ids: Optional[Set[int]] = None):
+    if in_stock_ids is None:
+        in_stock = is_variant_in_stock(item, settings.DEFAULT_COUNTRY)
+    else:
+        in_stock = item.pk in in_stock_ids
+    if in_stock:
         return "in stock"
     return "out of stock"
 
@@ -158,8 +228,9 @@ def item_google_product_category(item: ProductVariant, category_paths):
         raise Exception(f"Item {item} does not have category")
     if category.pk in category_paths:
         return category_paths[category.pk]
-    ancestors = [ancestor.name for ancestor in list(category.get_ancestors())]
-    category_path = CATEGORY_SEPARATOR.join(ancestors + [category.name])
+    category_path = CATEGORY_SEPARATOR.join(
+        category_tree.get().get_name_path(category.pk)
+    )
     category_paths[category.pk] = category_path
     return category_path
 
@@ -182,6 +253,7 @@ def item_attributes(
     discounts: Iterable[DiscountInfo],
     attributes_dict,
     attribute_values_dict,
+    in_stock_ids: Optional[Set[int]] = None,
 ):
     product_data = {
         "id": item_id(item),
@@ -190,7 +262,7 @@ def item_attributes(
         "condition": item_condition(item),
         "mpn": item_mpn(item),
         "item_group_id": item_group_id(item),
-        "availability": item_availability(item),
+        "availability": item_availability(item, in_stock_ids),
         "google_product_category": item_google_product_category(item, category_paths),
     }
 
@@ -215,37 +287,170 @@ def item_attributes(
     return product_data
 
 
+def write_feed_items(file_obj, items, context: FeedContext):
+    """Write rows of the given items into provided file object."""
+    writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
+    for chunk in iterate_feed_items(items):
+        in_stock_ids = get_variant_ids_in_stock(chunk, settings.DEFAULT_COUNTRY)
+        for item in chunk:
+            item_data = item_attributes(
+                item,
+                None,
+                context.category_paths,
+                context.current_site,
+                context.discounts,
+                context.attributes_dict,
+                context.attribute_values_dict,
+                in_stock_ids,
+            )
+            writer.writerow(item_data)
+
+
 def write_feed(file_obj):
     """Write feed contents info provided file object."""
     writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
     writer.writeheader()
-    categories = Category.objects.all()
-    discounts = fetch_discounts(timezone.now())
-    attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
-    }
-    category_paths = {}
-    current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
-            categories,
-            category_paths,
-            current_site,
-            discounts,
-            attributes_dict,
-            attribute_values_dict,
+    write_feed_items(file_obj, get_feed_items(), get_feed_context())
+
+
+def get_shard_path(file_path: str, index: int) -> str:
+    return f"{file_path}.shards/{index:06d}.csv.gz"
+
+
+def get_manifest_path(file_path: str) -> str:
+    return f"{file_path}.shards/manifest.json"
+
+
+def get_feed_shards(shard_size: int = SHARD_SIZE) -> Dict[int, str]:
+    """Return fingerprints of variant id shards, keyed by the shard index.
+
+    A fingerprint changes when variants are added to or removed from the shard or
+    when any of their products is saved, so unchanged shards can be reused.
+    Changes of stock levels and discounts don't alter fingerprints.
+    """
+    shards = (
+        ProductVariant.objects.annotate(shard=F("pk") / shard_size)
+        .values("shard")
+        .annotate(
+            count=Count("pk"), last_pk=Max("pk"), updated_at=Max("product__updated_at")
         )
-        writer.writerow(item_data)
+        .order_by("shard")
+    )
+    return {
+        shard["shard"]: "%s:%s:%s"
+        % (
+            shard["count"],
+            shard["last_pk"],
+            shard["updated_at"].isoformat() if shard["updated_at"] else "",
+        )
+        for shard in shards
+    }
+
+
+def load_manifest(file_path: str, shard_size: int) -> Dict[str, str]:
+    """Return fingerprints of the shards written by the previous run."""
+    manifest_path = get_manifest_path(file_path)
+    if not default_storage.exists(manifest_path):
+        return {}
+    with default_storage.open(manifest_path, "rb") as manifest_file:
+        manifest = json.loads(manifest_file.read().decode())
+    if manifest.get("shard_size") != shard_size:
+        return {}
+    return manifest["shards"]
+
 
+def save_storage_file(path: str, content):
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, content)
 
-def update_feed(file_path=FILE_PATH):
+
+def save_manifest(file_path: str, shard_size: int, shards: Dict[str, str]):
+    content = json.dumps({"shard_size": shard_size, "shards": shards})
+    save_storage_file(get_manifest_path(file_path), ContentFile(content.encode()))
+
+
+_worker_context: Optional[FeedContext] = None
+
+
+def _init_feed_worker(context: FeedContext):
+    global _worker_context
+    _worker_context = context
+
+
+def write_feed_shard(file_path: str, index: int, shard_size: int, context=None):
+    """Write variants of a single shard into a separate gzip file in storage."""
+    context = context or _worker_context
+    start = index * shard_size
+    items = get_feed_items().filter(pk__gte=start, pk__lt=start + shard_size)
+    with tempfile.TemporaryFile() as shard_file:
+        with gzip.open(shard_file, "wt") as output:
+            write_feed_items(output, items, context)
+        shard_file.seek(0)
+        save_storage_file(get_shard_path(file_path, index), File(shard_file))
+    return index
+
+
+def update_feed(
+    file_path=FILE_PATH,
+    workers: int = 1,
+    shard_size: int = SHARD_SIZE,
+    incremental: bool = False,
+):
     """Save updated feed into path provided as argument.
 
     Default path is defined in module as FILE_PATH.
+
+    Shards are written by a pool of `workers` processes. With `incremental` set,
+    shards whose fingerprint didn't change since the previous run are reused.
+    This also resumes an interrupted run. A full run is still needed to pick up
+    stock and discount changes.
     """
+    shards = get_feed_shards(shard_size)
+    previous_shards = load_manifest(file_path, shard_size) if incremental else {}
+    built_shards = {}
+    to_build = []
+    for index, fingerprint in shards.items():
+        reusable = previous_shards.get(str(index)) == fingerprint
+        if reusable and default_storage.exists(get_shard_path(file_path, index)):
+            built_shards[str(index)] = fingerprint
+        else:
+            to_build.append(index)
+
+    logger.info("Writing %s of %s feed shards.", len(to_build), len(shards))
+    context = get_feed_context()
+    if workers > 1 and len(to_build) > 1:
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_feed_worker, initargs=(context,),
+        ) as executor:
+            futures = [
+                executor.submit(write_feed_shard, file_path, index, shard_size)
+                for index in to_build
+            ]
+            for future in as_completed(futures):
+                index = future.result()
+                built_shards[str(index)] = shards[index]
+                save_manifest(file_path, shard_size, built_shards)
+    else:
+        for index in to_build:
+            write_feed_shard(file_path, index, shard_size, context)
+            built_shards[str(index)] = shards[index]
+            save_manifest(file_path, shard_size, built_shards)
+
+    for index in set(previous_shards) - set(built_shards):
+        shard_path = get_shard_path(file_path, int(index))
+        if default_storage.exists(shard_path):
+            default_storage.delete(shard_path)
+
+    header = StringIO()
+    csv.DictWriter(header, ATTRIBUTES, dialect=csv.excel_tab).writeheader()
     with default_storage.open(file_path, "wb") as output_file:
-        output = gzip.open(output_file, "wt")
-        write_feed(output)
-        output.close()
+        # Concatenated gzip members form a single valid gzip stream.
+        output_file.write(gzip.compress(header.getvalue().encode()))
+        for index in sorted(shards):
+            with default_storage.open(get_shard_path(file_path, index), "rb") as shard:
+                for data in iter(lambda: shard.read(1024 * 1024), b""):
+                    output_file.write(data)
+    save_manifest(file_path, shard_size, built_shards)
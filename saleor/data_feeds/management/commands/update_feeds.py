@@ -1,10 +1,36 @@
 from django.core.management import BaseCommand
 
-from ...google_merchant import update_feed
+from ...google_merchant import SHARD_SIZE, update_feed
 
 
 class Command(BaseCommand):
     help = "Update Google merchant feed"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes writing feed shards in parallel.",
+        )
+        parser.add_argument(
+            "--shard-size",
+            type=int,
+            default=SHARD_SIZE,
+            help="Size of variant id ranges written by a single worker.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Rewrite only shards with products changed since the last run. "
+                "Stock and discount changes are picked up by full runs only."
+            ),
+        )
+
     def handle(self, *args, **options):
-        update_feed()
+        update_feed(
+            workers=options["workers"],
+            shard_size=options["shard_size"],
+            incremental=options["incremental"],
+        )
@@ -138,7 +138,7 @@ def get_products_voucher_discount(voucher: "Voucher", prices: Iterable[Money]) -
 
 
 def _fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
-    from ..product.models import Category
+    from ..product.category_tree import category_tree
 
     categories = Sale.categories.through.objects.filter(
         sale_id__in=sale_pks
@@ -146,13 +146,11 @@ def _fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
     category_map: Dict[int, Set[int]] = defaultdict(set)
     for sale_pk, category_pk in categories:
         category_map[sale_pk].add(category_pk)
+    tree = category_tree.get()
     subcategory_map: Dict[int, Set[int]] = defaultdict(set)
     for sale_pk, category_pks in category_map.items():
-        subcategory_map[sale_pk] = set(
-            Category.tree.filter(pk__in=category_pks)
-            .get_descendants(include_self=True)
-            .values_list("pk", flat=True)
-        )
+        for category_pk in category_pks:
+            subcategory_map[sale_pk].update(tree.get_descendant_ids(category_pk))
     return subcategory_map
 
 
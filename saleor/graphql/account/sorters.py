@@ -2,6 +2,7 @@ import graphene
 from django.db.models import Count, QuerySet
 
 from ..core.types import SortInputObjectType
+from ..utils.sorting import annotate_search_rank
 
 
 class UserSortField(graphene.Enum):
@@ -9,6 +10,7 @@ class UserSortField(graphene.Enum):
     LAST_NAME = ["last_name", "first_name", "pk"]
     EMAIL = ["email"]
     ORDER_COUNT = ["order_count", "email"]
+    RANK = ["search_rank", "email"]
 
     @property
     def description(self):
@@ -21,6 +23,10 @@ class UserSortField(graphene.Enum):
     def qs_with_order_count(queryset: QuerySet) -> QuerySet:
         return queryset.annotate(order_count=Count("orders__id"))
 
+    @staticmethod
+    def qs_with_rank(queryset: QuerySet) -> QuerySet:
+        return annotate_search_rank(queryset)
+
 
 class UserSortingInput(SortInputObjectType):
     class Meta:
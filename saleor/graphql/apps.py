@@ -0,0 +1,10 @@
+from django.apps import AppConfig, apps
+
+
+class GraphQLAppConfig(AppConfig):
+    name = "saleor.graphql"
+
+    def ready(self):
+        from .response_cache import connect_invalidation_signals
+
+        connect_invalidation_signals(apps.get_models())
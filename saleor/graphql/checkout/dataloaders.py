@@ -1,7 +1,18 @@
 from collections import defaultdict
 
+from django.conf import settings
+from promise import Promise
+
 from ...checkout.models import CheckoutLine
 from ..core.dataloaders import DataLoader
+from ..discount.dataloaders import DiscountsByDateTimeLoader
+from ..response_cache import get_tag_versions
+from .price_snapshots import (
+    CHECKOUT_PRICES_TAGS,
+    calculate_checkout_prices,
+    get_cached_checkout_prices,
+    set_cached_checkout_prices,
+)
 
 
 class CheckoutLinesByCheckoutTokenLoader(DataLoader):
@@ -13,3 +24,41 @@ class CheckoutLinesByCheckoutTokenLoader(DataLoader):
         for variant in lines.iterator():
             line_map[variant.checkout_id].append(variant)
         return [line_map.get(checkout_id, []) for checkout_id in keys]
+
+
+class CheckoutPricesByCheckoutLoader(DataLoader):
+    """Load prices of checkouts from the cache or calculate the stale ones."""
+
+    context_key = "checkout_prices_by_checkout"
+
+    def batch_load(self, keys):
+        use_cache = settings.CHECKOUT_PRICES_CACHE_TIMEOUT > 0
+        if use_cache:
+            prices = get_cached_checkout_prices(keys)
+        else:
+            prices = [None] * len(keys)
+        stale = [checkout for checkout, price in zip(keys, prices) if price is None]
+        if not stale:
+            return prices
+        tag_versions = get_tag_versions(CHECKOUT_PRICES_TAGS) if use_cache else {}
+
+        def calculate_stale_prices(data):
+            lines_by_checkout, discounts = data
+            calculated = {}
+            for checkout, lines in zip(stale, lines_by_checkout):
+                checkout_prices = calculate_checkout_prices(checkout, lines, discounts)
+                if use_cache:
+                    set_cached_checkout_prices(checkout, tag_versions, checkout_prices)
+                calculated[checkout.pk] = checkout_prices
+            return [
+                price or calculated[checkout.pk]
+                for checkout, price in zip(keys, prices)
+            ]
+
+        lines = CheckoutLinesByCheckoutTokenLoader(self.context).load_many(
+            [checkout.token for checkout in stale]
+        )
+        discounts = DiscountsByDateTimeLoader(self.context).load(
+            self.context.request_time
+        )
+        return Promise.all([lines, discounts]).then(calculate_stale_prices)
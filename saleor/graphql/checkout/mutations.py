@@ -13,7 +13,7 @@ from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.utils import (
     abort_order_data,
     add_promo_code_to_checkout,
-    add_variant_to_checkout,
+    add_variants_to_checkout,
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
     create_order,
@@ -22,6 +22,7 @@ from ...checkout.utils import (
     prepare_order_data,
     recalculate_checkout_discount,
     remove_promo_code_from_checkout,
+    update_checkout_quantity,
 )
 from ...core import analytics
 from ...core.exceptions import InsufficientStock
@@ -34,7 +35,7 @@ from ...payment import PaymentError, gateway, models as payment_models
 from ...payment.interface import AddressData
 from ...payment.utils import store_customer_id
 from ...product import models as product_models
-from ...warehouse.availability import check_stock_quantity, get_available_quantity
+from ...warehouse.availability import check_stock_quantity_bulk, get_available_quantity
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.mutations import BaseMutation, ModelMutation
@@ -100,9 +101,9 @@ def update_checkout_shipping_method_if_invalid(
         checkout.save(update_fields=["shipping_method", "last_change"])
 
 
-def check_lines_quantity(variants, quantities, country):
-    """Check if stock is sufficient for each line in the list of dicts."""
-    for variant, quantity in zip(variants, quantities):
+def validate_lines_quantity(quantities):
+    """Check if each quantity is within the limits of a checkout line."""
+    for quantity in quantities:
         if quantity < 0:
             raise ValidationError(
                 {
@@ -122,19 +123,27 @@ def check_lines_quantity(variants, quantities, country):
                     )
                 }
             )
-        try:
-            check_stock_quantity(variant, country, quantity)
-        except InsufficientStock as e:
-            available_quantity = get_available_quantity(e.item, country)
-            message = (
-                "Could not add item "
-                + "%(item_name)s. Only %(remaining)d remaining in stock."
-                % {
-                    "remaining": available_quantity,
-                    "item_name": e.item.display_product(),
-                }
-            )
-            raise ValidationError({"quantity": ValidationError(message, code=e.code)})
+
+
+def get_insufficient_stock_error(
+    exc: InsufficientStock, country: str
+) -> ValidationError:
+    available_quantity = get_available_quantity(exc.item, country)
+    message = (
+        "Could not add item "
+        + "%(item_name)s. Only %(remaining)d remaining in stock."
+        % {"remaining": available_quantity, "item_name": exc.item.display_product()}
+    )
+    return ValidationError({"quantity": ValidationError(message, code=exc.code)})
+
+
+def check_lines_quantity(variants, quantities, country):
+    """Check if stock is sufficient for each line in the list of dicts."""
+    validate_lines_quantity(quantities)
+    try:
+        check_stock_quantity_bulk(variants, country, quantities)
+    except InsufficientStock as e:
+        raise get_insufficient_stock_error(e, country)
 
 
 class CheckoutLineInput(graphene.InputObjectType):
@@ -276,13 +285,10 @@ class CheckoutCreate(ModelMutation, I18nMixin):
 
         # Create the checkout lines
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(instance, variant, quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
+            try:
+                add_variants_to_checkout(instance, variants, quantities)
+            except InsufficientStock as exc:
+                raise get_insufficient_stock_error(exc, country.code)
 
         # Save provided addresses and associate them to the checkout
         cls.save_addresses(instance, cleaned_input)
@@ -342,18 +348,16 @@ class CheckoutLinesAdd(BaseMutation):
         variants = cls.get_nodes_or_error(variant_ids, "variant_id", ProductVariant)
         quantities = [line.get("quantity") for line in lines]
 
-        check_lines_quantity(variants, quantities, checkout.get_country())
+        validate_lines_quantity(quantities)
 
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(
-                        checkout, variant, quantity, replace=replace
-                    )
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
+            # Stock is checked for the resulting quantities of the lines.
+            try:
+                add_variants_to_checkout(
+                    checkout, variants, quantities, replace=replace
+                )
+            except InsufficientStock as exc:
+                raise get_insufficient_stock_error(exc, checkout.get_country())
 
         lines = list(checkout)
 
@@ -401,6 +405,7 @@ class CheckoutLineDelete(BaseMutation):
 
         if line and line in checkout.lines.all():
             line.delete()
+            update_checkout_quantity(checkout)
 
         lines = list(checkout)
 
@@ -0,0 +1,105 @@
+"""Cached prices of checkouts.
+
+Storefronts poll the prices of a checkout after every interaction. They are
+calculated through the plugins once and stored in the cache as a snapshot,
+keyed by the checkout token. A snapshot is current as long as the checkout's
+`last_change` and the response cache tag versions of products, sales, shipping
+methods, gift cards and tax settings are the ones it was calculated with. The
+snapshot and the tag versions come from a single cache read.
+
+Saving a checkout always bumps `last_change`, so every change of a checkout
+or its lines has to be followed by saving the checkout.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ...checkout import calculations
+from ...checkout.utils import get_valid_shipping_methods_for_checkout
+from ...core.taxes import display_gross_prices, zero_taxed_money
+from ...plugins.manager import get_plugins_manager
+from ..response_cache import PRODUCT_TAGS, get_many_with_tag_versions
+
+CHECKOUT_PRICES_KEY_PREFIX = "checkout_prices:"
+
+CHECKOUT_PRICES_TAGS = (*PRODUCT_TAGS, "gift_card", "plugin", "shipping", "site", "vat")
+
+
+def get_checkout_prices_key(checkout) -> str:
+    return CHECKOUT_PRICES_KEY_PREFIX + str(checkout.token)
+
+
+def get_cached_checkout_prices(checkouts: List) -> List[Optional[Dict[str, Any]]]:
+    """Return the current prices of the checkouts or None if they are stale."""
+    keys = [get_checkout_prices_key(checkout) for checkout in checkouts]
+    cached, tag_versions = get_many_with_tag_versions(keys, CHECKOUT_PRICES_TAGS)
+    prices = []
+    for checkout, key in zip(checkouts, keys):
+        snapshot = cached.get(key)
+        is_current = snapshot is not None and snapshot["version"] == (
+            checkout.last_change,
+            tag_versions,
+        )
+        prices.append(snapshot["prices"] if is_current else None)
+    return prices
+
+
+def set_cached_checkout_prices(
+    checkout, tag_versions: Dict[str, str], prices: Dict[str, Any]
+):
+    """Store prices calculated when the tags had the given versions.
+
+    Versions have to be read before the prices are calculated, so that a change
+    made in the meantime makes the snapshot stale instead of being missed.
+    """
+    snapshot = {"version": (checkout.last_change, tag_versions), "prices": prices}
+    cache.set(
+        get_checkout_prices_key(checkout),
+        snapshot,
+        settings.CHECKOUT_PRICES_CACHE_TIMEOUT,
+    )
+
+
+def get_available_shipping_methods(checkout, lines: Iterable, discounts) -> List:
+    """Return shipping methods valid for the checkout with taxed prices."""
+    available = get_valid_shipping_methods_for_checkout(checkout, lines, discounts)
+    if available is None:
+        return []
+
+    manager = get_plugins_manager()
+    display_gross = display_gross_prices()
+    for shipping_method in available:
+        # ignore mypy checking because it is checked in
+        # get_valid_shipping_methods_for_checkout
+        taxed_price = manager.apply_taxes_to_shipping(
+            shipping_method.price, checkout.shipping_address  # type: ignore
+        )
+        if display_gross:
+            shipping_method.price = taxed_price.gross
+        else:
+            shipping_method.price = taxed_price.net
+    return list(available)
+
+
+def calculate_checkout_prices(checkout, lines: List, discounts) -> Dict[str, Any]:
+    taxed_total = (
+        calculations.checkout_total(checkout=checkout, lines=lines, discounts=discounts)
+        - checkout.get_total_gift_cards_balance()
+    )
+    return {
+        "total_price": max(taxed_total, zero_taxed_money()),
+        "subtotal_price": calculations.checkout_subtotal(
+            checkout=checkout, lines=lines, discounts=discounts
+        ),
+        "shipping_price": calculations.checkout_shipping_price(
+            checkout=checkout, lines=lines, discounts=discounts
+        ),
+        "line_total_prices": {
+            line.pk: calculations.checkout_line_total(line=line, discounts=discounts)
+            for line in lines
+        },
+        "available_shipping_methods": get_available_shipping_methods(
+            checkout, lines, discounts
+        ),
+    }
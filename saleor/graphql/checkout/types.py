@@ -1,11 +1,8 @@
 import graphene
 from graphql_jwt.exceptions import PermissionDenied
-from promise import Promise
 
-from ...checkout import calculations, models
-from ...checkout.utils import get_valid_shipping_methods_for_checkout
+from ...checkout import models
 from ...core.permissions import AccountPermissions, CheckoutPermissions
-from ...core.taxes import display_gross_prices, zero_taxed_money
 from ...plugins.manager import get_plugins_manager
 from ..core.connection import CountableDjangoObjectType
 from ..core.types.money import TaxedMoney
@@ -15,7 +12,7 @@ from ..giftcard.types import GiftCard
 from ..meta.deprecated.resolvers import resolve_meta, resolve_private_meta
 from ..meta.types import ObjectWithMetadata
 from ..shipping.types import ShippingMethod
-from .dataloaders import CheckoutLinesByCheckoutTokenLoader
+from .dataloaders import CheckoutPricesByCheckoutLoader
 
 
 class GatewayConfigLine(graphene.ObjectType):
@@ -65,10 +62,21 @@ class CheckoutLine(CountableDjangoObjectType):
                 checkout_line=self, discounts=discounts
             )
 
+        def get_total_price(prices):
+            total_price = prices["line_total_prices"].get(self.pk)
+            if total_price is not None:
+                return total_price
+            # The line was saved after the prices of the checkout were loaded.
+            return (
+                DiscountsByDateTimeLoader(info.context)
+                .load(info.context.request_time)
+                .then(calculate_total_price)
+            )
+
         return (
-            DiscountsByDateTimeLoader(info.context)
-            .load(info.context.request_time)
-            .then(calculate_total_price)
+            CheckoutPricesByCheckoutLoader(info.context)
+            .load(self.checkout)
+            .then(get_total_price)
         )
 
     @staticmethod
@@ -153,86 +161,38 @@ class Checkout(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(root: models.Checkout, info):
-        def calculate_total_price(data):
-            lines, discounts = data
-            taxed_total = (
-                calculations.checkout_total(
-                    checkout=root, lines=lines, discounts=discounts
-                )
-                - root.get_total_gift_cards_balance()
-            )
-            return max(taxed_total, zero_taxed_money())
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return (
+            CheckoutPricesByCheckoutLoader(info.context)
+            .load(root)
+            .then(lambda prices: prices["total_price"])
         )
 
-        return Promise.all([lines, discounts]).then(calculate_total_price)
-
     @staticmethod
     def resolve_subtotal_price(root: models.Checkout, info):
-        def calculate_subtotal_price(data):
-            lines, discounts = data
-            return calculations.checkout_subtotal(
-                checkout=root, lines=lines, discounts=discounts
-            )
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return (
+            CheckoutPricesByCheckoutLoader(info.context)
+            .load(root)
+            .then(lambda prices: prices["subtotal_price"])
         )
 
-        return Promise.all([lines, discounts]).then(calculate_subtotal_price)
-
     @staticmethod
     def resolve_shipping_price(root: models.Checkout, info):
-        def calculate_shipping_price(data):
-            lines, discounts = data
-            return calculations.checkout_shipping_price(
-                checkout=root, lines=lines, discounts=discounts
-            )
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return (
+            CheckoutPricesByCheckoutLoader(info.context)
+            .load(root)
+            .then(lambda prices: prices["shipping_price"])
         )
 
-        return Promise.all([lines, discounts]).then(calculate_shipping_price)
-
     @staticmethod
     def resolve_lines(root: models.Checkout, *_args):
         return root.lines.prefetch_related("variant")
 
     @staticmethod
     def resolve_available_shipping_methods(root: models.Checkout, info):
-        def calculate_available_shipping_methods(data):
-            lines, discounts = data
-            available = get_valid_shipping_methods_for_checkout(root, lines, discounts)
-            if available is None:
-                return []
-
-            manager = get_plugins_manager()
-            display_gross = display_gross_prices()
-            for shipping_method in available:
-                # ignore mypy checking because it is checked in
-                # get_valid_shipping_methods_for_checkout
-                taxed_price = manager.apply_taxes_to_shipping(
-                    shipping_method.price, root.shipping_address  # type: ignore
-                )
-                if display_gross:
-                    shipping_method.price = taxed_price.gross
-                else:
-                    shipping_method.price = taxed_price.net
-            return available
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
-        )
-
-        return Promise.all([lines, discounts]).then(
-            calculate_available_shipping_methods
+        return (
+            CheckoutPricesByCheckoutLoader(info.context)
+            .load(root)
+            .then(lambda prices: prices["available_shipping_methods"])
         )
 
     @staticmethod
@@ -1,13 +1,19 @@
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set
 
 from django.db import transaction
 from django.db.models import F, QuerySet
 from django.utils.functional import cached_property
 
+from ....core.models import SORT_ORDER_GAP
+from ...response_cache import TAGGED_MODELS, invalidate_tags
+
 __all__ = ["perform_reordering"]
 
+# The largest value of the integer column
+MAX_SORT_ORDER = 2 ** 31 - 1
+
 
 @dataclass(frozen=True)
 class FinalSortOrder:
@@ -21,116 +27,134 @@ class FinalSortOrder:
 
 
 class Reordering:
+    """Apply relative moves to the nodes of an ordering queryset.
+
+    Sort orders are sparse: a moved node gets a sort order between the ones of
+    its new neighbours, so only the rows of moved nodes are updated. All the
+    sort orders are spread out again only when there is no free value left
+    between the neighbours.
+    """
+
     def __init__(self, qs: QuerySet, operations: Dict[int, int], field: str):
         self.qs = qs
         self.operations = operations
         self.field = field
 
-        # Will contain the original data, before sorting
-        # This will be useful to look for the sort orders that
-        # actually were changed
-        self.old_sort_map: Dict[int, str] = {}
-
         # Will contain the list of keys kept
         # in correct order in accordance to their sort order
         self.ordered_pks: List[int] = []
 
+        # The nodes whose sort order has to be (re)assigned:
+        # the moved ones and the ones without a sort order
+        self.unplaced_pks: Set[int] = set()
+
     @cached_property
-    def ordered_node_map(self):
+    def ordered_node_map(self) -> Dict[int, Optional[int]]:
         ordering_map = OrderedDict(
             self.qs.select_for_update()
             .values_list("pk", "sort_order")
             .order_by(F("sort_order").asc(nulls_last=True), "id")
         )
-        self.old_sort_map = ordering_map.copy()
         self.ordered_pks = list(ordering_map.keys())
-
-        previous_sort_order = 0
-
-        # Add sort order to null values
-        for pk, sort_order in ordering_map.items():
-            if sort_order is not None:
-                previous_sort_order = sort_order
-                continue
-
-            previous_sort_order += 1
-            ordering_map[pk] = previous_sort_order
-
+        self.unplaced_pks = {
+            pk for pk, sort_order in ordering_map.items() if sort_order is None
+        }
         return ordering_map
 
-    def calculate_new_sort_order(self, pk, move) -> Tuple[int, int, int]:
-        """Return the proper sort order for the current operation.
-
-        Allows to properly move the node in a given direction with by amount.
-
-        This ensures the new sort order is not biased from gaps between the sort orders.
-        """
+    def process_move_operation(self, pk, move):
+        # Skip if noting to do
+        if move == 0:
+            return
+        if move is None:
+            move = +1
 
         # Retrieve the position of the node to move
         node_pos = self.ordered_pks.index(pk)
 
         # Set the target position from the current position
-        # of the node + the relative position to move from
+        # of the node + the relative position to move from,
+        # making sure we are not getting out of bounds
         target_pos = node_pos + move
-
-        # Make sure we are not getting out of bounds
         target_pos = max(0, target_pos)
         target_pos = min(len(self.ordered_pks) - 1, target_pos)
 
-        # Retrieve the target node and its sort order
-        target_pk = self.ordered_pks[target_pos]
-        target_position = self.ordered_node_map[target_pk]
-
-        # Return the new position
-        return node_pos, target_pos, target_position
-
-    def process_move_operation(self, pk, move):
-        old_sort_order = self.ordered_node_map[pk]
-
-        # Skip if noting to do
-        if move == 0:
+        if target_pos == node_pos:
             return
-        if move is None:
-            move = +1
 
-        node_pos, target_pos, new_sort_order = self.calculate_new_sort_order(pk, move)
+        # Reorder the pk list
+        del self.ordered_pks[node_pos]
+        self.ordered_pks.insert(target_pos, pk)
+        self.unplaced_pks.add(pk)
+
+    @staticmethod
+    def spread_sort_orders(lower: int, upper: Optional[int], count: int):
+        """Return `count` increasing sort orders between `lower` and `upper`.
 
-        # Determine how we should shift for this operation
-        if move > 0:
-            shift = -1
-            range_ = old_sort_order + 1, new_sort_order
-        else:
-            shift = +1
-            range_ = new_sort_order, old_sort_order - 1
+        Both bounds are exclusive; no upper bound means the end of the list.
+        Return None if there is not enough room between the bounds.
+        """
+        if upper is None:
+            start = 0 if lower < 0 else lower + SORT_ORDER_GAP
+            sort_orders = [start + i * SORT_ORDER_GAP for i in range(count)]
+            if sort_orders[-1] > MAX_SORT_ORDER:
+                return None
+            return sort_orders
+
+        step = (upper - lower) // (count + 1)
+        if step < 1:
+            return None
+        return [lower + i * step for i in range(1, count + 1)]
+
+    def calculate_sort_orders(self) -> Dict[int, int]:
+        """Return the new sort orders of the unplaced nodes.
+
+        Fall back to spreading out the sort orders of all the nodes
+        when they don't fit between their neighbours.
+        """
+        new_sort_orders: Dict[int, int] = {}
+        # Sort orders are non-negative
+        lower = -1
+        unplaced_run: List[int] = []
+
+        for pk in self.ordered_pks + [None]:
+            if pk in self.unplaced_pks:
+                unplaced_run.append(pk)
+                continue
 
-        # Shift the sort orders within the moving range
-        self.add_to_sort_value_if_in_range(shift, *range_)
+            upper = None if pk is None else self.ordered_node_map[pk]
+            if upper is not None and upper <= lower:
+                # Nodes sharing the same sort order can't be kept in place
+                return self.renormalized_sort_orders()
 
-        # Update the sort order of the node to move
-        self.ordered_node_map[pk] = new_sort_order
+            if unplaced_run:
+                sort_orders = self.spread_sort_orders(lower, upper, len(unplaced_run))
+                if sort_orders is None:
+                    return self.renormalized_sort_orders()
+                new_sort_orders.update(zip(unplaced_run, sort_orders))
+                unplaced_run = []
 
-        # Reorder the pk list
-        self.ordered_pks.remove(pk)
-        self.ordered_pks.insert(target_pos, pk)
+            if upper is not None:
+                lower = upper
 
-    def add_to_sort_value_if_in_range(self, value_to_add, start, end):
-        for pk, sort_order in self.ordered_node_map.items():
-            if not start <= sort_order <= end:
-                continue
+        return new_sort_orders
 
-            self.ordered_node_map[pk] += value_to_add
+    def renormalized_sort_orders(self) -> Dict[int, int]:
+        return {
+            pk: position * SORT_ORDER_GAP
+            for position, pk in enumerate(self.ordered_pks)
+        }
 
     def commit(self):
         # Do nothing if nothing was done
-        if not self.old_sort_map:
+        if not self.unplaced_pks:
             return
 
         # Create the bulk update to run
         # But only if data was changed
         batch = [
             FinalSortOrder(pk, sort_order)
-            for pk, sort_order in self.ordered_node_map.items()
-            if sort_order != self.old_sort_map[pk]
+            for pk, sort_order in self.calculate_sort_orders().items()
+            if sort_order != self.ordered_node_map[pk]
         ]
 
         # Do not update if nothing changed
@@ -138,10 +162,15 @@ class Reordering:
             return
 
         # Update everything that was changed
-        self.qs.model.objects.bulk_update(batch, ["sort_order"])
+        model = self.qs.model
+        model.objects.bulk_update(batch, ["sort_order"])
 
-    def run(self):
+        # Bulk updates send no signals
+        tag = TAGGED_MODELS.get(model._meta.label)
+        if tag:
+            invalidate_tags([tag])
 
+    def run(self):
         for pk, move in self.operations.items():
             # Skip operation if it was deleted in concurrence
             if pk not in self.ordered_node_map:
@@ -2,7 +2,7 @@ from collections import defaultdict
 
 from ...discount import DiscountInfo
 from ...discount.models import Sale
-from ...product.models import Category
+from ...product.category_tree import category_tree
 from ..core.dataloaders import DataLoader
 
 
@@ -18,13 +18,11 @@ class DiscountsByDateTimeLoader(DataLoader):
         category_map = defaultdict(set)
         for sale_pk, category_pk in categories:
             category_map[sale_pk].add(category_pk)
+        tree = category_tree.get()
         subcategory_map = defaultdict(set)
         for sale_pk, category_pks in category_map.items():
-            subcategory_map[sale_pk] = set(
-                Category.tree.filter(pk__in=category_pks)
-                .get_descendants(include_self=True)
-                .values_list("id", flat=True)
-            )
+            for category_pk in category_pks:
+                subcategory_map[sale_pk].update(tree.get_descendant_ids(category_pk))
         return subcategory_map
 
     def fetch_collections(self, sale_pks):
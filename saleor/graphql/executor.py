@@ -0,0 +1,145 @@
+"""Concurrent execution of GraphQL operations.
+
+Resolvers are synchronous and talk to the database through the Django ORM,
+so instead of running them in an event loop, independent units of work (the
+operations of a batch and the top-level fields of a query) are dispatched to
+a bounded thread pool and awaited together with asyncio. The event loop never
+touches the database; every unit runs in a pool thread with its own
+connection.
+
+Because every unit uses its own connection, fields of a split query may see
+different snapshots of the data if it changes while the query is executed.
+Operations that write data are never executed concurrently.
+"""
+import asyncio
+import contextvars
+import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import translation
+from graphql.execution import ExecutionResult
+from graphql.language import ast
+
+from .utils import get_operation
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=settings.GRAPHQL_EXECUTION_WORKERS,
+            thread_name_prefix="graphql",
+        )
+    return _thread_pool
+
+
+def _run_in_worker(language: Optional[str], fn: Callable[[], Any]):
+    try:
+        with translation.override(language):
+            return fn()
+    finally:
+        # Pool threads are long-lived; drop connections that are broken or
+        # exceeded `CONN_MAX_AGE` the same way Django does between requests.
+        close_old_connections()
+
+
+async def _gather(callables: List[Callable[[], Any]]) -> List[Any]:
+    loop = asyncio.get_event_loop()
+    language = translation.get_language()
+    pool = get_thread_pool()
+    # Every unit runs in a copy of the current context, so it keeps the
+    # database chosen for reads of the operation.
+    return await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                pool,
+                partial(contextvars.copy_context().run, _run_in_worker, language, fn),
+            )
+            for fn in callables
+        ]
+    )
+
+
+def execute_concurrently(callables: List[Callable[[], Any]]) -> List[Any]:
+    """Run the callables in the thread pool and return results in order."""
+    if len(callables) < 2:
+        return [fn() for fn in callables]
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_gather(callables))
+    finally:
+        loop.close()
+
+
+def copy_request_context(request):
+    """Return a shallow copy of the request with its own dataloader cache.
+
+    Data loaders are not thread-safe, so every unit of work executed in the
+    pool needs to use separate instances.
+    """
+    request_copy = copy.copy(request)
+    if hasattr(request_copy, "dataloaders"):
+        del request_copy.dataloaders
+    return request_copy
+
+
+def split_top_level_fields(
+    document_ast: ast.Document, operation_name: Optional[str]
+) -> Optional[List[ast.Document]]:
+    """Split a query into documents that resolve one top-level field each.
+
+    Fields sharing a response key are kept together so they are merged by the
+    executor as usual. Returns None if the document can't be split: it is not
+    a query, it selects a single field or uses fragments on the root type.
+    """
+    operation = get_operation(document_ast, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+    selections = operation.selection_set.selections
+    if not all(isinstance(selection, ast.Field) for selection in selections):
+        return None
+
+    groups: "OrderedDict[str, List[ast.Field]]" = OrderedDict()
+    for field in selections:
+        response_key = (field.alias or field.name).value
+        groups.setdefault(response_key, []).append(field)
+    if len(groups) < 2:
+        return None
+
+    fragments = [
+        definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.FragmentDefinition)
+    ]
+    documents = []
+    for fields in groups.values():
+        unit_operation = copy.copy(operation)
+        unit_operation.selection_set = ast.SelectionSet(selections=fields)
+        documents.append(ast.Document(definitions=[unit_operation] + fragments))
+    return documents
+
+
+def merge_execution_results(results: List[ExecutionResult]) -> ExecutionResult:
+    """Combine results of the split documents into a single result."""
+    errors = [error for result in results for error in result.errors or []]
+    invalid = any(result.invalid for result in results)
+    extensions: Dict[str, Any] = {}
+    for result in results:
+        extensions.update(result.extensions or {})
+    data: Optional[OrderedDict] = OrderedDict()
+    for result in results:
+        if result.data is None:
+            # A non-nullable root field failed, which nulls the whole response.
+            data = None
+            break
+        data.update(result.data)
+    return ExecutionResult(
+        data=data, errors=errors or None, invalid=invalid, extensions=extensions
+    )
@@ -2,7 +2,7 @@ import graphene
 
 from ...core.permissions import MenuPermissions
 from ...menu import models
-from ...menu.utils import update_menus
+from ...menu.utils import schedule_menus_update
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import MenuError
 
@@ -38,4 +38,4 @@ class MenuItemBulkDelete(ModelBulkDeleteMutation):
     def bulk_action(cls, queryset):
         menu_ids = {item.menu_id for item in queryset}
         queryset.delete()
-        update_menus(menu_ids)
+        schedule_menus_update(menu_ids)
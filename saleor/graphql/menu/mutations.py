@@ -10,7 +10,7 @@ from django.db.models import Model, QuerySet
 from ...core.permissions import MenuPermissions, SitePermissions
 from ...menu import models
 from ...menu.error_codes import MenuErrorCode
-from ...menu.utils import update_menu
+from ...menu.utils import schedule_menus_update
 from ...page import models as page_models
 from ...product import models as product_models
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -212,7 +212,7 @@ class MenuItemCreate(ModelMutation):
     @classmethod
     def save(cls, info, instance, cleaned_input):
         instance.save()
-        update_menu(instance.menu)
+        schedule_menus_update([instance.menu_id])
 
 
 class MenuItemUpdate(MenuItemCreate):
@@ -257,7 +257,7 @@ class MenuItemDelete(ModelDeleteMutation):
     @classmethod
     def perform_mutation(cls, _root, info, **data):
         response = super().perform_mutation(_root, info, **data)
-        update_menu(response.menuItem.menu)
+        schedule_menus_update([response.menuItem.menu_id])
         return response
 
 
@@ -398,6 +398,8 @@ class MenuItemMove(BaseMutation):
             ordering_qs = sort_querysets[parent_pk]
             perform_reordering(ordering_qs, operations)
 
+        # Items were reordered with updates, which send no signals.
+        schedule_menus_update([menu.pk])
         menu = qs.get(pk=menu.pk)
         return MenuItemMove(menu=menu)
 
@@ -2,6 +2,7 @@ import graphene
 from graphene import relay
 
 from ...menu import models
+from ...menu.tree import menu_tree
 from ..core.connection import CountableDjangoObjectType
 from ..translations.fields import TranslationField
 from ..translations.types import MenuItemTranslation
@@ -21,9 +22,7 @@ class Menu(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_items(root: models.Menu, _info, **_kwargs):
-        if hasattr(root, "prefetched_items"):
-            return root.prefetched_items  # type: ignore
-        return root.items.filter(level=0)
+        return menu_tree.get().get_top_items(root.pk)
 
 
 class MenuItem(CountableDjangoObjectType):
@@ -51,7 +50,7 @@ class MenuItem(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_children(root: models.MenuItem, _info, **_kwargs):
-        return root.children.all()
+        return menu_tree.get().get_children(root.pk)
 
 
 class MenuItemMoveInput(graphene.InputObjectType):
@@ -1,3 +1,4 @@
+import time
 from typing import Optional
 
 import opentracing
@@ -7,6 +8,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.utils.functional import SimpleLazyObject
 from graphql import ResolveInfo
 from graphql_jwt.middleware import JSONWebTokenMiddleware
+from promise import Promise, is_thenable
 
 from ..app.models import App
 from ..core.exceptions import ReadOnlyException
@@ -37,6 +39,39 @@ class OpentracingGrapheneMiddleware:
             return next_(root, info, **kwargs)
 
 
+class ProfilingMiddleware:
+    @staticmethod
+    def resolve(next_, root, info: ResolveInfo, **kwargs):
+        profiler = getattr(info.context, "graphql_profiler", None)
+        if profiler is None or not should_trace(info):
+            return next_(root, info, **kwargs)
+        field = f"{info.parent_type.name}.{info.field_name}"
+        previous_field = profiler.current_field
+        profiler.current_field = field
+        start = time.perf_counter()
+
+        def record(value):
+            profiler.record_call(field, time.perf_counter() - start)
+            return value
+
+        def record_error(error):
+            record(None)
+            raise error
+
+        try:
+            result = next_(root, info, **kwargs)
+        except Exception:
+            record(None)
+            raise
+        finally:
+            profiler.current_field = previous_field
+        if is_thenable(result):
+            # Resolvers using dataloaders return promises; include the time
+            # until the value is loaded.
+            return Promise.resolve(result).then(record, record_error)
+        return record(result)
+
+
 def get_app(auth_token) -> Optional[App]:
     qs = App.objects.filter(tokens__auth_token=auth_token, is_active=True)
     return qs.first()
@@ -1,11 +1,11 @@
 import django_filters
-from django.db.models import Sum
+from django.db.models import Q, Sum
 
 from ...order.models import Order
 from ..core.filters import ListObjectTypeFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput
 from ..payment.enums import PaymentChargeStatusEnum
-from ..utils.filters import filter_by_query_param, filter_range_field
+from ..utils.filters import filter_range_field, search_by_document
 from .enums import OrderStatusFilter
 
 
@@ -36,14 +36,7 @@ def filter_status(qs, _, value):
 
 
 def filter_customer(qs, _, value):
-    customer_fields = [
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-        "user__email",
-    ]
-    qs = filter_by_query_param(qs, value, customer_fields)
-    return qs
+    return search_by_document(qs, value)
 
 
 def filter_created_range(qs, _, value):
@@ -51,16 +44,9 @@ def filter_created_range(qs, _, value):
 
 
 def filter_order_search(qs, _, value):
-    order_fields = [
-        "pk",
-        "discount_name",
-        "translated_discount_name",
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-    ]
-    qs = filter_by_query_param(qs, value, order_fields)
-    return qs
+    value = str(value).strip()
+    extra_filter = Q(pk=value) if value.isdigit() else None
+    return search_by_document(qs, value, extra_filter)
 
 
 class DraftOrderFilter(django_filters.FilterSet):
@@ -3,6 +3,7 @@ from django.db.models import CharField, ExpressionWrapper, OuterRef, QuerySet, S
 
 from ...payment.models import Payment
 from ..core.types import SortInputObjectType
+from ..utils.sorting import annotate_search_rank
 
 
 class OrderSortField(graphene.Enum):
@@ -12,6 +13,7 @@ class OrderSortField(graphene.Enum):
     PAYMENT = ["last_charge_status", "status", "pk"]
     FULFILLMENT_STATUS = ["status", "user_email", "pk"]
     TOTAL = ["total_gross_amount", "status", "pk"]
+    RANK = ["search_rank", "pk"]
 
     @property
     def description(self):
@@ -31,6 +33,10 @@ class OrderSortField(graphene.Enum):
             last_charge_status=ExpressionWrapper(subquery, output_field=CharField())
         )
 
+    @staticmethod
+    def qs_with_rank(queryset: QuerySet) -> QuerySet:
+        return annotate_search_rank(queryset)
+
 
 class OrderSortingInput(SortInputObjectType):
     class Meta:
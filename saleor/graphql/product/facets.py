@@ -0,0 +1,144 @@
+"""Counts of products for the storefront filters.
+
+A facet counts the products matching `ProductFilterInput` per value of one
+filter in a single grouped query. The filter of the facet itself is left out,
+so the counts tell how many products selecting a value would show.
+
+Facets are cached per filter input and the versions of the response cache tags
+of products, collections, categories and sales. Saving any of them, including
+the sales that change discounted prices, makes the cached facets stale.
+"""
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import Floor
+from graphql.error import GraphQLError
+
+from ...product.filters import get_attribute_values_facets
+from ..response_cache import PRODUCT_TAGS, get_tag_versions
+from .enums import StockAvailability
+from .filters import (
+    ProductFilter,
+    get_attributes_filter_queries,
+    get_out_of_stock_product_ids,
+)
+
+PRODUCT_FACETS_KEY_PREFIX = "product_facets:"
+DEFAULT_PRICE_STEP = Decimal(10)
+
+
+def get_product_facets_cache_key(
+    filter_input: Dict[str, Any], price_step: Decimal, has_access_to_all: bool
+) -> str:
+    payload = [
+        filter_input,
+        str(price_step),
+        has_access_to_all,
+        get_tag_versions(PRODUCT_TAGS),
+    ]
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return PRODUCT_FACETS_KEY_PREFIX + digest
+
+
+def filter_products(qs, filter_input: Dict[str, Any], exclude: Optional[str] = None):
+    data = {key: value for key, value in filter_input.items() if key != exclude}
+    if not data:
+        return qs
+    filterset = ProductFilter(data=data, queryset=qs)
+    if not filterset.is_valid():
+        raise GraphQLError(json.dumps(filterset.errors.get_json_data()))
+    return filterset.qs
+
+
+def count_attribute_values(qs, filter_input: Dict[str, Any]) -> Dict[int, int]:
+    attributes = filter_input.get("attributes")
+    queries = get_attributes_filter_queries(attributes) if attributes else {}
+    qs = filter_products(qs, filter_input, exclude="attributes")
+    return get_attribute_values_facets(qs, queries)
+
+
+def count_categories(qs, filter_input: Dict[str, Any]) -> Dict[int, int]:
+    qs = filter_products(qs, filter_input, exclude="categories")
+    counts = (
+        qs.order_by()
+        .filter(category__isnull=False)
+        .values("category_id")
+        .annotate(count=Count("pk", distinct=True))
+        .values_list("category_id", "count")
+    )
+    return dict(counts)
+
+
+def count_prices(qs, filter_input: Dict[str, Any], price_step: Decimal):
+    """Return products counts of price ranges starting at multiples of the step."""
+    qs = filter_products(qs, filter_input, exclude="minimal_price")
+    counts = (
+        qs.order_by()
+        .annotate(bucket=Floor(F("minimal_variant_price_amount") / price_step))
+        .values("bucket")
+        .annotate(count=Count("pk", distinct=True))
+        .values_list("bucket", "count")
+        .order_by("bucket")
+    )
+    return [(Decimal(bucket) * price_step, count) for bucket, count in counts]
+
+
+def count_stock_availability(qs, filter_input: Dict[str, Any]) -> Dict[str, int]:
+    qs = filter_products(qs, filter_input, exclude="stock_availability")
+    counts = (
+        qs.order_by()
+        .annotate(
+            stock_availability=Case(
+                When(
+                    id__in=get_out_of_stock_product_ids(),
+                    then=Value(StockAvailability.OUT_OF_STOCK.value),
+                ),
+                default=Value(StockAvailability.IN_STOCK.value),
+                output_field=CharField(),
+            )
+        )
+        .values("stock_availability")
+        .annotate(count=Count("pk", distinct=True))
+        .values_list("stock_availability", "count")
+    )
+    return dict(counts)
+
+
+def get_product_facets(
+    qs, filter_input: Dict[str, Any], price_step: Decimal, has_access_to_all: bool
+) -> Dict[str, Any]:
+    """Return products counts per value of the filters.
+
+    :param qs: Products visible to the requestor.
+    :param filter_input: The `ProductFilterInput` of the query.
+    :param price_step: The width of price ranges.
+    :param has_access_to_all: Whether the requestor sees unpublished products.
+    """
+    cache_key = get_product_facets_cache_key(
+        filter_input, price_step, has_access_to_all
+    )
+    facets = cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    total_count = (
+        filter_products(qs, filter_input)
+        .order_by()
+        .aggregate(count=Count("pk", distinct=True))["count"]
+    )
+    facets = {
+        "total_count": total_count,
+        "attribute_values": count_attribute_values(qs, filter_input),
+        "categories": count_categories(qs, filter_input),
+        "prices": count_prices(qs, filter_input, price_step),
+        "stock_availability": count_stock_availability(qs, filter_input),
+    }
+    cache.set(cache_key, facets, settings.PRODUCT_FACETS_CACHE_TIMEOUT)
+    return facets
@@ -7,6 +7,7 @@ from django.db.models import F, Q, Subquery, Sum
 from django.db.models.functions import Coalesce
 from graphene_django.filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
 
+from ...product.category_tree import category_tree
 from ...product.filters import filter_products_by_attributes_values
 from ...product.models import (
     Attribute,
@@ -79,6 +80,13 @@ def filter_products_by_attributes(qs, filter_value):
     return filter_products_by_attributes_values(qs, queries)
 
 
+def get_attributes_filter_queries(value) -> Dict[int, List[Optional[int]]]:
+    """Return value IDs grouped by attribute ID for the `attributes` filter."""
+    return _clean_product_attributes_filter_input(
+        get_attributes_filter_value_list(value)
+    )
+
+
 def filter_products_by_price(qs, price_lte=None, price_gte=None):
     if price_lte:
         qs = qs.filter(price_amount__lte=price_lte)
@@ -98,18 +106,19 @@ def filter_products_by_minimal_price(
 
 
 def filter_products_by_categories(qs, categories):
-    categories = [
-        category.get_descendants(include_self=True) for category in categories
-    ]
-    ids = {category.id for tree in categories for category in tree}
-    return qs.filter(category__in=ids)
+    tree = category_tree.get()
+    ids = set()
+    for category in categories:
+        ids.update(tree.get_descendant_ids(category.pk))
+    return qs.filter(category_id__in=ids)
 
 
 def filter_products_by_collections(qs, collections):
     return qs.filter(collections__in=collections)
 
 
-def filter_products_by_stock_availability(qs, stock_availability):
+def get_out_of_stock_product_ids():
+    """Return a subquery of IDs of products with no quantity available."""
     total_stock = (
         Stock.objects.select_related("product_variant")
         .values("product_variant__product_id")
@@ -121,20 +130,30 @@ def filter_products_by_stock_availability(qs, stock_availability):
         .filter(total_available__lte=0)
         .values_list("product_variant__product_id", flat=True)
     )
+    return Subquery(total_stock)
+
+
+def filter_products_by_stock_availability(qs, stock_availability):
+    total_stock = get_out_of_stock_product_ids()
     if stock_availability == StockAvailability.IN_STOCK:
-        qs = qs.exclude(id__in=Subquery(total_stock))
+        qs = qs.exclude(id__in=total_stock)
     elif stock_availability == StockAvailability.OUT_OF_STOCK:
-        qs = qs.filter(id__in=Subquery(total_stock))
+        qs = qs.filter(id__in=total_stock)
     return qs
 
 
+def get_attributes_filter_value_list(value):
+    value_list = []
+    for v in value:
+        slug = v["slug"]
+        values = [v["value"]] if "value" in v else v.get("values", [])
+        value_list.append((slug, values))
+    return value_list
+
+
 def filter_attributes(qs, _, value):
     if value:
-        value_list = []
-        for v in value:
-            slug = v["slug"]
-            values = [v["value"]] if "value" in v else v.get("values", [])
-            value_list.append((slug, values))
+        value_list = get_attributes_filter_value_list(value)
         qs = filter_products_by_attributes(qs, value_list)
     return qs
 
@@ -216,13 +235,12 @@ def filter_attributes_by_product_types(qs, field, value):
         category_id = from_global_id_strict_type(
             value, only_type="Category", field=field
         )
-        category = Category.objects.filter(pk=category_id).first()
-
-        if category is None:
+        tree = category_tree.get()
+        if int(category_id) not in tree:
             return qs.none()
 
-        tree = category.get_descendants(include_self=True)
-        product_qs = Product.objects.filter(category__in=tree)
+        descendant_ids = tree.get_descendant_ids(int(category_id))
+        product_qs = Product.objects.filter(category_id__in=descendant_ids)
 
     elif field == "in_collection":
         collection_id = from_global_id_strict_type(
@@ -176,8 +176,9 @@ class AttributeMixin:
     def _save_m2m(cls, info, attribute, cleaned_data):
         super()._save_m2m(info, attribute, cleaned_data)
         values = cleaned_data.get(cls.ATTRIBUTE_VALUES_FIELD) or []
-        for value in values:
-            attribute.values.create(**value)
+        models.AttributeValue.bulk_append(
+            [models.AttributeValue(attribute=attribute, **value) for value in values]
+        )
 
 
 class AttributeCreate(AttributeMixin, ModelMutation):
@@ -412,8 +413,9 @@ class AttributeAssign(BaseMutation):
     def save_field_values(cls, product_type, model_name, pks):
         """Add in bulk the PKs to assign to a given product type."""
         model = getattr(models, model_name)
-        for pk in pks:
-            model.objects.create(product_type=product_type, attribute_id=pk)
+        model.bulk_append(
+            [model(product_type=product_type, attribute_id=pk) for pk in pks]
+        )
 
     @classmethod
     @transaction.atomic()
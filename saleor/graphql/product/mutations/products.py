@@ -28,6 +28,7 @@ from ....product.utils.attributes import (
     associate_attribute_values_to_instance,
     generate_name_for_variant,
 )
+from ....site.snapshot import get_site_settings
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.scalars import Decimal, WeightScalar
 from ...core.types import SeoInput, Upload
@@ -41,6 +42,7 @@ from ...core.utils import (
 )
 from ...core.utils.reordering import perform_reordering
 from ...meta.deprecated.mutations import ClearMetaBaseMutation, UpdateMetaBaseMutation
+from ...response_cache import invalidate_tags
 from ...warehouse.types import Warehouse
 from ..types import Category, Collection, Product, ProductImage, ProductVariant
 from ..utils import (
@@ -360,7 +362,22 @@ class CollectionAddProducts(BaseMutation):
             info, collection_id, field="collection_id", only_type=Collection
         )
         products = cls.get_nodes_or_error(products, "products", Product)
-        collection.products.add(*products)
+        ordering_queryset = collection.collectionproduct.all()
+        existing_pks = set(
+            ordering_queryset.filter(product__in=products).values_list(
+                "product_id", flat=True
+            )
+        )
+        models.CollectionProduct.bulk_append(
+            [
+                models.CollectionProduct(collection=collection, product=product)
+                for product in products
+                if product.pk not in existing_pks
+            ],
+            ordering_queryset,
+        )
+        # Bulk creates send no signals
+        invalidate_tags(["collection"])
         if collection.sale_set.exists():
             # Updated the db entries, recalculating discounts of affected products
             update_products_minimal_variant_prices_of_catalogues_task.delay(
@@ -947,9 +964,8 @@ class ProductCreate(ModelMutation):
     def save(cls, info, instance, cleaned_input):
         instance.save()
         if not instance.product_type.has_variants:
-            site_settings = info.context.site.settings
             track_inventory = cleaned_input.get(
-                "track_inventory", site_settings.track_inventory_by_default
+                "track_inventory", get_site_settings().track_inventory_by_default
             )
             sku = cleaned_input.get("sku")
             variant = models.ProductVariant.objects.create(
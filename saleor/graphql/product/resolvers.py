@@ -1,9 +1,15 @@
+from collections import defaultdict
+
+from django.conf import settings
 from django.db.models import Sum
+from graphql.error import GraphQLError
+from prices import Money
 
 from ...order import OrderStatus
 from ...product import models
 from ..utils import get_database_id, get_user_or_app_from_context
 from ..utils.filters import filter_by_period
+from .facets import DEFAULT_PRICE_STEP, get_product_facets
 from .filters import (
     filter_attributes_by_product_types,
     filter_products_by_stock_availability,
@@ -60,6 +66,73 @@ def resolve_products(info, stock_availability=None, **_kwargs):
     return qs.distinct()
 
 
+def resolve_product_facets(info, filter=None, price_step=None):
+    if price_step is None:
+        price_step = DEFAULT_PRICE_STEP
+    if price_step <= 0:
+        raise GraphQLError("The price step has to be greater than zero.")
+
+    user = get_user_or_app_from_context(info.context)
+    qs = models.Product.objects.visible_to_user(user)
+    facets = get_product_facets(
+        qs,
+        dict(filter or {}),
+        price_step,
+        models.Product.objects.user_has_access_to_all(user),
+    )
+
+    value_counts = facets["attribute_values"]
+    values = models.AttributeValue.objects.filter(
+        pk__in=value_counts.keys(),
+        attribute__in=models.Attribute.objects.get_visible_to_user(user),
+    ).select_related("attribute")
+    attribute_values = defaultdict(list)
+    for value in values:
+        attribute_values[value.attribute].append(
+            {"value": value, "count": value_counts[value.pk]}
+        )
+    attributes = sorted(
+        attribute_values.items(),
+        key=lambda item: (item[0].storefront_search_position, item[0].pk),
+    )
+
+    category_counts = facets["categories"]
+    categories = models.Category.objects.in_bulk(category_counts.keys())
+
+    currency = settings.DEFAULT_CURRENCY
+    return {
+        "total_count": facets["total_count"],
+        "attributes": [
+            {
+                "attribute": attribute,
+                "values": sorted(
+                    values, key=lambda v: (v["value"].sort_order or 0, v["value"].pk)
+                ),
+            }
+            for attribute, values in attributes
+        ],
+        "categories": [
+            {"category": categories[pk], "count": count}
+            for pk, count in sorted(
+                category_counts.items(), key=lambda item: (-item[1], item[0])
+            )
+            if pk in categories
+        ],
+        "prices": [
+            {
+                "start": Money(start, currency),
+                "stop": Money(start + price_step, currency),
+                "count": count,
+            }
+            for start, count in facets["prices"]
+        ],
+        "stock_availability": [
+            {"stock_availability": stock_availability, "count": count}
+            for stock_availability, count in facets["stock_availability"].items()
+        ],
+    }
+
+
 def resolve_product_types(info, **_kwargs):
     return models.ProductType.objects.all()
 
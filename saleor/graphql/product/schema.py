@@ -3,6 +3,7 @@ import graphene
 from ...core.permissions import ProductPermissions
 from ..core.enums import ReportingPeriod
 from ..core.fields import FilterInputConnectionField, PrefetchingConnectionField
+from ..core.scalars import Decimal
 from ..core.validators import validate_one_of_args_is_in_query
 from ..decorators import permission_required
 from ..translations.mutations import (
@@ -112,6 +113,7 @@ from .resolvers import (
     resolve_collections,
     resolve_digital_contents,
     resolve_product_by_slug,
+    resolve_product_facets,
     resolve_product_types,
     resolve_product_variants,
     resolve_products,
@@ -130,6 +132,7 @@ from .types import (
     Collection,
     DigitalContent,
     Product,
+    ProductFacets,
     ProductType,
     ProductVariant,
 )
@@ -206,6 +209,18 @@ class ProductQueries(graphene.ObjectType):
         ),
         description="List of the shop's products.",
     )
+    product_facets = graphene.Field(
+        ProductFacets,
+        filter=ProductFilterInput(description="Filtering options for products."),
+        price_step=graphene.Argument(
+            Decimal,
+            description=(
+                "Width of the price ranges the products are counted in. "
+                "Defaults to 10."
+            ),
+        ),
+        description="Counts of the shop's products per value of the filters.",
+    )
     product_type = graphene.Field(
         ProductType,
         id=graphene.Argument(
@@ -287,6 +302,9 @@ class ProductQueries(graphene.ObjectType):
     def resolve_products(self, info, **kwargs):
         return resolve_products(info, **kwargs)
 
+    def resolve_product_facets(self, info, **kwargs):
+        return resolve_product_facets(info, **kwargs)
+
     def resolve_product_type(self, info, id):
         return graphene.Node.get_node_from_global_id(info, id, ProductType)
 
@@ -1,6 +1,7 @@
 # flake8: noqa
 from .attributes import Attribute, AttributeValue, SelectedAttribute
 from .digital_contents import DigitalContent, DigitalContentUrl
+from .facets import ProductFacets
 from .products import (
     Category,
     Collection,
@@ -0,0 +1,84 @@
+import graphene
+
+from ...core.types import Money
+from ..enums import StockAvailability
+from .attributes import Attribute, AttributeValue
+from .products import Category
+
+
+class AttributeValueFacet(graphene.ObjectType):
+    value = graphene.Field(
+        AttributeValue, required=True, description="The attribute value."
+    )
+    count = graphene.Int(
+        required=True, description="Number of products with the value."
+    )
+
+
+class AttributeFacet(graphene.ObjectType):
+    attribute = graphene.Field(Attribute, required=True, description="The attribute.")
+    values = graphene.List(
+        graphene.NonNull(AttributeValueFacet),
+        required=True,
+        description="Counts of products per value of the attribute.",
+    )
+
+
+class CategoryFacet(graphene.ObjectType):
+    category = graphene.Field(Category, required=True, description="The category.")
+    count = graphene.Int(
+        required=True, description="Number of products in the category."
+    )
+
+
+class PriceRangeFacet(graphene.ObjectType):
+    start = graphene.Field(
+        Money, required=True, description="Lower bound of the price range."
+    )
+    stop = graphene.Field(
+        Money, required=True, description="Upper bound (exclusive) of the price range."
+    )
+    count = graphene.Int(
+        required=True, description="Number of products in the price range."
+    )
+
+
+class StockAvailabilityFacet(graphene.ObjectType):
+    stock_availability = StockAvailability(
+        required=True, description="The stock availability."
+    )
+    count = graphene.Int(
+        required=True, description="Number of products with the stock availability."
+    )
+
+
+class ProductFacets(graphene.ObjectType):
+    total_count = graphene.Int(
+        required=True, description="Number of products matching the filter."
+    )
+    attributes = graphene.List(
+        graphene.NonNull(AttributeFacet),
+        required=True,
+        description="Counts of products per attribute value.",
+    )
+    categories = graphene.List(
+        graphene.NonNull(CategoryFacet),
+        required=True,
+        description="Counts of products per category.",
+    )
+    prices = graphene.List(
+        graphene.NonNull(PriceRangeFacet),
+        required=True,
+        description="Counts of products per range of minimal variant prices.",
+    )
+    stock_availability = graphene.List(
+        graphene.NonNull(StockAvailabilityFacet),
+        required=True,
+        description="Counts of products per stock availability.",
+    )
+
+    class Meta:
+        description = (
+            "Counts of products matching a filter per value of the filters. Each "
+            "facet is counted without its own filter."
+        )
@@ -8,6 +8,7 @@ from graphql.error import GraphQLError
 
 from ....core.permissions import ProductPermissions
 from ....product import models
+from ....product.category_tree import category_tree
 from ....product.templatetags.product_images import (
     get_product_image_thumbnail,
     get_thumbnail,
@@ -812,7 +813,8 @@ class Category(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_ancestors(root: models.Category, info, **_kwargs):
-        return root.get_ancestors()
+        ancestor_ids = category_tree.get().get_ancestor_ids(root.pk)
+        return models.Category.objects.filter(pk__in=ancestor_ids)
 
     @staticmethod
     def resolve_background_image(root: models.Category, info, size=None, **_kwargs):
@@ -827,6 +829,9 @@ class Category(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_children(root: models.Category, info, **_kwargs):
+        # Leaf categories are answered without a query.
+        if not category_tree.get().get_children_ids(root.pk):
+            return models.Category.objects.none()
         return root.children.all()
 
     @staticmethod
@@ -835,9 +840,9 @@ class Category(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_products(root: models.Category, info, **_kwargs):
-        tree = root.get_descendants(include_self=True)
+        tree = category_tree.get().get_descendant_ids(root.pk)
         qs = models.Product.objects.published()
-        return qs.filter(category__in=tree)
+        return qs.filter(category_id__in=tree)
 
     @staticmethod
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
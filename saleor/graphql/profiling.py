@@ -0,0 +1,181 @@
+"""Sampled profiling of GraphQL resolvers.
+
+For a sampled request every resolved field is timed and the SQL queries it
+executes are counted. Statistics are aggregated per field (`Type.field`) in
+the memory of the process and periodically published to the shared cache, so
+that the metrics endpoint can report totals from all processes. Every process
+claims one of `MAX_PROFILED_PROCESSES` slots with an atomic `cache.add`; slots
+of processes that stopped publishing expire and can be claimed again.
+
+SQL queries are attributed to the field that was resolved most recently; this
+also covers querysets that are evaluated when the executor completes the value
+returned by a resolver.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+PROFILING_STATS_KEY_PREFIX = "graphql_profiling_stats:"
+MAX_PROFILED_PROCESSES = 256
+
+
+@dataclass
+class FieldStats:
+    calls: int = 0
+    duration: float = 0.0
+    sql_queries: int = 0
+
+    def merge(self, other: "FieldStats"):
+        self.calls += other.calls
+        self.duration += other.duration
+        self.sql_queries += other.sql_queries
+
+
+class RequestProfiler:
+    """Collect field statistics of a single request."""
+
+    def __init__(self):
+        self.stats: Dict[str, FieldStats] = defaultdict(FieldStats)
+        self.lock = threading.Lock()
+        # Fields of a request may be resolved in several threads when the
+        # concurrent execution is enabled.
+        self.local = threading.local()
+
+    @property
+    def current_field(self) -> Optional[str]:
+        return getattr(self.local, "field", None)
+
+    @current_field.setter
+    def current_field(self, field: str):
+        self.local.field = field
+
+    def record_call(self, field: str, duration: float):
+        with self.lock:
+            stats = self.stats[field]
+            stats.calls += 1
+            stats.duration += duration
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        field = self.current_field
+        if field is not None:
+            with self.lock:
+                self.stats[field].sql_queries += 1
+        return execute(sql, params, many, context)
+
+
+class ProfilingRegistry:
+    """Aggregate statistics of the current process and publish them."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.process_id = "%s-%s" % (self.pid, uuid.uuid4().hex[:8])
+        self.slot: Optional[int] = None
+        self.stats: Dict[str, FieldStats] = defaultdict(FieldStats)
+        self.last_flush = time.monotonic()
+
+    def add(self, request_stats: Dict[str, FieldStats]):
+        with self.lock:
+            if self.pid != os.getpid():
+                # The registry was inherited from the parent of a forked worker.
+                self.reset()
+            for field, stats in request_stats.items():
+                self.stats[field].merge(stats)
+            should_flush = (
+                time.monotonic() - self.last_flush
+                >= settings.GRAPHQL_PROFILING_FLUSH_INTERVAL
+            )
+            if should_flush:
+                self.last_flush = time.monotonic()
+                snapshot = serialize_stats(self.stats)
+        if should_flush:
+            self.publish(snapshot)
+
+    def publish(self, snapshot: Dict[str, List]):
+        timeout = max(settings.GRAPHQL_PROFILING_FLUSH_INTERVAL * 10, 60)
+        value = {"process": self.process_id, "stats": snapshot}
+        if self.slot is not None:
+            key = get_stats_key(self.slot)
+            published = cache.get(key)
+            if published is None:
+                if cache.add(key, value, timeout):
+                    return
+            elif published["process"] == self.process_id:
+                cache.set(key, value, timeout)
+                return
+        # The slot expired and was claimed by another process, find a new one.
+        self.slot = None
+        for slot in range(MAX_PROFILED_PROCESSES):
+            if cache.add(get_stats_key(slot), value, timeout):
+                self.slot = slot
+                return
+
+    def flush(self):
+        with self.lock:
+            self.last_flush = time.monotonic()
+            snapshot = serialize_stats(self.stats)
+        self.publish(snapshot)
+
+
+def get_stats_key(slot: int) -> str:
+    return "%s%s" % (PROFILING_STATS_KEY_PREFIX, slot)
+
+
+def serialize_stats(stats: Dict[str, FieldStats]) -> Dict[str, List]:
+    return {
+        field: [field_stats.calls, field_stats.duration, field_stats.sql_queries]
+        for field, field_stats in stats.items()
+    }
+
+
+def collect_stats() -> Dict[str, FieldStats]:
+    """Return statistics summed over all processes that published them."""
+    keys = [get_stats_key(slot) for slot in range(MAX_PROFILED_PROCESSES)]
+    totals: Dict[str, FieldStats] = defaultdict(FieldStats)
+    for published in cache.get_many(keys).values():
+        for field, (calls, duration, sql_queries) in published["stats"].items():
+            totals[field].merge(FieldStats(calls, duration, sql_queries))
+    return totals
+
+
+def render_metrics(stats: Dict[str, FieldStats]) -> str:
+    """Render statistics in the Prometheus text exposition format."""
+    metrics = [
+        ("graphql_field_calls_total", "Number of sampled resolver calls.", "calls"),
+        (
+            "graphql_field_duration_seconds_total",
+            "Time spent in sampled resolver calls.",
+            "duration",
+        ),
+        (
+            "graphql_field_sql_queries_total",
+            "SQL queries executed by sampled resolver calls.",
+            "sql_queries",
+        ),
+    ]
+    lines: List[str] = []
+    for name, help_text, attr in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.extend(_render_samples(name, attr, stats.items()))
+    return "\n".join(lines) + "\n"
+
+
+def _render_samples(name, attr, items: Iterable) -> List[str]:
+    return [
+        f'{name}{{field="{field}"}} {getattr(field_stats, attr)}'
+        for field, field_stats in sorted(items, key=lambda item: item[0])
+    ]
+
+
+registry = ProfilingRegistry()
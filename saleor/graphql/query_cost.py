@@ -0,0 +1,190 @@
+"""Static cost analysis of GraphQL documents.
+
+The cost of a query is estimated before it is executed, from the parsed
+document only. Every field selecting an object costs one point (scalars are
+free) unless configured otherwise in `GRAPHQL_QUERY_COST_FIELD_WEIGHTS`. The
+cost of fields nested in a paginated field is multiplied by the number of
+requested nodes (`first` or `last`), and the cost of fields nested in a list
+that can't be paginated by `GRAPHQL_QUERY_COST_LIST_SIZE`, the assumed number
+of its items.
+"""
+from typing import Any, Dict, Optional, Set
+
+from django.conf import settings
+from graphene_django.settings import graphene_settings
+from graphql import GraphQLSchema
+from graphql.error import GraphQLError
+from graphql.language import ast
+from graphql.type.definition import (
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    get_named_type,
+)
+
+from .utils import get_operation
+
+PAGINATION_ARGUMENTS = ("first", "last")
+
+
+class QueryCostError(GraphQLError):
+    pass
+
+
+class QueryCostAnalyzer:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document_ast: ast.Document,
+        variables: Optional[Dict[str, Any]] = None,
+        field_weights: Optional[Dict[str, int]] = None,
+    ):
+        self.schema = schema
+        self.variables = variables or {}
+        self.field_weights = field_weights or {}
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        self.document_ast = document_ast
+
+    def calculate(self, operation_name: Optional[str] = None) -> int:
+        operation = get_operation(self.document_ast, operation_name)
+        if operation is None:
+            return 0
+        if operation.operation == "mutation":
+            root_type = self.schema.get_mutation_type()
+        elif operation.operation == "subscription":
+            root_type = self.schema.get_subscription_type()
+        else:
+            root_type = self.schema.get_query_type()
+        return self.selection_set_cost(root_type, operation.selection_set, set())
+
+    def selection_set_cost(
+        self, parent_type, selection_set: ast.SelectionSet, fragment_path: Set[str]
+    ) -> int:
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                cost += self.field_cost(parent_type, selection, fragment_path)
+            elif isinstance(selection, ast.InlineFragment):
+                fragment_type = self.get_type_condition(selection, parent_type)
+                cost += self.selection_set_cost(
+                    fragment_type, selection.selection_set, fragment_path
+                )
+            elif isinstance(selection, ast.FragmentSpread):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                # Skip unknown and cyclic fragments, validation reports them.
+                if fragment is None or name in fragment_path:
+                    continue
+                fragment_type = self.get_type_condition(fragment, parent_type)
+                cost += self.selection_set_cost(
+                    fragment_type, fragment.selection_set, fragment_path | {name}
+                )
+        return cost
+
+    def field_cost(self, parent_type, field: ast.Field, fragment_path: Set[str]):
+        name = field.name.value
+        if name.startswith("__") or not isinstance(
+            parent_type, (GraphQLObjectType, GraphQLInterfaceType)
+        ):
+            return 0
+        field_def = parent_type.fields.get(name)
+        if field_def is None:
+            return 0
+
+        default_weight = 1 if field.selection_set else 0
+        weight = self.field_weights.get(f"{parent_type.name}.{name}", default_weight)
+        if not field.selection_set:
+            return weight
+
+        children_cost = self.selection_set_cost(
+            get_named_type(field_def.type), field.selection_set, fragment_path
+        )
+        multiplier = self.get_multiplier(parent_type, field, field_def)
+        return weight + multiplier * children_cost
+
+    def get_multiplier(self, parent_type, field: ast.Field, field_def) -> int:
+        if not any(arg in field_def.args for arg in PAGINATION_ARGUMENTS):
+            return self.get_list_multiplier(parent_type, field_def)
+        arguments = {
+            argument.name.value: argument.value for argument in field.arguments
+        }
+        sizes = [
+            self.get_argument_value(arguments[arg])
+            for arg in PAGINATION_ARGUMENTS
+            if arg in arguments
+        ]
+        sizes = [size for size in sizes if isinstance(size, int)]
+        if not sizes:
+            return graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+        return max(max(sizes), 1)
+
+    @staticmethod
+    def get_list_multiplier(parent_type, field_def) -> int:
+        field_type = field_def.type
+        if isinstance(field_type, GraphQLNonNull):
+            field_type = field_type.of_type
+        if not isinstance(field_type, GraphQLList):
+            return 1
+        # Edges of a connection are already counted by its `first` or `last`.
+        if "pageInfo" in parent_type.fields:
+            return 1
+        return settings.GRAPHQL_QUERY_COST_LIST_SIZE
+
+    def get_argument_value(self, value_node):
+        if isinstance(value_node, ast.Variable):
+            return self.variables.get(value_node.name.value)
+        if isinstance(value_node, ast.IntValue):
+            return int(value_node.value)
+        return None
+
+    def get_type_condition(self, fragment, parent_type):
+        if fragment.type_condition is None:
+            return parent_type
+        return self.schema.get_type(fragment.type_condition.name.value) or parent_type
+
+
+def calculate_query_cost(
+    schema: GraphQLSchema,
+    document_ast: ast.Document,
+    variables: Optional[Dict[str, Any]],
+    operation_name: Optional[str],
+) -> int:
+    analyzer = QueryCostAnalyzer(
+        schema,
+        document_ast,
+        variables=variables,
+        field_weights=settings.GRAPHQL_QUERY_COST_FIELD_WEIGHTS,
+    )
+    return analyzer.calculate(operation_name)
+
+
+def get_query_cost_extensions(cost: int) -> Dict[str, Any]:
+    return {
+        "cost": {
+            "requestedQueryCost": cost,
+            "maximumAvailable": settings.GRAPHQL_QUERY_MAX_COST or None,
+        }
+    }
+
+
+def validate_query_cost(cost: int):
+    max_cost = settings.GRAPHQL_QUERY_MAX_COST
+    if max_cost and cost > max_cost:
+        raise QueryCostError(
+            f"The query exceeds the maximum cost of {max_cost}. Requested query "
+            f"cost: {cost}. Reduce the number of requested items or fields."
+        )
+
+
+def validate_batch_cost(cost: int):
+    max_cost = settings.GRAPHQL_QUERY_MAX_COST
+    if max_cost and cost > max_cost:
+        raise QueryCostError(
+            f"The batch exceeds the maximum cost of {max_cost}. Requested cost "
+            f"of all operations: {cost}. Send fewer or smaller operations."
+        )
@@ -0,0 +1,79 @@
+"""Routing of read-only GraphQL operations to database replicas.
+
+Queries are executed with reads routed to one of `DATABASE_REPLICAS`;
+mutations always use the primary database. After a mutation the client reads
+from the primary for `DATABASE_REPLICA_READ_AFTER_WRITE_DELAY` seconds, so it
+sees its own writes even if the replicas lag behind. Clients are identified
+by their credentials or, when anonymous, by their IP address.
+
+Routing decisions are logged and tagged on the tracing span of the operation.
+"""
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from graphql.language import ast
+from graphql_jwt.utils import get_http_authorization
+
+from ..core.db.routers import choose_replica
+from ..core.utils import get_client_ip
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_KEY_PREFIX = "db_primary_pin:"
+
+ROUTED_TO_REPLICA = "replica"
+NOT_A_QUERY = "not_a_query"
+NO_REPLICAS = "no_replicas"
+READ_AFTER_WRITE = "read_after_write"
+
+
+def get_primary_pin_key(request: HttpRequest) -> str:
+    client = (
+        get_http_authorization(request)
+        or request.META.get("HTTP_AUTHORIZATION")
+        or get_client_ip(request)
+        or ""
+    )
+    client_hash = hashlib.sha256(str(client).encode("utf-8")).hexdigest()
+    return PRIMARY_PIN_KEY_PREFIX + client_hash
+
+
+def pin_to_primary(request: HttpRequest):
+    """Read from the primary database for a while after a write."""
+    # Following operations of a batch read from the primary too.
+    request.database_pinned = True  # type: ignore
+    delay = settings.DATABASE_REPLICA_READ_AFTER_WRITE_DELAY
+    if settings.DATABASE_REPLICAS and delay:
+        cache.set(get_primary_pin_key(request), 1, delay)
+
+
+def is_pinned_to_primary(request: HttpRequest) -> bool:
+    if getattr(request, "database_pinned", False):
+        return True
+    return bool(cache.get(get_primary_pin_key(request)))
+
+
+def choose_read_database(
+    request: HttpRequest, operation: Optional[ast.OperationDefinition]
+) -> Tuple[Optional[str], str]:
+    """Return the database alias reads of the operation go to and the reason.
+
+    `None` stands for the primary database.
+    """
+    if operation is None or operation.operation != "query":
+        reason = NOT_A_QUERY
+    elif not settings.DATABASE_REPLICAS:
+        reason = NO_REPLICAS
+    elif is_pinned_to_primary(request):
+        reason = READ_AFTER_WRITE
+    else:
+        alias = choose_replica()
+        logger.debug("Routing query reads to %s", alias)
+        return alias, ROUTED_TO_REPLICA
+    if reason != NO_REPLICAS:
+        logger.debug("Routing reads to the primary database (%s)", reason)
+    return None, reason
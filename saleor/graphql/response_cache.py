@@ -0,0 +1,231 @@
+"""Caching of complete responses to anonymous storefront queries.
+
+A response is cached when the request carries no credentials of a user or an
+app, the operation is a query and all of its root fields are listed in
+`ROOT_FIELD_TAGS`. Every cached response remembers the versions of the tags
+its root fields depend on; saving or deleting a model bumps the version of its
+tag, which makes all responses that depend on it stale.
+
+Changes made with `QuerySet.update()` or `bulk_create()` send no signals and
+have to be followed by `invalidate_tags()`; otherwise they show up when the
+cached responses expire. This is the case for stock allocations, so stock
+quantities in cached responses may be late by `GRAPHQL_RESPONSE_CACHE_TIMEOUT`.
+"""
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest
+from django.utils import translation
+from graphql.language import ast
+from graphql_jwt.utils import get_http_authorization
+
+from .utils import get_operation
+
+RESPONSE_CACHE_KEY_PREFIX = "graphql_response:"
+TAG_VERSION_KEY_PREFIX = "graphql_response_tag:"
+
+PRODUCT_TAGS = ("product", "category", "collection", "sale")
+
+# Tags of data that the root fields of the storefront API depend on.
+ROOT_FIELD_TAGS: Dict[str, Iterable[str]] = {
+    "shop": ("site", "menu", "collection", "vat"),
+    "menu": ("menu",),
+    "menus": ("menu",),
+    "category": ("category", "product", "sale"),
+    "categories": ("category", "product", "sale"),
+    "collection": ("collection", "product", "sale"),
+    "collections": ("collection", "product", "sale"),
+    "product": PRODUCT_TAGS,
+    "products": PRODUCT_TAGS,
+    "productVariant": PRODUCT_TAGS,
+    "productVariants": PRODUCT_TAGS,
+    "productFacets": PRODUCT_TAGS,
+}
+
+# Fields of `Shop` that depend on the client, the host or the configuration of
+# plugins rather than on the stored data; queries selecting them aren't cached.
+UNCACHEABLE_SHOP_FIELDS = {"availablePaymentGateways", "domain", "geolocalization"}
+
+# Models whose changes invalidate responses, mapped to their tags.
+TAGGED_MODELS = {
+    "product.Product": "product",
+    "product.ProductTranslation": "product",
+    "product.ProductType": "product",
+    "product.ProductVariant": "product",
+    "product.ProductVariantTranslation": "product",
+    "product.ProductImage": "product",
+    "product.VariantImage": "product",
+    "product.Attribute": "product",
+    "product.AttributeTranslation": "product",
+    "product.AttributeValue": "product",
+    "product.AttributeValueTranslation": "product",
+    "product.AssignedProductAttribute": "product",
+    "product.AssignedVariantAttribute": "product",
+    "warehouse.Stock": "product",
+    "product.Category": "category",
+    "product.CategoryTranslation": "category",
+    "product.Collection": "collection",
+    "product.CollectionTranslation": "collection",
+    "product.CollectionProduct": "collection",
+    "discount.Sale": "sale",
+    "discount.SaleTranslation": "sale",
+    "giftcard.GiftCard": "gift_card",
+    "menu.Menu": "menu",
+    "menu.MenuItem": "menu",
+    "menu.MenuItemTranslation": "menu",
+    "site.SiteSettings": "site",
+    "site.SiteSettingsTranslation": "site",
+    "sites.Site": "site",
+    "django_prices_vatlayer.VAT": "vat",
+    "plugins.PluginConfiguration": "plugin",
+    "shipping.ShippingZone": "shipping",
+    "shipping.ShippingMethod": "shipping",
+    "shipping.ShippingMethodTranslation": "shipping",
+}
+
+
+def is_anonymous_request(request: HttpRequest) -> bool:
+    """Return True if the request can't be authenticated as a user or an app."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return False
+    if getattr(request, "app", None):
+        return False
+    # Users are authenticated with a JWT sent in a header or a cookie and apps
+    # with a token in the authorization header.
+    if get_http_authorization(request):
+        return False
+    return not request.META.get("HTTP_AUTHORIZATION")
+
+
+def get_response_cache_tags(
+    document_ast: ast.Document, operation_name: Optional[str]
+) -> Optional[Set[str]]:
+    """Return tags of a cacheable query or None if it can't be cached."""
+    operation = get_operation(document_ast, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+    tags: Set[str] = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return None
+        field_tags = ROOT_FIELD_TAGS.get(selection.name.value)
+        if field_tags is None:
+            return None
+        if selection.name.value == "shop" and not _is_cacheable_shop(selection):
+            return None
+        tags.update(field_tags)
+    return tags
+
+
+def _is_cacheable_shop(field: ast.Field) -> bool:
+    for selection in field.selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return False
+        if selection.name.value in UNCACHEABLE_SHOP_FIELDS:
+            return False
+    return True
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    query: str,
+    variables: Optional[Dict[str, Any]],
+    operation_name: Optional[str],
+) -> str:
+    payload = [
+        query,
+        variables,
+        operation_name,
+        str(getattr(request, "country", "")),
+        getattr(request, "currency", ""),
+        translation.get_language(),
+    ]
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return RESPONSE_CACHE_KEY_PREFIX + digest
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    keys = {TAG_VERSION_KEY_PREFIX + tag: tag for tag in tags}
+    versions = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    for key, tag in keys.items():
+        if tag not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            versions[tag] = version
+    return versions
+
+
+def get_many_with_tag_versions(
+    cache_keys: Iterable[str], tags: Iterable[str]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Return cached values and the current versions of tags in a single read.
+
+    Unlike `get_tag_versions`, tags without a version are left out, so values
+    stored with their versions are stale.
+    """
+    tag_keys = {TAG_VERSION_KEY_PREFIX + tag: tag for tag in tags}
+    cached = cache.get_many([*cache_keys, *tag_keys])
+    tag_versions = {
+        tag: cached.pop(key) for key, tag in tag_keys.items() if key in cached
+    }
+    return cached, tag_versions
+
+
+def get_cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
+    cached = cache.get(cache_key)
+    if cached is None:
+        return None
+    tag_versions, data = cached
+    if get_tag_versions(tag_versions) != tag_versions:
+        return None
+    return data
+
+
+def set_cached_response(
+    cache_key: str, tag_versions: Dict[str, str], data: Dict[str, Any]
+):
+    """Store a response computed when the tags had the given versions.
+
+    Versions have to be read before the query is executed, so that a change
+    made during the execution makes the entry stale instead of being missed.
+    """
+    timeout = settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+    cache.set(cache_key, (tag_versions, data), timeout)
+
+
+def invalidate_tags(tags: List[str]):
+    def bump_versions():
+        cache.set_many(
+            {TAG_VERSION_KEY_PREFIX + tag: uuid.uuid4().hex for tag in tags},
+            timeout=None,
+        )
+
+    bump_versions()
+    # Responses cached by other processes before the commit would be stale.
+    transaction.on_commit(bump_versions)
+
+
+def invalidate_model_tag(sender, **_kwargs):
+    invalidate_tags([TAGGED_MODELS[sender._meta.label]])
+
+
+def connect_invalidation_signals(models: Iterable):
+    for model in models:
+        if model._meta.label not in TAGGED_MODELS:
+            continue
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_model_tag,
+                sender=model,
+                dispatch_uid="graphql_response_cache_%s" % model._meta.label,
+            )
@@ -12,6 +12,7 @@ from ..core.enums import WeightUnitsEnum
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ..core.types.common import ShopError
 from ..product.types import Collection
+from ..response_cache import invalidate_tags
 from .types import AuthorizationKey, AuthorizationKeyType, Shop
 
 
@@ -128,6 +129,8 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
         else:
             if site_settings.company_address:
                 site_settings.company_address.delete()
+                # Deleting the address clears the relation without a signal.
+                invalidate_tags(["site"])
         return ShopAddressUpdate(shop=Shop())
 
 
@@ -12,6 +12,7 @@ from ...menu import models as menu_models
 from ...plugins.manager import get_plugins_manager
 from ...product import models as product_models
 from ...site import models as site_models
+from ...site.snapshot import get_site_settings, get_site_settings_translation
 from ..account.types import Address, StaffNotificationRecipient
 from ..checkout.types import PaymentGateway
 from ..core.enums import WeightUnitsEnum
@@ -22,7 +23,6 @@ from ..menu.types import Menu
 from ..product.types import Collection
 from ..translations.enums import LanguageCodeEnum
 from ..translations.fields import TranslationField
-from ..translations.resolvers import resolve_translation
 from ..translations.types import ShopTranslation
 from ..utils import format_permissions_for_display
 from .enums import AuthorizationKeyType
@@ -191,7 +191,7 @@ class Shop(graphene.ObjectType):
 
     @staticmethod
     def resolve_domain(_, info):
-        site = info.context.site
+        site = get_site_settings().site
         return Domain(
             host=site.domain,
             ssl_enabled=settings.ENABLE_SSL,
@@ -214,11 +214,11 @@ class Shop(graphene.ObjectType):
 
     @staticmethod
     def resolve_description(_, info):
-        return info.context.site.settings.description
+        return get_site_settings().description
 
     @staticmethod
     def resolve_homepage_collection(_, info):
-        collection_pk = info.context.site.settings.homepage_collection_id
+        collection_pk = get_site_settings().homepage_collection_id
         qs = product_models.Collection.objects.all()
         return qs.filter(pk=collection_pk).first()
 
@@ -233,11 +233,11 @@ class Shop(graphene.ObjectType):
 
     @staticmethod
     def resolve_name(_, info):
-        return info.context.site.name
+        return get_site_settings().site.name
 
     @staticmethod
     def resolve_navigation(_, info):
-        site_settings = info.context.site.settings
+        site_settings = get_site_settings()
         qs = menu_models.Menu.objects.all()
         top_menu = qs.filter(pk=site_settings.top_menu_id).first()
         bottom_menu = qs.filter(pk=site_settings.bottom_menu_id).first()
@@ -254,27 +254,27 @@ class Shop(graphene.ObjectType):
 
     @staticmethod
     def resolve_header_text(_, info):
-        return info.context.site.settings.header_text
+        return get_site_settings().header_text
 
     @staticmethod
     def resolve_include_taxes_in_prices(_, info):
-        return info.context.site.settings.include_taxes_in_prices
+        return get_site_settings().include_taxes_in_prices
 
     @staticmethod
     def resolve_display_gross_prices(_, info):
-        return info.context.site.settings.display_gross_prices
+        return get_site_settings().display_gross_prices
 
     @staticmethod
     def resolve_charge_taxes_on_shipping(_, info):
-        return info.context.site.settings.charge_taxes_on_shipping
+        return get_site_settings().charge_taxes_on_shipping
 
     @staticmethod
     def resolve_track_inventory_by_default(_, info):
-        return info.context.site.settings.track_inventory_by_default
+        return get_site_settings().track_inventory_by_default
 
     @staticmethod
     def resolve_default_weight_unit(_, info):
-        return info.context.site.settings.default_weight_unit
+        return get_site_settings().default_weight_unit
 
     @staticmethod
     def resolve_default_country(_, _info):
@@ -292,40 +292,40 @@ class Shop(graphene.ObjectType):
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
     def resolve_default_mail_sender_name(_, info):
-        return info.context.site.settings.default_mail_sender_name
+        return get_site_settings().default_mail_sender_name
 
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
     def resolve_default_mail_sender_address(_, info):
-        return info.context.site.settings.default_mail_sender_address
+        return get_site_settings().default_mail_sender_address
 
     @staticmethod
     def resolve_company_address(_, info):
-        return info.context.site.settings.company_address
+        return get_site_settings().company_address
 
     @staticmethod
     def resolve_customer_set_password_url(_, info):
-        return info.context.site.settings.customer_set_password_url
+        return get_site_settings().customer_set_password_url
 
     @staticmethod
     def resolve_translation(_, info, language_code):
-        return resolve_translation(info.context.site.settings, info, language_code)
+        return get_site_settings_translation(language_code)
 
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
     def resolve_automatic_fulfillment_digital_products(_, info):
-        site_settings = info.context.site.settings
+        site_settings = get_site_settings()
         return site_settings.automatic_fulfillment_digital_products
 
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
     def resolve_default_digital_max_downloads(_, info):
-        return info.context.site.settings.default_digital_max_downloads
+        return get_site_settings().default_digital_max_downloads
 
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
     def resolve_default_digital_url_valid_days(_, info):
-        return info.context.site.settings.default_digital_url_valid_days
+        return get_site_settings().default_digital_url_valid_days
 
     @staticmethod
     @permission_required(SitePermissions.MANAGE_SETTINGS)
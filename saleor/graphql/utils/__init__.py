@@ -1,10 +1,11 @@
-from typing import Union
+from typing import Optional, Union
 
 import graphene
 from django.db.models import Value
 from django.db.models.functions import Concat
 from graphene_django.registry import get_global_registry
 from graphql.error import GraphQLError
+from graphql.language import ast
 from graphql_jwt.utils import jwt_payload
 from graphql_relay import from_global_id
 
@@ -140,3 +141,19 @@ def get_user_or_app_from_context(context):
 def requestor_is_superuser(requestor):
     """Return True if requestor is superuser."""
     return getattr(requestor, "is_superuser", False)
+
+
+def get_operation(
+    document_ast: ast.Document, operation_name: Optional[str]
+) -> Optional[ast.OperationDefinition]:
+    operations = [
+        definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    ]
+    if operation_name is None:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db.models import Q
 from django.utils import timezone
 
@@ -24,6 +25,30 @@ def filter_by_query_param(queryset, query, search_fields):
     return queryset
 
 
+def search_by_document(queryset, query, extra_filter=None):
+    """Filter queryset by its trigram-indexed `search_document` column.
+
+    Matching rows are annotated with `search_rank` which the `RANK` sort field
+    orders by. Documents are stored lower-cased, so a case-sensitive `LIKE` is
+    enough and the GIN index can serve it.
+
+    Keyword Arguments:
+        queryset - queryset of a model with the `search_document` field
+        query - search string
+        extra_filter - Q object of additional matches, e.g. an exact primary key
+
+    """
+    if not query:
+        return queryset
+    query = query.strip().lower()
+    lookup = Q(search_document__contains=query)
+    if extra_filter is not None:
+        lookup |= extra_filter
+    return queryset.filter(lookup).annotate(
+        search_rank=TrigramSimilarity("search_document", query)
+    )
+
+
 def reporting_period_to_date(period):
     now = timezone.now()
     if period == ReportingPeriod.TODAY:
@@ -1,6 +1,6 @@
 from typing import Tuple
 
-from django.db.models import QuerySet
+from django.db.models import FloatField, QuerySet, Value
 from graphql.error import GraphQLError
 from graphql_relay import from_global_id
 
@@ -110,3 +110,10 @@ def sort_queryset_by_default(
 
     order_by = {"field": ordering_fields, "direction": direction}
     return queryset.order_by(*default_ordering), order_by
+
+
+def annotate_search_rank(queryset: QuerySet) -> QuerySet:
+    """Rank every row equally unless a search filter already ranked them."""
+    if "search_rank" in queryset.query.annotations:
+        return queryset
+    return queryset.annotate(search_rank=Value(0, output_field=FloatField()))
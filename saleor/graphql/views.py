@@ -1,31 +1,71 @@
+import hashlib
 import json
 import logging
+import random
 import traceback
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
 from django.conf import settings
-from django.db import connection
+from django.db import DEFAULT_DB_ALIAS, connection, connections
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    HttpResponseNotModified,
+    JsonResponse,
+)
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.crypto import constant_time_compare
 from django.utils.functional import SimpleLazyObject
+from django.utils.http import parse_etags, quote_etag
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument, get_default_backend, validate
 from graphql.error import (
     GraphQLError,
     GraphQLSyntaxError,
     format_error as format_graphql_error,
 )
-from graphql.execution import ExecutionResult
+from graphql.execution import ExecutionResult, execute
+from graphql.language.ast import Document
 from graphql_jwt.exceptions import JSONWebTokenError
 
+from ..core.db.routers import get_read_database, use_read_database
 from ..core.exceptions import ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .executor import (
+    copy_request_context,
+    execute_concurrently,
+    merge_execution_results,
+    split_top_level_fields,
+)
+from .profiling import RequestProfiler, collect_stats, registry, render_metrics
+from .query_cost import (
+    QueryCostError,
+    calculate_query_cost,
+    get_query_cost_extensions,
+    validate_batch_cost,
+    validate_query_cost,
+)
+from .replicas import choose_read_database, pin_to_primary
+from .response_cache import (
+    get_cached_response,
+    get_response_cache_key,
+    get_response_cache_tags,
+    get_tag_versions,
+    is_anonymous_request,
+    set_cached_response,
+)
+from .utils import get_operation
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
@@ -44,6 +84,35 @@ def tracing_wrapper(execute, sql, params, many, context):
         return execute(sql, params, many, context)
 
 
+@contextmanager
+def database_wrappers(request: HttpRequest):
+    used_connections = [connection]
+    read_database = get_read_database()
+    if read_database:
+        used_connections.append(connections[read_database])
+    profiler = getattr(request, "graphql_profiler", None)
+    with ExitStack() as stack:
+        for conn in used_connections:
+            stack.enter_context(conn.execute_wrapper(tracing_wrapper))
+            if profiler is not None:
+                stack.enter_context(conn.execute_wrapper(profiler.sql_wrapper))
+        yield
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Expose resolver profiling statistics in the Prometheus format."""
+    token = settings.GRAPHQL_PROFILING_METRICS_TOKEN
+    if not token:
+        raise Http404()
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    if not constant_time_compare(authorization, f"Bearer {token}"):
+        return HttpResponse(status=401)
+    registry.flush()
+    return HttpResponse(
+        render_metrics(collect_stats()), content_type="text/plain; version=0.0.4"
+    )
+
+
 class GraphQLView(View):
     # This class is our implementation of `graphene_django.views.GraphQLView`,
     # which was extended to support the following features:
@@ -80,19 +149,20 @@ class GraphQLView(View):
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
-        if request.method == "GET":
+        if request.method == "GET" and "query" not in request.GET:
             if settings.PLAYGROUND_ENABLED:
                 return self.render_playground(request)
             return HttpResponseNotAllowed(["OPTIONS", "POST"])
         if request.method == "OPTIONS":
             response = self.options(request, *args, **kwargs)
-        elif request.method == "POST":
+        elif request.method in ("GET", "POST"):
+            # Queries sent with GET can be cached by HTTP caches and CDNs.
             response = self.handle_query(request)
         else:
             return HttpResponseNotAllowed(["GET", "OPTIONS", "POST"])
         # Add access control headers
         response["Access-Control-Allow-Origin"] = settings.ALLOWED_GRAPHQL_ORIGINS
-        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
         response[
             "Access-Control-Allow-Headers"
         ] = "Origin, Content-Type, Accept, Authorization"
@@ -111,15 +181,116 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            batch_cost_error = self.get_batch_cost_error(request, data)
+            if batch_cost_error:
+                return JsonResponse(
+                    data=[batch_cost_error for _entry in data], status=400, safe=False
+                )
+            if settings.GRAPHQL_CONCURRENT_EXECUTION and self.is_read_only_batch(
+                request, data
+            ):
+                # Operations of the batch already run concurrently, so their
+                # fields are executed in the same thread as the operation.
+                responses = execute_concurrently(
+                    [
+                        partial(
+                            self.get_response,
+                            copy_request_context(request),
+                            entry,
+                            concurrent_fields=False,
+                        )
+                        for entry in data
+                    ]
+                )
+            else:
+                responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
+            response = JsonResponse(data=result, status=status_code, safe=False)
+            if (
+                settings.GRAPHQL_RESPONSE_CACHE_HTTP_HEADERS
+                and status_code == 200
+                and getattr(request, "graphql_response_cacheable", False)
+            ):
+                return self.add_http_cache_headers(request, response)
+            return response
         return JsonResponse(data=result, status=status_code, safe=False)
 
+    def get_query_cost(self, request: HttpRequest, data: dict) -> int:
+        query, variables, operation_name = self.get_graphql_params(request, data)
+        document, error = self.parse_query(query)
+        if error:
+            return 0
+        try:
+            return calculate_query_cost(
+                self.schema,
+                document.document_ast,  # type: ignore
+                variables,
+                operation_name,
+            )
+        except Exception:
+            # Invalid operations are rejected when they are executed.
+            return 0
+
+    def get_batch_cost_error(self, request: HttpRequest, data: list):
+        """Return an error response if operations of the batch cost too much.
+
+        The limit applies to the whole batch, otherwise a client could send
+        many operations each just under the limit.
+        """
+        if not settings.GRAPHQL_QUERY_MAX_COST:
+            return None
+        cost = sum(
+            self.get_query_cost(request, entry)
+            for entry in data
+            if isinstance(entry, dict)
+        )
+        try:
+            validate_batch_cost(cost)
+        except QueryCostError as e:
+            return {
+                "errors": [self.format_error(e)],
+                "extensions": get_query_cost_extensions(cost),
+            }
+        return None
+
+    def is_read_only_batch(self, request: HttpRequest, data: list) -> bool:
+        """Return True if every operation of the batch is a query.
+
+        Mutations have to be executed in order, so that operations see the
+        changes made by the previous ones.
+        """
+        for entry in data:
+            if not isinstance(entry, dict):
+                return False
+            query, _variables, operation_name = self.get_graphql_params(request, entry)
+            document, error = self.parse_query(query)
+            if error:
+                # Invalid operations are rejected without being executed.
+                continue
+            operation = get_operation(
+                document.document_ast, operation_name  # type: ignore
+            )
+            if operation is None or operation.operation != "query":
+                return False
+        return True
+
+    @staticmethod
+    def add_http_cache_headers(request: HttpRequest, response: HttpResponse):
+        etag = quote_etag(hashlib.md5(response.content).hexdigest())
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponseNotModified()
+        response["ETag"] = etag
+        patch_cache_control(
+            response, public=True, max_age=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+        )
+        patch_vary_headers(response, ["Accept-Language", "Authorization", "Cookie"])
+        return response
+
     def handle_query(self, request: HttpRequest) -> JsonResponse:
         with opentracing.global_tracer().start_active_span("http") as scope:
             span = scope.span
@@ -153,9 +324,11 @@ class GraphQLView(View):
             return response
 
     def get_response(
-        self, request: HttpRequest, data: dict
+        self, request: HttpRequest, data: dict, concurrent_fields: bool = True
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
-        execution_result = self.execute_graphql_request(request, data)
+        execution_result = self.execute_graphql_request(
+            request, data, concurrent_fields=concurrent_fields
+        )
         status_code = 200
         if execution_result:
             response = {}
@@ -167,6 +340,8 @@ class GraphQLView(View):
                 status_code = 400
             else:
                 response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
             result: Optional[Dict[str, List[Any]]] = response
         else:
             result = None
@@ -204,7 +379,9 @@ class GraphQLView(View):
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
-    def execute_graphql_request(self, request: HttpRequest, data: dict):
+    def execute_graphql_request(
+        self, request: HttpRequest, data: dict, concurrent_fields: bool = True
+    ):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
@@ -221,28 +398,176 @@ class GraphQLView(View):
                 ]
                 span.set_tag("graphql.query", raw_query_string)
 
-            extra_options: Dict[str, Optional[Any]] = {}
+            profiler = None
+            sample_rate = settings.GRAPHQL_PROFILING_SAMPLE_RATE
+            if sample_rate and random.random() < sample_rate:
+                profiler = RequestProfiler()
+            # Entries of a batch share the request; profile only sampled ones.
+            request.graphql_profiler = profiler  # type: ignore
 
-            if self.executor:
-                # We only include it optionally since
-                # executor is not a valid argument in all backends
-                extra_options["executor"] = self.executor
+            query_cost = None
             try:
-                with connection.execute_wrapper(tracing_wrapper):
-                    return document.execute(  # type: ignore
-                        root=self.get_root_value(),
-                        variables=variables,
-                        operation_name=operation_name,
-                        context=request,
-                        middleware=self.middleware,
-                        **extra_options,
+                query_cost = calculate_query_cost(
+                    self.schema,
+                    document.document_ast,  # type: ignore
+                    variables,
+                    operation_name,
+                )
+                span.set_tag("graphql.query_cost", query_cost)
+                validate_query_cost(query_cost)
+                operation = get_operation(
+                    document.document_ast, operation_name  # type: ignore
+                )
+                if request.method == "GET" and (
+                    operation is None or operation.operation != "query"
+                ):
+                    raise GraphQLError("Only queries can be sent with GET requests.")
+                read_database, routing_reason = choose_read_database(request, operation)
+                span.set_tag("db.read_database", read_database or DEFAULT_DB_ALIAS)
+                span.set_tag("db.routing_reason", routing_reason)
+                with use_read_database(read_database):
+                    result = self.execute_document_cached(
+                        request,
+                        document,  # type: ignore
+                        query,
+                        variables,
+                        operation_name,
+                        concurrent_fields,
                     )
+                if operation is not None and operation.operation == "mutation":
+                    pin_to_primary(request)
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
-                return ExecutionResult(errors=[e], invalid=True)
+                result = ExecutionResult(errors=[e], invalid=True)
+            if query_cost is not None:
+                result.extensions.update(get_query_cost_extensions(query_cost))
+            if profiler is not None:
+                registry.add(profiler.stats)
+            return result
+
+    def execute_document_cached(
+        self,
+        request: HttpRequest,
+        document: GraphQLDocument,
+        query: str,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        concurrent_fields: bool,
+    ) -> ExecutionResult:
+        """Execute the document or serve the result from the response cache."""
+        tags = None
+        if settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT and is_anonymous_request(request):
+            tags = get_response_cache_tags(document.document_ast, operation_name)
+        request.graphql_response_cacheable = bool(tags)  # type: ignore
+        if not tags:
+            return self.execute_document(
+                request, document, variables, operation_name, concurrent_fields
+            )
+
+        cache_key = get_response_cache_key(request, query, variables, operation_name)
+        data = get_cached_response(cache_key)
+        if data is not None:
+            return ExecutionResult(data=data)
+        tag_versions = get_tag_versions(tags)
+        result = self.execute_document(
+            request, document, variables, operation_name, concurrent_fields
+        )
+        if not result.errors and not result.invalid:
+            set_cached_response(cache_key, tag_versions, result.data)
+        return result
+
+    def execute_document(
+        self,
+        request: HttpRequest,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        concurrent_fields: bool,
+    ) -> ExecutionResult:
+        if concurrent_fields and settings.GRAPHQL_CONCURRENT_EXECUTION:
+            documents = split_top_level_fields(document.document_ast, operation_name)
+            if documents:
+                return self.execute_concurrently(
+                    request, document.document_ast, documents, variables, operation_name
+                )
+        with database_wrappers(request):
+            return document.execute(
+                root=self.get_root_value(),
+                variables=variables,
+                operation_name=operation_name,
+                context=request,
+                middleware=self.middleware,
+                **self.get_extra_options(),
+            )
+
+    def get_extra_options(self) -> Dict[str, Optional[Any]]:
+        extra_options: Dict[str, Optional[Any]] = {}
+        if self.executor:
+            # We only include it optionally since
+            # executor is not a valid argument in all backends
+            extra_options["executor"] = self.executor
+        return extra_options
+
+    def execute_concurrently(
+        self,
+        request: HttpRequest,
+        document_ast: Document,
+        documents: List[Document],
+        variables: Optional[dict],
+        operation_name: Optional[str],
+    ) -> ExecutionResult:
+        """Execute top-level fields of a query concurrently and merge results.
+
+        The whole document is validated once; the split documents are executed
+        without validation as they are fragments of a valid query.
+        """
+        validation_errors = validate(self.schema, document_ast)
+        if validation_errors:
+            return ExecutionResult(errors=validation_errors, invalid=True)
+        results = execute_concurrently(
+            [
+                partial(
+                    self.execute_document_ast,
+                    copy_request_context(request),
+                    unit_ast,
+                    variables,
+                    operation_name,
+                )
+                for unit_ast in documents
+            ]
+        )
+        return merge_execution_results(results)
+
+    def execute_document_ast(
+        self,
+        request: HttpRequest,
+        document_ast: Document,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+    ) -> ExecutionResult:
+        with database_wrappers(request):
+            return execute(
+                self.schema,
+                document_ast,
+                root_value=self.get_root_value(),
+                context_value=request,
+                variable_values=variables,
+                operation_name=operation_name,
+                middleware=self.middleware,
+                **self.get_extra_options(),
+            )
 
     @staticmethod
     def parse_body(request: HttpRequest):
+        if request.method == "GET":
+            data = {
+                "query": request.GET.get("query"),
+                "operationName": request.GET.get("operationName"),
+            }
+            variables = request.GET.get("variables")
+            if variables:
+                data["variables"] = json.loads(variables)
+            return data
         content_type = request.content_type
         if content_type == "application/graphql":
             return {"query": request.body.decode("utf-8")}
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class MenuAppConfig(AppConfig):
+    name = "saleor.menu"
+
+    def ready(self):
+        from ..page.models import Page
+        from ..product.models import Category, Collection
+        from .models import Menu, MenuItem, MenuItemTranslation
+        from .signals import connect_menu_tree_signals
+
+        connect_menu_tree_signals(
+            [Menu, MenuItem, MenuItemTranslation, Category, Collection, Page]
+        )
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .tree import menu_tree
+
+
+def connect_menu_tree_signals(models):
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                menu_tree.invalidate_handler,
+                sender=model,
+                dispatch_uid="menu_tree_%s" % model.__name__,
+            )
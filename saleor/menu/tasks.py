@@ -0,0 +1,14 @@
+from django.core.cache import cache
+
+from ..celeryconf import app
+from .models import Menu
+from .utils import MENU_UPDATE_SCHEDULED_KEY, update_menu
+
+
+@app.task
+def update_menu_task(menu_pk: int):
+    # Changes made from now on schedule another update.
+    cache.delete(MENU_UPDATE_SCHEDULED_KEY % menu_pk)
+    menu = Menu.objects.filter(pk=menu_pk).first()
+    if menu:
+        update_menu(menu)
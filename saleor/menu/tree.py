@@ -0,0 +1,69 @@
+"""In-memory trees of menu items.
+
+Items of menus are loaded with a single query (plus one for translations),
+linked with their parents and children in memory and kept in a process-level
+snapshot, so menus of any depth are served without walking the tree through
+the ORM.
+
+The snapshot is invalidated when menus, menu items, their translations or the
+linked categories, collections and pages are saved or deleted (see
+`signals.py`). Changes made with `QuerySet.update()`, such as reordering
+items, have to be followed by `menu_tree.invalidate()`.
+
+Items in the snapshot are shared between requests and must not be modified.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..core.snapshots import VersionedSnapshot
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from django.db.models import QuerySet
+
+    from .models import MenuItem
+
+
+@dataclass
+class MenuTree:
+    # Top-level items of every menu, in the menu order.
+    top_items: Dict[int, List["MenuItem"]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    children: Dict[int, List["MenuItem"]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+    def get_top_items(self, menu_id: int) -> List["MenuItem"]:
+        return self.top_items.get(menu_id, [])
+
+    def get_children(self, item_id: int) -> List["MenuItem"]:
+        return self.children.get(item_id, [])
+
+
+def build_menu_tree(items: Optional["QuerySet"] = None) -> MenuTree:
+    from .models import MenuItem
+
+    if items is None:
+        items = MenuItem.objects.all()
+    items = (
+        items.select_related("category", "collection", "page")
+        .prefetch_related("translations")
+        .order_by("sort_order", "pk")
+    )
+    items_by_pk = {item.pk: item for item in items}
+    parent_field = MenuItem._meta.get_field("parent")
+    tree = MenuTree()
+    for item in items_by_pk.values():
+        parent = items_by_pk.get(item.parent_id)
+        if parent is None:
+            tree.top_items[item.menu_id].append(item)
+        else:
+            # Resolving the parent of an item doesn't need a query.
+            parent_field.set_cached_value(item, parent)
+            tree.children[parent.pk].append(item)
+    return tree
+
+
+menu_tree = VersionedSnapshot("menu_tree", build_menu_tree)
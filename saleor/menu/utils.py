@@ -1,6 +1,15 @@
+from functools import partial
+from typing import Iterable
+
+from django.core.cache import cache
 from django.db import transaction
 
 from ..menu.models import Menu
+from .tree import build_menu_tree, menu_tree
+
+MENU_UPDATE_SCHEDULED_KEY = "menu_update_scheduled:%s"
+# Seconds a menu update waits for further changes of the menu.
+MENU_UPDATE_DELAY = 5
 
 
 def get_menu_item_as_dict(menu_item):
@@ -15,36 +24,18 @@ def get_menu_item_as_dict(menu_item):
 
 
 def get_menu_as_json(menu):
-    """Build a tree structure from top menu items, its children and grandchildren."""
-    top_items = menu.items.filter(parent=None).prefetch_related(
-        "category",
-        "page",
-        "collection",
-        "children__category",
-        "children__page",
-        "children__collection",
-        "children__children__category",
-        "children__children__page",
-        "children__children__collection",
-        "translations",
-        "children__translations",
-        "children__children__translations",
-    )
-    menu_data = []
-    for item in top_items:
-        top_item_data = get_menu_item_as_dict(item)
-        top_item_data["child_items"] = []
-        children = item.children.all()
-        for child in children:
-            child_data = get_menu_item_as_dict(child)
-            grand_children = child.children.all()
-            grand_children_data = [
-                get_menu_item_as_dict(grand_child) for grand_child in grand_children
-            ]
-            child_data["child_items"] = grand_children_data
-            top_item_data["child_items"].append(child_data)
-        menu_data.append(top_item_data)
-    return menu_data
+    """Build a tree structure of all menu items, regardless of their depth."""
+    tree = build_menu_tree(menu.items.all())
+
+    def get_items_data(items):
+        items_data = []
+        for item in items:
+            item_data = get_menu_item_as_dict(item)
+            item_data["child_items"] = get_items_data(tree.get_children(item.pk))
+            items_data.append(item_data)
+        return items_data
+
+    return get_items_data(tree.get_top_items(menu.pk))
 
 
 @transaction.atomic
@@ -57,3 +48,21 @@ def update_menus(menus_pk):
 def update_menu(menu):
     menu.json_content = get_menu_as_json(menu)
     menu.save(update_fields=["json_content"])
+
+
+def _schedule_menu_update(menu_pk: int):
+    from .tasks import update_menu_task
+
+    # Changes made until the task runs are rendered by the scheduled one.
+    if cache.add(MENU_UPDATE_SCHEDULED_KEY % menu_pk, 1, MENU_UPDATE_DELAY * 10):
+        update_menu_task.apply_async(args=[menu_pk], countdown=MENU_UPDATE_DELAY)
+
+
+def schedule_menus_update(menus_pk: Iterable[int]):
+    """Refresh menu trees and render the JSON of menus once the changes commit.
+
+    Consecutive changes of a menu are rendered together in a Celery task.
+    """
+    menu_tree.invalidate()
+    for menu_pk in set(menus_pk):
+        transaction.on_commit(partial(_schedule_menu_update, menu_pk))
@@ -0,0 +1,29 @@
+# Generated by Django 3.0.6 on 2026-10-18 22:49
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0083_merge_20200421_0529"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="order",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -25,6 +26,7 @@ from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
 from ..shipping.models import ShippingMethod
 from . import FulfillmentStatus, OrderEvents, OrderStatus
+from .search import ORDER_SEARCH_FIELDS, prepare_order_search_document_value
 
 
 class OrderQueryset(models.QuerySet):
@@ -168,15 +170,29 @@ class Order(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    search_document = models.TextField(blank=True, default="", editable=False)
     objects = OrderQueryset.as_manager()
 
     class Meta:
         ordering = ("-pk",)
         permissions = ((OrderPermissions.MANAGE_ORDERS.codename, "Manage orders."),)
+        indexes = [
+            GinIndex(
+                name="order_search_gin",
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.search_document = prepare_order_search_document_value(self)
+        elif set(update_fields) & {*ORDER_SEARCH_FIELDS, "search_document"}:
+            self.search_document = prepare_order_search_document_value(self)
+            kwargs["update_fields"] = {*update_fields, "search_document"}
         return super().save(*args, **kwargs)
 
     def is_fully_paid(self):
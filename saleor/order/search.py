@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING, Iterable, List
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import Order
+
+# Fields of the order that the search document is built from. Saving any of them
+# refreshes the document.
+ORDER_SEARCH_FIELDS = (
+    "user",
+    "user_email",
+    "discount_name",
+    "translated_discount_name",
+)
+
+
+def prepare_order_search_document_value(order: "Order") -> str:
+    """Return the lower-cased text that order search matches against.
+
+    The customer's name is copied from the user, so renaming a user refreshes the
+    documents of their orders (see `update_orders_search_document`).
+    """
+    values: List[str] = [order.user_email]
+    user = order.user
+    if user:
+        values += [user.email, user.first_name, user.last_name]
+    values += [order.discount_name, order.translated_discount_name]
+    return "\n".join(value for value in values if value).lower()
+
+
+def update_orders_search_document(orders: Iterable["Order"]):
+    from .models import Order
+
+    orders = list(orders)
+    for order in orders:
+        order.search_document = prepare_order_search_document_value(order)
+    Order.objects.bulk_update(orders, ["search_document"], batch_size=500)
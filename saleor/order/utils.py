@@ -18,6 +18,7 @@ from ..shipping.models import ShippingMethod
 from ..warehouse.management import deallocate_stock, increase_stock
 from ..warehouse.models import Warehouse
 from . import events
+from .search import update_orders_search_document
 
 
 def get_order_country(order: Order) -> str:
@@ -334,4 +335,9 @@ def get_voucher_discount_for_order(order: Order) -> Money:
 
 
 def match_orders_with_new_user(user: User) -> None:
-    Order.objects.confirmed().filter(user_email=user.email, user=None).update(user=user)
+    orders = Order.objects.confirmed().filter(user_email=user.email, user=None)
+    order_pks = list(orders.values_list("pk", flat=True))
+    orders.update(user=user)
+    update_orders_search_document(
+        Order.objects.filter(pk__in=order_pks).select_related("user")
+    )
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class PluginsAppConfig(AppConfig):
+    name = "saleor.plugins"
+
+    def ready(self):
+        from .vatlayer.signals import connect_tax_rates_signals
+
+        connect_tax_rates_signals()
@@ -1,18 +1,26 @@
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from urllib.parse import urljoin
 
+import opentracing
+import opentracing.tags
 import requests
 from django.conf import settings
-from django.contrib.sites.models import Site
 from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 from ...checkout import base_calculations
+from ...site.snapshot import get_site_settings
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -29,6 +37,20 @@ TAX_CODES_CACHE_TIME = 60 * 60 * 24 * 7  # 7 days
 CACHE_KEY = "avatax_request_id_"
 TAX_CODES_CACHE_KEY = "avatax_tax_codes_cache_key"
 TIMEOUT = 10  # API HTTP Requests Timeout
+# Responses larger than this (in characters of JSON) aren't cached.
+MAX_CACHED_RESPONSE_SIZE = 256 * 1024
+
+# Connections to Avatax kept alive by each process.
+POOL_SIZE = 10
+# Retries of requests that failed to connect or got one of `RETRY_STATUSES`.
+MAX_RETRIES = 2
+RETRY_BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Requests are stopped for `CIRCUIT_BREAKER_RESET_TIMEOUT` seconds after
+# `CIRCUIT_BREAKER_MAX_FAILURES` failed requests in a row.
+CIRCUIT_BREAKER_MAX_FAILURES = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30
 
 # Common carrier code used to identify the line as a shipping service
 COMMON_CARRIER_CODE = "FR020100"
@@ -65,33 +87,142 @@ class CustomerErrors:
 
 def get_api_url(use_sandbox=True) -> str:
     """Based on settings return sanbox or production url."""
+    if settings.AVATAX_API_URL:
+        return settings.AVATAX_API_URL
     if use_sandbox:
         return "https://sandbox-rest.avatax.com/api/v2/"
     return "https://rest.avatax.com/api/v2/"
 
 
+class CircuitBreaker:
+    """Stop calling a failing API for a while.
+
+    After `max_failures` failed requests in a row the circuit opens and requests
+    are refused for `reset_timeout` seconds. Then a single request is let
+    through, which closes the circuit if it succeeds.
+    """
+
+    def __init__(self, max_failures: int, reset_timeout: float):
+        self.max_failures = max_failures
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Let a trial request through and keep refusing the others.
+            self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.reset()
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                self.opened_at = time.monotonic()
+
+
+circuit_breaker = CircuitBreaker(
+    CIRCUIT_BREAKER_MAX_FAILURES, CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+
+
+def get_session() -> requests.Session:
+    """Return the HTTP session of the process.
+
+    The session keeps connections to Avatax alive between requests and retries
+    the ones that fail to connect or are throttled.
+    """
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        # Connections of a session inherited from the parent of a forked
+        # worker can't be shared.
+        retries = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            # Creating and adjusting transactions is idempotent.
+            method_whitelist=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=POOL_SIZE, max_retries=retries)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def api_request(
+    method: str,
+    url: str,
+    config: AvataxConfiguration,
+    data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Send a request to Avatax and return its JSON response or {} on failure.
+
+    Each request is traced as a span with its duration.
+    """
+    if not circuit_breaker.allow_request():
+        logger.warning("Skipped a request to Avatax after repeated failures %s", url)
+        return {}
+
+    auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
+    with opentracing.global_tracer().start_active_span("avatax") as scope:
+        span = scope.span
+        span.set_tag(opentracing.tags.COMPONENT, "taxes")
+        span.set_tag(opentracing.tags.HTTP_METHOD, method)
+        span.set_tag(opentracing.tags.HTTP_URL, url)
+        start = time.monotonic()
+        try:
+            response = get_session().request(
+                method,
+                url,
+                auth=auth,
+                data=json.dumps(data) if data is not None else None,
+                timeout=TIMEOUT,
+            )
+            span.set_tag(opentracing.tags.HTTP_STATUS_CODE, response.status_code)
+            response_data = response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            span.set_tag(opentracing.tags.ERROR, True)
+            circuit_breaker.record_failure()
+            logger.warning("Failed to fetch data from Avatax %s", url)
+            return {}
+        finally:
+            logger.debug(
+                "[%s] Hit to Avatax %s in %.3fs", method, url, time.monotonic() - start
+            )
+
+    if response.status_code >= 500:
+        circuit_breaker.record_failure()
+    else:
+        circuit_breaker.record_success()
+    return response_data
+
+
 def api_post_request(
     url: str, data: Dict[str, Any], config: AvataxConfiguration
 ) -> Dict[str, Any]:
-    try:
-        auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
-        response = requests.post(url, auth=auth, data=json.dumps(data), timeout=TIMEOUT)
-        logger.debug("Hit to Avatax to calculate taxes %s", url)
-    except requests.exceptions.RequestException:
-        logger.warning("Fetching taxes failed %s", url)
-        return {}
-    return response.json()
+    return api_request("POST", url, config, data)
 
 
 def api_get_request(url: str, config: AvataxConfiguration):
-    try:
-        auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
-        response = requests.get(url, auth=auth, timeout=TIMEOUT)
-        logger.debug("[GET] Hit to %s", url)
-    except requests.exceptions.RequestException:
-        logger.warning("Failed to fetch data from %s", url)
-        return {}
-    return response.json()
+    return api_request("GET", url, config)
 
 
 def _validate_adddress_details(
@@ -131,45 +262,27 @@ def _validate_checkout(checkout: "Checkout") -> bool:
     )
 
 
-def _retrieve_from_cache(token):
-    taxes_cache_key = CACHE_KEY + token
-    cached_data = cache.get(taxes_cache_key)
-    return cached_data
-
-
-def checkout_needs_new_fetch(data, checkout_token: str) -> bool:
-    """Check if avatax's checkout response is cached or not.
+def get_request_cache_key(data: Dict[str, Any], config: AvataxConfiguration) -> str:
+    """Return a cache key of the tax request, the same for identical requests.
 
-    We store the response from avatax for checkout object for given time. If object
-    doesn't exist in cache or something has changed, then we fetch data from avatax.
+    Sales orders are quotes that aren't recorded by Avatax, so their code and
+    the customer's email are left out and identical carts of different checkouts
+    share the response.
     """
-
-    cached_checkout = _retrieve_from_cache(checkout_token)
-
-    if not cached_checkout:
-        return True
-
-    cached_request_data, cached_response = cached_checkout
-    if data != cached_request_data:
-        return True
-    return False
-
-
-def taxes_need_new_fetch(data: Dict[str, Any], taxes_token: str) -> bool:
-    """Check if Avatax's taxes data need to be refetched.
-
-    The response from Avatax is stored in a cache. If an object doesn't exist in cache
-    or something has changed, taxes need to be refetched.
-    """
-    cached_data = _retrieve_from_cache(taxes_token)
-
-    if not cached_data:
-        return True
-
-    cached_request_data, _ = cached_data
-    if data != cached_request_data:
-        return True
-    return False
+    transaction = dict(data["createTransactionModel"])
+    if transaction.get("type") == TransactionType.ORDER:
+        transaction.pop("code", None)
+        transaction.pop("email", None)
+    payload = [
+        transaction,
+        config.username_or_account,
+        config.password_or_license,
+        config.use_sandbox,
+    ]
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return CACHE_KEY + digest
 
 
 def append_line_to_data(
@@ -182,7 +295,7 @@ def append_line_to_data(
     tax_included: Optional[bool] = None,
 ):
     if tax_included is None:
-        tax_included = Site.objects.get_current().settings.include_taxes_in_prices
+        tax_included = get_site_settings().include_taxes_in_prices
     data.append(
         {
             "quantity": quantity,
@@ -196,9 +309,7 @@ def append_line_to_data(
 
 
 def append_shipping_to_data(data: List[Dict], shipping_method):
-    charge_taxes_on_shipping = (
-        Site.objects.get_current().settings.charge_taxes_on_shipping
-    )
+    charge_taxes_on_shipping = get_site_settings().charge_taxes_on_shipping
     if charge_taxes_on_shipping and shipping_method:
         append_line_to_data(
             data,
@@ -289,7 +400,7 @@ def generate_request_data(
     config: AvataxConfiguration,
     currency=settings.DEFAULT_CURRENCY,
 ):
-    company_address = Site.objects.get_current().settings.company_address
+    company_address = get_site_settings().company_address
     if company_address:
         company_address = company_address.as_data()
     else:
@@ -364,29 +475,26 @@ def _fetch_new_taxes_data(
     )
     response = api_post_request(transaction_url, data, config)
     if response and "error" not in response:
-        cache.set(data_cache_key, (data, response), CACHE_TIME)
+        if len(json.dumps(response)) <= MAX_CACHED_RESPONSE_SIZE:
+            cache.set(data_cache_key, response, CACHE_TIME)
     else:
         # cache failed response to limit hits to avatax.
-        cache.set(data_cache_key, (data, response), 10)
+        cache.set(data_cache_key, response, 10)
     return response
 
 
 def get_cached_response_or_fetch(
-    data: Dict[str, Dict],
-    token_in_cache: str,
-    config: AvataxConfiguration,
-    force_refresh: bool = False,
+    data: Dict[str, Dict], config: AvataxConfiguration, force_refresh: bool = False
 ):
     """Try to find response in cache.
 
-    Return cached response if requests data are the same. Fetch new data in other cases.
+    Return the cached response of an identical request. Fetch new data in other
+    cases.
     """
-    data_cache_key = CACHE_KEY + token_in_cache
-    if taxes_need_new_fetch(data, token_in_cache) or force_refresh:
+    data_cache_key = get_request_cache_key(data, config)
+    response = None if force_refresh else cache.get(data_cache_key)
+    if response is None:
         response = _fetch_new_taxes_data(data, data_cache_key, config)
-    else:
-        _, response = cache.get(data_cache_key)
-
     return response
 
 
@@ -394,7 +502,7 @@ def get_checkout_tax_data(
     checkout: "Checkout", discounts, config: AvataxConfiguration
 ) -> Dict[str, Any]:
     data = generate_request_data_from_checkout(checkout, config, discounts=discounts)
-    return get_cached_response_or_fetch(data, str(checkout.token), config)
+    return get_cached_response_or_fetch(data, config)
 
 
 def get_order_tax_data(
@@ -415,9 +523,7 @@ def get_order_tax_data(
         config=config,
         currency=order.total.currency,
     )
-    response = get_cached_response_or_fetch(
-        data, "order_%s" % order.token, config, force_refresh
-    )
+    response = get_cached_response_or_fetch(data, config, force_refresh)
     return response
 
 
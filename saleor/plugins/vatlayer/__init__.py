@@ -1,9 +1,10 @@
 from dataclasses import dataclass
+from decimal import Decimal
 
-from django_prices_vatlayer.utils import get_tax_for_rate, get_tax_rates_for_country
-from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
+from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange, flat_tax
 
 from ...core.taxes import charge_taxes_on_shipping, include_taxes_in_prices
+from .snapshot import get_tax_rates_table
 
 
 class TaxRateType:
@@ -101,30 +102,42 @@ def apply_tax_to_price(taxes, rate_name, base):
     return tax_to_apply(base, keep_gross=keep_gross)
 
 
-def get_taxes_for_country(country):
-    tax_rates = get_tax_rates_for_country(country.code)
-    if tax_rates is None:
-        return None
+def get_tax_for_rate(rate: Decimal):
+    """Return a function applying the tax of the given percentage rate."""
+    tax_rate = rate / 100
+
+    def tax(base, keep_gross=False):
+        return flat_tax(base, tax_rate, keep_gross=keep_gross)
 
+    return tax
+
+
+def get_taxes_for_rates(tax_rates):
     taxes = {
         DEFAULT_TAX_RATE_NAME: {
             "value": tax_rates["standard_rate"],
-            "tax": get_tax_for_rate(tax_rates),
+            "tax": get_tax_for_rate(tax_rates["standard_rate"]),
         }
     }
-    if tax_rates["reduced_rates"]:
-        taxes.update(
-            {
-                rate_name: {
-                    "value": tax_rates["reduced_rates"][rate_name],
-                    "tax": get_tax_for_rate(tax_rates, rate_name),
-                }
-                for rate_name in tax_rates["reduced_rates"]
-            }
-        )
+    taxes.update(
+        {
+            rate_name: {"value": rate, "tax": get_tax_for_rate(rate)}
+            for rate_name, rate in tax_rates["reduced_rates"].items()
+        }
+    )
     return taxes
 
 
+def get_taxes_for_country(country, tax_rates_table=None):
+    """Return taxes of the country from the process-level table of rates."""
+    if tax_rates_table is None:
+        tax_rates_table = get_tax_rates_table()
+    tax_rates = tax_rates_table.get(country.code)
+    if tax_rates is None:
+        return None
+    return get_taxes_for_rates(tax_rates)
+
+
 def get_tax_rate_by_name(rate_name, taxes=None):
     """Return value of tax rate for current taxes."""
     if not taxes or not rate_name:
@@ -23,6 +23,7 @@ from . import (
     get_taxed_shipping_price,
     get_taxes_for_country,
 )
+from .snapshot import get_tax_rates_table
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -54,6 +55,7 @@ class VatlayerPlugin(BasePlugin):
         configuration = {item["name"]: item["value"] for item in self.configuration}
         self.config = VatlayerConfiguration(access_key=configuration["Access key"])
         self._cached_taxes = {}
+        self._tax_rates_table = None
 
     def _skip_plugin(self, previous_value: Union[TaxedMoney, TaxedMoneyRange]) -> bool:
         if not self.active or not self.config.access_key:
@@ -93,15 +95,17 @@ class VatlayerPlugin(BasePlugin):
     def _get_taxes_for_country(self, country: Country):
         """Try to fetch cached taxes on the plugin level.
 
-        If the plugin doesn't have cached taxes for a given country it will fetch it
-        from cache or db.
+        If the plugin doesn't have cached taxes for a given country it will take
+        them from the process-level table of rates, read once per plugin.
         """
         if not country:
             country = Country(settings.DEFAULT_COUNTRY)
         country_code = country.code
         if country_code in self._cached_taxes:
             return self._cached_taxes[country_code]
-        taxes = get_taxes_for_country(country)
+        if self._tax_rates_table is None:
+            self._tax_rates_table = get_tax_rates_table()
+        taxes = get_taxes_for_country(country, self._tax_rates_table)
         self._cached_taxes[country_code] = taxes
         return taxes
 
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django_prices_vatlayer.models import VAT
+
+from .snapshot import tax_rates_snapshot
+
+
+def connect_tax_rates_signals():
+    for signal in (post_save, post_delete):
+        signal.connect(
+            tax_rates_snapshot.invalidate_handler,
+            sender=VAT,
+            dispatch_uid="vatlayer_tax_rates",
+        )
@@ -0,0 +1,57 @@
+"""Process-level table of VAT rates of all countries.
+
+Prices of every product in a listing or a checkout are taxed through the
+rates of the customer's country. The table keeps the standard and reduced
+rates of all countries in memory as `Decimal` percentages, so applying a tax
+doesn't touch the database or the cache.
+
+The table is rebuilt when VAT rates are saved or deleted, which is what
+`fetch_taxes_data` of the plugin does (see `signals.py`). It's shared between
+requests and is immutable.
+"""
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from django_prices_vatlayer.models import VAT
+
+from ...core.snapshots import VersionedSnapshot
+
+TaxRatesTable = Mapping[str, Mapping[str, Any]]
+
+
+def to_decimal(rate) -> Decimal:
+    # Rates are stored in JSON; a float has to go through its shortest repr.
+    return Decimal(str(rate))
+
+
+def build_tax_rates(data) -> Optional[Mapping[str, Any]]:
+    try:
+        standard_rate = data["standard_rate"]
+        reduced_rates = data["reduced_rates"] or {}
+    except (KeyError, TypeError):
+        return None
+    return MappingProxyType(
+        {
+            "standard_rate": to_decimal(standard_rate),
+            "reduced_rates": MappingProxyType(
+                {name: to_decimal(rate) for name, rate in reduced_rates.items()}
+            ),
+        }
+    )
+
+
+def build_tax_rates_table() -> TaxRatesTable:
+    table = {}
+    for country_code, data in VAT.objects.values_list("country_code", "data"):
+        tax_rates = build_tax_rates(data)
+        if tax_rates is not None:
+            table[country_code] = tax_rates
+    return MappingProxyType(table)
+
+
+tax_rates_snapshot = VersionedSnapshot("vatlayer_tax_rates", build_tax_rates_table)
+
+
+def get_tax_rates_table() -> TaxRatesTable:
+    return tax_rates_snapshot.get()
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class ProductAppConfig(AppConfig):
+    name = "saleor.product"
+
+    def ready(self):
+        from .models import (
+            AssignedProductAttribute,
+            AssignedVariantAttribute,
+            Category,
+        )
+        from .signals import (
+            connect_category_tree_signals,
+            connect_product_attribute_values_signals,
+        )
+
+        connect_category_tree_signals(Category)
+        connect_product_attribute_values_signals(
+            AssignedProductAttribute, AssignedVariantAttribute
+        )
@@ -0,0 +1,91 @@
+"""In-memory snapshot of the category tree.
+
+MPTT answers ancestor and descendant questions with a query per category.
+The snapshot loads the whole tree with a single `values()` query and keeps
+descendant sets and parent links in dictionaries, so the lookups are served
+from memory.
+
+The snapshot is invalidated when categories are saved or deleted (see
+`signals.py`). Changes made with `QuerySet.update()`, `bulk_create()` or
+`Category.tree.rebuild()` send no signals and have to be followed by
+`category_tree.invalidate()`.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+from ..core.snapshots import VersionedSnapshot
+
+
+@dataclass
+class CategoryTree:
+    parents: Dict[int, Optional[int]] = field(default_factory=dict)
+    names: Dict[int, str] = field(default_factory=dict)
+    slugs: Dict[int, str] = field(default_factory=dict)
+    # Children in the tree order.
+    children: Dict[int, List[int]] = field(default_factory=dict)
+    # Descendants of every category, including the category itself.
+    descendants: Dict[int, FrozenSet[int]] = field(default_factory=dict)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self.parents
+
+    def get_children_ids(self, category_id: int) -> List[int]:
+        return self.children.get(category_id, [])
+
+    def get_descendant_ids(
+        self, category_id: int, include_self: bool = True
+    ) -> FrozenSet[int]:
+        descendants = self.descendants.get(category_id, frozenset())
+        if include_self:
+            return descendants
+        return descendants - {category_id}
+
+    def get_ancestor_ids(
+        self, category_id: int, include_self: bool = False
+    ) -> List[int]:
+        """Return ids of the category ancestors, starting from the root."""
+        ancestors = [category_id] if include_self else []
+        parent_id = self.parents.get(category_id)
+        while parent_id is not None:
+            ancestors.append(parent_id)
+            parent_id = self.parents.get(parent_id)
+        ancestors.reverse()
+        return ancestors
+
+    def get_name_path(self, category_id: int) -> List[str]:
+        ids = self.get_ancestor_ids(category_id, include_self=True)
+        return [self.names[pk] for pk in ids]
+
+    def get_slug_path(self, category_id: int) -> List[str]:
+        ids = self.get_ancestor_ids(category_id, include_self=True)
+        return [self.slugs[pk] for pk in ids]
+
+
+def build_category_tree() -> CategoryTree:
+    from .models import Category
+
+    tree = CategoryTree()
+    categories = Category.objects.order_by("tree_id", "lft").values_list(
+        "pk", "parent_id", "name", "slug"
+    )
+    order = []
+    for pk, parent_id, name, slug in categories:
+        order.append(pk)
+        tree.parents[pk] = parent_id
+        tree.names[pk] = name
+        tree.slugs[pk] = slug
+        tree.children[pk] = []
+        if parent_id is not None:
+            tree.children[parent_id].append(pk)
+
+    # Descendants come after their ancestors in the tree order, so walking it
+    # backwards visits children first.
+    for pk in reversed(order):
+        descendants = {pk}
+        for child_id in tree.children[pk]:
+            descendants.update(tree.descendants[child_id])
+        tree.descendants[pk] = frozenset(descendants)
+    return tree
+
+
+category_tree = VersionedSnapshot("category_tree", build_category_tree)
@@ -1,15 +1,13 @@
-import functools
-import operator
 from collections import OrderedDict, defaultdict
 from itertools import chain
 from typing import Dict, Iterable
 
-from django.db.models import Q, QuerySet
+from django.db.models import Count, F, Func, QuerySet
 from django.forms import CheckboxSelectMultiple
 from django_filters import MultipleChoiceFilter, OrderingFilter, RangeFilter
 
 from ..core.filters import SortedFilterSet
-from .models import Attribute, Product
+from .models import Attribute, AttributeValue, Product
 
 SORT_BY_FIELDS = OrderedDict(
     [
@@ -24,18 +22,65 @@ T_PRODUCT_FILTER_QUERIES = Dict[int, Iterable[int]]
 
 
 def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
-    # Combine filters of the same attribute with OR operator
-    # and then combine full query with AND operator.
-    combine_and = [
-        Q(**{"attributes__values__pk__in": values_pk})
-        | Q(**{"variants__attributes__values__pk__in": values_pk})
-        for _, values_pk in queries.items()
-    ]
-    query = functools.reduce(operator.and_, combine_and)
-    qs = qs.filter(query).distinct()
+    # Match any of the values of the same attribute
+    # and then combine filters of the attributes with AND operator.
+    for _, values_pk in queries.items():
+        qs = qs.filter(attribute_values__overlap=list(values_pk))
     return qs
 
 
+def count_products_by_attribute_values(qs) -> Dict[int, int]:
+    """Return the number of products in the queryset per attribute value."""
+    counts = (
+        qs.order_by()
+        .annotate(value_pk=Func(F("attribute_values"), function="unnest"))
+        .values("value_pk")
+        .annotate(count=Count("pk"))
+        .values_list("value_pk", "count")
+    )
+    return dict(counts)
+
+
+def get_attribute_values_facets(
+    qs, queries: T_PRODUCT_FILTER_QUERIES
+) -> Dict[int, int]:
+    """Return the number of products per attribute value for the given filters.
+
+    Values of an attribute that is filtered by are counted without the filter of
+    that attribute, so they show how many products would match if the value was
+    selected as well.
+    """
+    counts = count_products_by_attribute_values(
+        filter_products_by_attributes_values(qs, queries)
+    )
+    if not queries:
+        return counts
+
+    values_attributes = dict(
+        AttributeValue.objects.filter(attribute_id__in=queries.keys()).values_list(
+            "pk", "attribute_id"
+        )
+    )
+    counts = {
+        value_pk: count
+        for value_pk, count in counts.items()
+        if value_pk not in values_attributes
+    }
+    for attribute_pk in queries:
+        other_queries = {
+            pk: values_pk for pk, values_pk in queries.items() if pk != attribute_pk
+        }
+        attribute_counts = count_products_by_attribute_values(
+            filter_products_by_attributes_values(qs, other_queries)
+        )
+        counts.update(
+            (value_pk, count)
+            for value_pk, count in attribute_counts.items()
+            if values_attributes.get(value_pk) == attribute_pk
+        )
+    return counts
+
+
 class AttributeValuesFilter(MultipleChoiceFilter):
     """A filter that is only there for rendering the attribute fields.
 
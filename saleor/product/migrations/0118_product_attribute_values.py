@@ -0,0 +1,57 @@
+# Generated by Django 3.0.6 on 2026-10-19 00:16
+
+from collections import defaultdict
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def populate_product_attribute_values(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    AssignedProductAttribute = apps.get_model("product", "AssignedProductAttribute")
+    AssignedVariantAttribute = apps.get_model("product", "AssignedVariantAttribute")
+
+    values = defaultdict(set)
+    product_values = AssignedProductAttribute.values.through.objects.values_list(
+        "assignedproductattribute__product_id", "attributevalue_id"
+    )
+    variant_values = AssignedVariantAttribute.values.through.objects.values_list(
+        "assignedvariantattribute__variant__product_id", "attributevalue_id"
+    )
+    for product_id, value_id in product_values.union(variant_values, all=True):
+        values[product_id].add(value_id)
+
+    products = [
+        Product(pk=product_id, attribute_values=sorted(value_ids))
+        for product_id, value_ids in values.items()
+    ]
+    Product.objects.bulk_update(products, ["attribute_values"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0117_auto_20200423_0737"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="attribute_values",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), blank=True, default=list, size=None
+            ),
+        ),
+        migrations.RunPython(
+            populate_product_attribute_values, reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["attribute_values"], name="product_attribute_values_gin"
+            ),
+        ),
+    ]
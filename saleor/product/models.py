@@ -3,7 +3,8 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.aggregates import StringAgg
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import Case, Count, F, FilteredRelation, Q, Value, When
 from django.urls import reverse
@@ -291,6 +292,9 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    # Primary keys of the attribute values assigned to the product and to its
+    # variants, kept up to date by `update_products_attribute_values`.
+    attribute_values = ArrayField(models.IntegerField(), blank=True, default=list)
     objects = ProductsQueryset.as_manager()
     translated = TranslationProxy()
 
@@ -300,6 +304,9 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
+        indexes = [
+            GinIndex(name="product_attribute_values_gin", fields=["attribute_values"])
+        ]
 
     def __iter__(self):
         if not hasattr(self, "__variants"):
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+
+from .category_tree import category_tree
+from .utils.attributes import update_product_attribute_values_handler
+
+
+def connect_category_tree_signals(model):
+    for signal in (post_save, post_delete):
+        signal.connect(
+            category_tree.invalidate_handler,
+            sender=model,
+            dispatch_uid="category_tree_%s" % model.__name__,
+        )
+
+
+def connect_product_attribute_values_signals(*models):
+    for model in models:
+        post_delete.connect(
+            update_product_attribute_values_handler,
+            sender=model,
+            dispatch_uid="product_attribute_values_%s" % model.__name__,
+        )
@@ -6,6 +6,8 @@ from django import template
 from django.conf import settings
 from django.templatetags.static import static
 
+from ...core.renditions import is_rendition_known, queue_missing_rendition
+
 logger = logging.getLogger(__name__)
 register = template.Library()
 
@@ -82,6 +84,14 @@ def get_thumbnail_size(size, method, rendition_key_set):
     return None
 
 
+def is_rendition_missing(thumbnail):
+    """Return True if a rendition should be queued instead of being served."""
+    on_demand = settings.VERSATILEIMAGEFIELD_SETTINGS["create_images_on_demand"]
+    if on_demand or not settings.QUEUE_MISSING_RENDITIONS:
+        return False
+    return not is_rendition_known(thumbnail)
+
+
 @register.simple_tag()
 def get_thumbnail(image_file, size, method, rendition_key_set="products"):
     if image_file:
@@ -93,6 +103,11 @@ def get_thumbnail(image_file, size, method, rendition_key_set="products"):
                 "Thumbnail fetch failed", extra={"image_file": image_file, "size": size}
             )
         else:
+            if is_rendition_missing(thumbnail):
+                # Serve the original image until the rendition is generated.
+                size_key = "%s__%s" % (method, used_size)
+                queue_missing_rendition(image_file, size_key, thumbnail)
+                return image_file.url
             return thumbnail.url
     return static(choose_placeholder("%sx%s" % (size, size)))
 
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.db import transaction
 
 from ...core.taxes import TaxedMoney, zero_taxed_money
+from ..category_tree import category_tree
 from ..tasks import update_products_minimal_variant_prices_task
 
 if TYPE_CHECKING:
@@ -41,9 +42,11 @@ def delete_categories(categories_ids: List[str]):
     categories = Category.objects.select_for_update().filter(pk__in=categories_ids)
     categories.prefetch_related("products")
 
-    products = Product.objects.none()
+    tree = category_tree.get()
+    category_ids = set()
     for category in categories:
-        products = products | collect_categories_tree_products(category)
+        category_ids.update(tree.get_descendant_ids(category.pk))
+    products = Product.objects.filter(category_id__in=category_ids)
 
     products.update(is_published=False, publication_date=None)
     product_ids = list(products.values_list("id", flat=True))
@@ -53,8 +56,7 @@ def delete_categories(categories_ids: List[str]):
 
 def collect_categories_tree_products(category: "Category") -> "QuerySet[Product]":
     """Collect products from all levels in category tree."""
-    products = category.products.all()
-    descendants = category.get_descendants()
-    for descendant in descendants:
-        products = products | descendant.products.all()
-    return products
+    from ..models import Product
+
+    descendant_ids = category_tree.get().get_descendant_ids(category.pk)
+    return Product.objects.filter(category_id__in=descendant_ids)
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Optional, Set, Union
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable, Optional, Set, Union
 
 from ..models import (
     AssignedProductAttribute,
@@ -86,4 +87,48 @@ def associate_attribute_values_to_instance(
     # Associate the attribute and the passed values
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
+
+    product_id = instance.pk if isinstance(instance, Product) else instance.product_id
+    update_products_attribute_values([product_id])
     return assignment
+
+
+def update_products_attribute_values(product_ids: Iterable[int]):
+    """Refresh the denormalized attribute values of the given products.
+
+    The values assigned to the products and to their variants are stored in
+    `Product.attribute_values` that filtering by attributes relies on.
+    """
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+    product_values = AssignedProductAttribute.values.through.objects.filter(
+        assignedproductattribute__product_id__in=product_ids
+    ).values_list("assignedproductattribute__product_id", "attributevalue_id")
+    variant_values = AssignedVariantAttribute.values.through.objects.filter(
+        assignedvariantattribute__variant__product_id__in=product_ids
+    ).values_list("assignedvariantattribute__variant__product_id", "attributevalue_id")
+
+    values = defaultdict(set)
+    for product_id, value_id in product_values.union(variant_values, all=True):
+        values[product_id].add(value_id)
+
+    products = [
+        Product(pk=product_id, attribute_values=sorted(values[product_id]))
+        for product_id in product_ids
+    ]
+    Product.objects.bulk_update(products, ["attribute_values"])
+
+
+def update_product_attribute_values_handler(sender, instance, **_kwargs):
+    """Drop the values of a deleted attribute assignment from its product."""
+    if isinstance(instance, AssignedProductAttribute):
+        product_id = instance.product_id
+    else:
+        product_id = (
+            ProductVariant.objects.filter(pk=instance.variant_id)
+            .values_list("product_id", flat=True)
+            .first()
+        )
+    if product_id is not None:
+        update_products_attribute_values([product_id])
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....account.models import User
+from ....account.search import update_users_search_document
+from ....order.models import Order
+from ....order.search import update_orders_search_document
+
+BATCH_SIZE = 1000
+
+
+def batches(queryset, batch_size):
+    """Yield chunks of the queryset ordered by the primary key.
+
+    Paginating by the last seen key keeps every query cheap and lets the
+    command be interrupted and started again.
+    """
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by("pk")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+class Command(BaseCommand):
+    help = "Fills the search documents of users and orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of objects updated in a single query.",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Skip objects that already have a search document.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        users = User.objects.select_related("default_shipping_address")
+        orders = Order.objects.select_related("user")
+        if options["only_missing"]:
+            users = users.filter(search_document="")
+            orders = orders.filter(search_document="")
+
+        self.stdout.write('Updating "search_document" field of all the users.')
+        with tqdm(total=users.count()) as progress:
+            for batch in batches(users, batch_size):
+                update_users_search_document(batch)
+                progress.update(len(batch))
+
+        self.stdout.write('Updating "search_document" field of all the orders.')
+        with tqdm(total=orders.count()) as progress:
+            for batch in batches(orders, batch_size):
+                update_orders_search_document(batch)
+                progress.update(len(batch))
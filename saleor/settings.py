@@ -40,6 +40,8 @@ ROOT_URLCONF = "saleor.urls"
 
 WSGI_APPLICATION = "saleor.wsgi.application"
 
+ASGI_APPLICATION = "saleor.asgi.application"
+
 ADMINS = (
     # ('Your Name', 'your_email@example.com'),
 )
@@ -66,6 +68,26 @@ DATABASES = {
     )
 }
 
+# Read replicas of the default database, e.g.
+# "postgres://saleor@replica-1/saleor,postgres://saleor@replica-2/saleor".
+# Read-only GraphQL queries are executed with reads routed to one of them.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(
+    filter(None, get_list(os.environ.get("DATABASE_REPLICA_URLS", "")))
+):
+    alias = "replica_%d" % index
+    DATABASES[alias] = dj_database_url.parse(replica_url, conn_max_age=600)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["saleor.core.db.routers.ReplicaRouter"]
+
+# Seconds during which a client reads from the primary database after sending
+# a mutation, so that it sees its own writes despite the replication lag.
+DATABASE_REPLICA_READ_AFTER_WRITE_DELAY = int(
+    os.environ.get("DATABASE_REPLICA_READ_AFTER_WRITE_DELAY", 5)
+)
+
 
 TIME_ZONE = "America/Chicago"
 LANGUAGE_CODE = "en"
@@ -442,6 +464,11 @@ VERSATILEIMAGEFIELD_SETTINGS = {
     "create_images_on_demand": get_bool_from_env("CREATE_IMAGES_ON_DEMAND", DEBUG)
 }
 
+# Queue thumbnails missing at request time for generation by Celery workers
+# and serve the original image meanwhile. Used when they aren't generated
+# on demand.
+QUEUE_MISSING_RENDITIONS = get_bool_from_env("QUEUE_MISSING_RENDITIONS", False)
+
 PLACEHOLDER_IMAGES = {
     60: "images/placeholder60x60.png",
     120: "images/placeholder120x120.png",
@@ -498,13 +525,71 @@ if SENTRY_DSN:
 GRAPHENE = {
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": True,
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    # Middlewares listed first are the closest to the resolvers.
     "MIDDLEWARE": [
+        "saleor.graphql.middleware.ProfilingMiddleware",
         "saleor.graphql.middleware.OpentracingGrapheneMiddleware",
         "saleor.graphql.middleware.JWTMiddleware",
         "saleor.graphql.middleware.app_middleware",
     ],
 }
 
+# Execute batched queries and top-level query fields concurrently in a pool of
+# threads. Batches containing mutations are executed serially. Every thread
+# uses its own database connection, so fields of one response may see the data
+# at slightly different moments, and a process can open up to
+# GRAPHQL_EXECUTION_WORKERS additional connections. Keep the connections
+# persistent (`conn_max_age` of DATABASES) or each thread will reconnect for
+# every unit of work.
+GRAPHQL_CONCURRENT_EXECUTION = get_bool_from_env("GRAPHQL_CONCURRENT_EXECUTION", False)
+GRAPHQL_EXECUTION_WORKERS = int(os.environ.get("GRAPHQL_EXECUTION_WORKERS", 8))
+
+# Reject queries (or batches) whose estimated cost exceeds the limit. The
+# computed cost is always reported in the `extensions` of the response. Set to
+# 0 to disable the limit.
+GRAPHQL_QUERY_MAX_COST = int(os.environ.get("GRAPHQL_QUERY_MAX_COST", 0))
+# Assumed number of items of list fields that can't be paginated.
+GRAPHQL_QUERY_COST_LIST_SIZE = int(os.environ.get("GRAPHQL_QUERY_COST_LIST_SIZE", 10))
+# Cost of selecting a field, keyed by "Type.field", e.g. {"Product.variants": 10}.
+# Fields without a weight cost 1 if they select an object and 0 otherwise.
+GRAPHQL_QUERY_COST_FIELD_WEIGHTS: dict = {}
+
+# Fraction of GraphQL requests for which resolver timings and SQL query counts
+# are collected. Totals are exposed at /metrics/ for requests authorized with
+# the `GRAPHQL_PROFILING_METRICS_TOKEN` bearer token.
+GRAPHQL_PROFILING_SAMPLE_RATE = float(
+    os.environ.get("GRAPHQL_PROFILING_SAMPLE_RATE", 0)
+)
+GRAPHQL_PROFILING_FLUSH_INTERVAL = int(
+    os.environ.get("GRAPHQL_PROFILING_FLUSH_INTERVAL", 30)
+)
+GRAPHQL_PROFILING_METRICS_TOKEN = os.environ.get("GRAPHQL_PROFILING_METRICS_TOKEN")
+
+# Cache responses to anonymous storefront queries for the given number of
+# seconds; 0 disables the cache. With HTTP headers enabled, cached responses
+# carry an ETag and a public Cache-Control header for HTTP caches and CDNs.
+# Prices depend on the country detected from the client IP, so enable the
+# headers only if the shop sells to a single country or the CDN caches
+# responses per client country.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 0)
+)
+GRAPHQL_RESPONSE_CACHE_HTTP_HEADERS = get_bool_from_env(
+    "GRAPHQL_RESPONSE_CACHE_HTTP_HEADERS", False
+)
+
+# Seconds for which the product counts of the `productFacets` query are cached.
+PRODUCT_FACETS_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_FACETS_CACHE_TIMEOUT", 300))
+
+# Seconds for which the prices of checkouts are cached; 0 disables the cache.
+CHECKOUT_PRICES_CACHE_TIMEOUT = int(
+    os.environ.get("CHECKOUT_PRICES_CACHE_TIMEOUT", 300)
+)
+
+# Base URL of the Avatax API used instead of the production and sandbox URLs,
+# e.g. to test against a local server.
+AVATAX_API_URL = os.environ.get("AVATAX_API_URL")
+
 PLUGINS_MANAGER = "saleor.plugins.manager.PluginsManager"
 
 PLUGINS = [
@@ -556,3 +641,10 @@ REDIS_URL = os.environ.get("REDIS_URL")
 if REDIS_URL:
     CACHE_URL = os.environ.setdefault("CACHE_URL", REDIS_URL)
 CACHES = {"default": django_cache_url.config()}
+
+# Process-level snapshots of rarely changing data (see `saleor.core.snapshots`)
+# are invalidated through the cache, which has to be shared by all processes
+# (e.g. Redis) for changes to show up immediately. Without a shared cache, or
+# after changes made with bulk queries, snapshots are rebuilt after this many
+# seconds.
+PROCESS_SNAPSHOT_MAX_AGE = int(os.environ.get("PROCESS_SNAPSHOT_MAX_AGE", 300))
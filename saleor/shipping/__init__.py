@@ -1,3 +1,6 @@
+default_app_config = "saleor.shipping.apps.ShippingAppConfig"
+
+
 class ShippingMethodType:
     PRICE_BASED = "price"
     WEIGHT_BASED = "weight"
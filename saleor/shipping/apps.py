@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ShippingAppConfig(AppConfig):
+    name = "saleor.shipping"
+
+    def ready(self):
+        from .models import ShippingMethod, ShippingZone
+        from .signals import connect_shipping_zone_index_signals
+
+        connect_shipping_zone_index_signals([ShippingZone, ShippingMethod])
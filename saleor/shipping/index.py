@@ -0,0 +1,159 @@
+"""In-memory index of shipping zones and their methods.
+
+Resolving applicable shipping methods is on the path of every checkout
+render, so instead of querying the zones and unioning price and weight based
+querysets, the methods are grouped per zone and currency and sorted by their
+lower bound, which lets them be matched with a bisect. Prices are kept as
+`Decimal` and weights as floats in the standard unit, the same values the
+database compares.
+
+The index is invalidated when shipping zones and methods are saved or deleted
+(see `signals.py`). Changes made with `QuerySet.update()` or `bulk_create()`
+send no signals and have to be followed by `shipping_zone_index.invalidate()`.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from measurement.measures import Weight
+
+from ..core.snapshots import VersionedSnapshot
+from . import ShippingMethodType
+
+# Prices are compared as decimals and weights as floats.
+Bound = Union[Decimal, float]
+
+
+@dataclass
+class ShippingBand:
+    """Methods of one type in a zone and currency, sorted by lower bound."""
+
+    lower_bounds: List[Bound] = field(default_factory=list)
+    upper_bounds: List[Optional[Bound]] = field(default_factory=list)
+    method_ids: List[int] = field(default_factory=list)
+
+    def add(self, lower: Bound, upper: Optional[Bound], method_id: int):
+        position = bisect_right(self.lower_bounds, lower)
+        self.lower_bounds.insert(position, lower)
+        self.upper_bounds.insert(position, upper)
+        self.method_ids.insert(position, method_id)
+
+    def matching(self, value: Bound) -> List[int]:
+        """Return ids of methods whose `[lower, upper]` range contains value."""
+        candidates = bisect_right(self.lower_bounds, value)
+        return [
+            self.method_ids[i]
+            for i in range(candidates)
+            if self.upper_bounds[i] is None or self.upper_bounds[i] >= value
+        ]
+
+
+@dataclass
+class ShippingZoneEntry:
+    is_default: bool
+    countries: Set[str]
+    currencies: Set[str] = field(default_factory=set)
+    # Bands keyed by (currency, shipping method type).
+    bands: Dict[Tuple[str, str], ShippingBand] = field(
+        default_factory=lambda: defaultdict(ShippingBand)
+    )
+
+    def has_methods(self, currency: str) -> bool:
+        return currency in self.currencies
+
+
+@dataclass
+class ShippingZoneIndex:
+    zones_by_country: Dict[str, List[ShippingZoneEntry]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    default_zones: List[ShippingZoneEntry] = field(default_factory=list)
+
+    def get_zones(self, country_code: str, currency: str) -> List[ShippingZoneEntry]:
+        """Return zones to look up methods in, falling back to the default ones."""
+        zones = [
+            zone
+            for zone in self.zones_by_country.get(country_code, [])
+            if zone.has_methods(currency)
+        ]
+        return zones or self.default_zones
+
+    def applicable_method_ids(
+        self, country_code: str, currency: str, price: Decimal, weight: Weight
+    ) -> List[int]:
+        method_ids: List[int] = []
+        for zone in self.get_zones(country_code, currency):
+            price_band = zone.bands.get((currency, ShippingMethodType.PRICE_BASED))
+            if price_band:
+                method_ids.extend(price_band.matching(price))
+            weight_band = zone.bands.get((currency, ShippingMethodType.WEIGHT_BASED))
+            if weight_band:
+                method_ids.extend(weight_band.matching(weight.standard))
+        return method_ids
+
+
+def _get_bounds(method: dict) -> Tuple[Optional[Bound], Optional[Bound]]:
+    if method["type"] == ShippingMethodType.PRICE_BASED:
+        return (
+            method["minimum_order_price_amount"],
+            method["maximum_order_price_amount"],
+        )
+    lower = method["minimum_order_weight"]
+    upper = method["maximum_order_weight"]
+    return (
+        lower.standard if lower is not None else None,
+        upper.standard if upper is not None else None,
+    )
+
+
+def _parse_countries(value) -> Set[str]:
+    # `values()` bypasses the field descriptor, so a multiple country field is
+    # returned in its database form, a comma separated list of codes.
+    if isinstance(value, str):
+        return {code for code in value.split(",") if code}
+    return {str(country) for country in value}
+
+
+def build_shipping_zone_index() -> ShippingZoneIndex:
+    from .models import ShippingMethod, ShippingZone
+
+    index = ShippingZoneIndex()
+    zones: Dict[int, ShippingZoneEntry] = {}
+    for zone in ShippingZone.objects.values("pk", "default", "countries"):
+        countries = _parse_countries(zone["countries"])
+        entry = ShippingZoneEntry(is_default=zone["default"], countries=countries)
+        zones[zone["pk"]] = entry
+        if entry.is_default:
+            index.default_zones.append(entry)
+        else:
+            for country in countries:
+                index.zones_by_country[country].append(entry)
+
+    methods = ShippingMethod.objects.values(
+        "pk",
+        "type",
+        "currency",
+        "shipping_zone_id",
+        "minimum_order_price_amount",
+        "maximum_order_price_amount",
+        "minimum_order_weight",
+        "maximum_order_weight",
+    )
+    for method in methods:
+        zone_entry = zones[method["shipping_zone_id"]]
+        zone_entry.currencies.add(method["currency"])
+        lower, upper = _get_bounds(method)
+        # Methods without a lower bound never match, the same as in SQL where
+        # comparing with NULL is never true.
+        if lower is None:
+            continue
+        band = zone_entry.bands[(method["currency"], method["type"])]
+        band.add(lower, upper, method["pk"])
+    return index
+
+
+shipping_zone_index = VersionedSnapshot(
+    "shipping_zone_index", build_shipping_zone_index
+)
@@ -20,6 +20,7 @@ from ..core.weight import (
     zero_weight,
 )
 from . import ShippingMethodType
+from .index import shipping_zone_index
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -102,6 +103,28 @@ class ShippingMethodQueryset(models.QuerySet):
         It is based on the given country code, and by shipping methods that are
         applicable to the given price & weight total.
         """
+        if self.query.has_filters():
+            # The index covers all shipping methods, so a dedicated zone has to be
+            # looked up among the methods of an already filtered queryset in SQL.
+            return self._applicable_shipping_methods_from_db(
+                price, weight, country_code
+            )
+        # Zones are matched against the in-memory index; if a dedicated shipping
+        # zone for the country exists it is used in the first place, otherwise
+        # the default shipping zone is used.
+        method_ids = shipping_zone_index.get().applicable_method_ids(
+            country_code=country_code,
+            currency=price.currency,
+            price=price.amount,
+            weight=weight,
+        )
+        return (
+            self.filter(pk__in=method_ids)
+            .prefetch_related("shipping_zone")
+            .order_by("price_amount")
+        )
+
+    def _applicable_shipping_methods_from_db(self, price: Money, weight, country_code):
         # If dedicated shipping zone for the country exists, we should use it
         # in the first place
         qs = self.filter(
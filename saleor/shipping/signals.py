@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .index import shipping_zone_index
+
+
+def connect_shipping_zone_index_signals(models):
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                shipping_zone_index.invalidate_handler,
+                sender=model,
+                dispatch_uid="shipping_zone_index_%s" % model.__name__,
+            )
@@ -1,3 +1,6 @@
+default_app_config = "saleor.site.apps.SiteAppConfig"
+
+
 class AuthenticationBackends:
     GOOGLE = "google-oauth2"
     FACEBOOK = "facebook"
@@ -0,0 +1,29 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from ..account.models import Address
+from .models import SiteSettings, SiteSettingsTranslation
+from .snapshot import site_settings_snapshot
+
+
+def invalidate_on_company_address_change(sender, instance, **kwargs):
+    # Addresses of customers change often; only the company one matters.
+    # Deletion is checked before the settings lose the reference.
+    if SiteSettings.objects.filter(company_address_id=instance.pk).exists():
+        site_settings_snapshot.invalidate()
+
+
+def connect_site_settings_signals():
+    for model in (Site, SiteSettings, SiteSettingsTranslation):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                site_settings_snapshot.invalidate_handler,
+                sender=model,
+                dispatch_uid="site_settings_%s" % model.__name__,
+            )
+    for signal in (post_save, pre_delete):
+        signal.connect(
+            invalidate_on_company_address_change,
+            sender=Address,
+            dispatch_uid="site_settings_company_address",
+        )
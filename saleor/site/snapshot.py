@@ -0,0 +1,41 @@
+"""Process-level snapshot of the current site settings.
+
+Tax and price display helpers, e-mails and the `Shop` API type read site
+settings many times per request. The snapshot keeps the settings of
+`SITE_ID` with their site, translations and company address in memory, so
+they are loaded once per process instead of per request.
+
+The snapshot is invalidated when site settings, their translations, the site
+or the company address are saved or deleted (see `signals.py`).
+
+The returned instance is shared between requests and must not be modified;
+code that updates the settings has to fetch its own instance.
+"""
+from typing import Optional
+
+from django.conf import settings
+
+from ..core.snapshots import VersionedSnapshot
+from .models import SiteSettings, SiteSettingsTranslation
+
+
+def build_site_settings() -> SiteSettings:
+    return (
+        SiteSettings.objects.select_related("site", "company_address")
+        .prefetch_related("translations")
+        .get(site_id=settings.SITE_ID)
+    )
+
+
+site_settings_snapshot = VersionedSnapshot("site_settings", build_site_settings)
+
+
+def get_site_settings() -> SiteSettings:
+    return site_settings_snapshot.get()
+
+
+def get_site_settings_translation(
+    language_code: str,
+) -> Optional[SiteSettingsTranslation]:
+    translations = get_site_settings().translations.all()
+    return next((t for t in translations if t.language_code == language_code), None)
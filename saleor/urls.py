@@ -6,11 +6,12 @@ from django.views.decorators.csrf import csrf_exempt
 
 from .data_feeds.urls import urlpatterns as feed_urls
 from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import GraphQLView, metrics
 from .product.views import digital_product
 
 urlpatterns = [
     url(r"^graphql/", csrf_exempt(GraphQLView.as_view(schema=schema)), name="api"),
+    url(r"^metrics/$", metrics, name="metrics"),
     url(r"^feeds/", include((feed_urls, "data_feeds"), namespace="data_feeds")),
     url(
         r"^digital-download/(?P<token>[0-9A-Za-z_\-]+)/$",
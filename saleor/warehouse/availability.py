@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Iterable, Set
 
 from django.conf import settings
 from django.db.models import Q, Sum
@@ -42,6 +42,48 @@ def check_stock_quantity(variant: "ProductVariant", country_code: str, quantity:
         raise InsufficientStock(variant)
 
 
+def get_available_quantities(
+    variants: Iterable["ProductVariant"], country_code: str
+) -> Dict[int, int]:
+    """Return available quantities of the variants in given country.
+
+    Batch version of `get_available_quantity` that runs a single query. Variants
+    without stocks in the country are left out.
+    """
+    stocks = (
+        Stock.objects.for_country(country_code)
+        .filter(product_variant__in=list(variants))
+        .order_by()
+        .values("product_variant_id")
+        .annotate(
+            total_quantity=Coalesce(Sum("quantity"), 0),
+            quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
+        )
+        .values_list("product_variant_id", "total_quantity", "quantity_allocated")
+    )
+    return {
+        variant_id: max(total_quantity - quantity_allocated, 0)
+        for variant_id, total_quantity, quantity_allocated in stocks
+    }
+
+
+def check_stock_quantity_bulk(
+    variants: Iterable["ProductVariant"], country_code: str, quantities: Iterable[int]
+):
+    """Validate if there is stock available for given variants in given country.
+
+    Batch version of `check_stock_quantity` that runs a single query. Raise
+    InsufficientStock for the first variant with less stock than required.
+    """
+    variants = list(variants)
+    available_quantities = get_available_quantities(variants, country_code)
+    for variant, quantity in zip(variants, quantities):
+        if variant.pk not in available_quantities:
+            raise InsufficientStock(variant)
+        if variant.track_inventory and quantity > available_quantities[variant.pk]:
+            raise InsufficientStock(variant)
+
+
 def get_available_quantity(variant: "ProductVariant", country_code: str) -> int:
     """Return available quantity for given product in given country."""
     stocks = Stock.objects.get_variant_stocks_for_country(country_code, variant)
@@ -104,6 +146,42 @@ def is_variant_in_stock(variant: "ProductVariant", country_code: str) -> bool:
     return quantity_available > 0
 
 
+def get_variant_ids_in_stock(
+    variants: Iterable["ProductVariant"], country_code: str
+) -> Set[int]:
+    """Return ids of the variants that are available in given country.
+
+    Batch version of `is_variant_in_stock` that runs a single query.
+    """
+    variants = list(variants)
+    stocks = (
+        Stock.objects.filter(
+            product_variant__in=variants,
+            warehouse__shipping_zones__countries__contains=country_code,
+        )
+        .annotate(
+            available_quantity=Sum("quantity")
+            - Coalesce(Sum("allocations__quantity_allocated"), 0)
+        )
+        .values_list(
+            "product_variant_id", "warehouse__shipping_zones", "available_quantity"
+        )
+    )
+
+    available_quantities: Dict = defaultdict(lambda: defaultdict(int))
+    for variant_id, shipping_zone_pk, available_quantity in stocks:
+        available_quantities[variant_id][shipping_zone_pk] += available_quantity
+
+    variant_ids = set()
+    for variant in variants:
+        quantities = available_quantities.get(variant.pk)
+        if not quantities:
+            continue
+        if not variant.track_inventory or max(quantities.values()) > 0:
+            variant_ids.add(variant.pk)
+    return variant_ids
+
+
 def stocks_for_product(product: "Product", country_code: str):
     return (
         Stock.objects.annotate_available_quantity()
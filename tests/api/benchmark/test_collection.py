@@ -1,8 +1,37 @@
 import graphene
 import pytest
+from prices import Money
 
+from saleor.product.models import CollectionProduct, Product
 from tests.api.utils import get_graphql_content
 
+LARGE_COLLECTION_SIZE = 5000
+
+
+@pytest.fixture
+def large_collection(collection, product_type, category):
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {i}",
+                slug=f"product-{i}",
+                price=Money("10.00", "USD"),
+                product_type=product_type,
+                category=category,
+                is_published=True,
+            )
+            for i in range(LARGE_COLLECTION_SIZE)
+        ]
+    )
+    CollectionProduct.bulk_append(
+        [
+            CollectionProduct(collection=collection, product=product)
+            for product in products
+        ],
+        collection.collectionproduct.all(),
+    )
+    return collection
+
 
 @pytest.mark.django_db
 @pytest.mark.count_queries(autouse=False)
@@ -104,3 +133,50 @@ def test_collection_view(api_client, homepage_collection, count_queries):
         "id": graphene.Node.to_global_id("Collection", homepage_collection.pk),
     }
     get_graphql_content(api_client.post_graphql(query, variables))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_reorder_products_in_large_collection(
+    staff_api_client, large_collection, permission_manage_products, count_queries
+):
+    query = """
+        mutation ReorderCollectionProducts(
+          $collectionId: ID!, $moves: [MoveProductInput]!
+        ) {
+          collectionReorderProducts(collectionId: $collectionId, moves: $moves) {
+            errors {
+              field
+              message
+            }
+          }
+        }
+    """
+    products = list(
+        large_collection.collectionproduct.order_by("sort_order").values_list(
+            "product_id", flat=True
+        )
+    )
+    moves = [
+        (products[0], LARGE_COLLECTION_SIZE // 2),
+        (products[-1], -LARGE_COLLECTION_SIZE),
+        (products[100], +1),
+    ]
+    variables = {
+        "collectionId": graphene.Node.to_global_id("Collection", large_collection.pk),
+        "moves": [
+            {
+                "productId": graphene.Node.to_global_id("Product", product_pk),
+                "sortOrder": sort_order,
+            }
+            for product_pk, sort_order in moves
+        ],
+    }
+
+    content = get_graphql_content(
+        staff_api_client.post_graphql(
+            query, variables, permissions=[permission_manage_products]
+        )
+    )
+
+    assert not content["data"]["collectionReorderProducts"]["errors"]
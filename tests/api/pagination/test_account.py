@@ -2,6 +2,7 @@ import pytest
 from django.contrib.auth import models as auth_models
 
 from saleor.account.models import User
+from saleor.account.search import update_users_search_document
 from saleor.order.models import Order
 
 from ..utils import get_graphql_content
@@ -51,6 +52,7 @@ def customers_for_search(db, address):
             ),
         ]
     )
+    update_users_search_document(accounts)
     return accounts
 
 
@@ -122,6 +124,7 @@ def staff_for_search(db, address):
             ),
         ]
     )
+    update_users_search_document(accounts)
     return accounts
 
 
@@ -7,6 +7,7 @@ from freezegun import freeze_time
 from prices import Money, TaxedMoney
 
 from saleor.order.models import Order, OrderStatus
+from saleor.order.search import update_orders_search_document
 from saleor.payment import ChargeStatus
 
 from ..utils import get_graphql_content
@@ -419,6 +420,7 @@ def test_orders_query_pagination_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     page_size = 2
     variables = {"first": page_size, "after": None, "filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -491,6 +493,7 @@ def test_draft_orders_query_pagination_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     page_size = 2
     variables = {"first": page_size, "after": None, "filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
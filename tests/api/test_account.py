@@ -19,6 +19,7 @@ from prices import Money
 from saleor.account import events as account_events
 from saleor.account.error_codes import AccountErrorCode
 from saleor.account.models import Address, User
+from saleor.account.search import update_users_search_document
 from saleor.account.utils import create_jwt_token
 from saleor.checkout import AddressType
 from saleor.core.permissions import AccountPermissions, OrderPermissions
@@ -3740,6 +3741,7 @@ def test_query_customer_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
@@ -3751,6 +3753,62 @@ def test_query_customer_members_with_filter_search(
     assert len(users) == count
 
 
+QUERY_CUSTOMERS_WITH_SEARCH_AND_SORT = """
+    query ($search: String!, $sort_by: UserSortingInput!) {
+        customers(first: 5, filter: {search: $search}, sortBy: $sort_by) {
+            edges {
+                node {
+                    email
+                }
+            }
+        }
+    }
+"""
+
+
+def test_query_customers_with_search_sorted_by_rank(
+    staff_api_client, permission_manage_users
+):
+    User.objects.create(email="alice.smith@example.com", first_name="Alice")
+    User.objects.create(email="alice@example.com", first_name="Alice")
+    User.objects.create(email="bob@example.com", first_name="Bob")
+
+    variables = {
+        "search": "ALICE",
+        "sort_by": {"field": "RANK", "direction": "DESC"},
+    }
+    response = staff_api_client.post_graphql(
+        QUERY_CUSTOMERS_WITH_SEARCH_AND_SORT,
+        variables,
+        permissions=[permission_manage_users],
+    )
+    content = get_graphql_content(response)
+    users = content["data"]["customers"]["edges"]
+
+    assert [user["node"]["email"] for user in users] == [
+        "alice@example.com",
+        "alice.smith@example.com",
+    ]
+
+
+def test_query_customers_with_search_returns_staff_with_orders_once(
+    query_customer_with_filter, staff_api_client, permission_manage_users
+):
+    staff = User.objects.create(email="staff.customer@example.com", is_staff=True)
+    Order.objects.bulk_create(
+        [Order(user=staff, token=str(uuid.uuid4())) for _ in range(2)]
+    )
+
+    variables = {"filter": {"search": "staff.customer"}}
+    response = staff_api_client.post_graphql(
+        query_customer_with_filter, variables, permissions=[permission_manage_users]
+    )
+    content = get_graphql_content(response)
+    users = content["data"]["customers"]["edges"]
+
+    assert len(users) == 1
+
+
 @pytest.mark.parametrize(
     "staff_member_filter, count",
     [({"status": "DEACTIVATED"}, 1), ({"status": "ACTIVE"}, 2)],
@@ -3845,6 +3903,7 @@ def test_query_staff_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": staff_member_filter}
     response = staff_api_client.post_graphql(
@@ -12,13 +12,14 @@ from saleor.account.models import User
 from saleor.checkout import calculations
 from saleor.checkout.error_codes import CheckoutErrorCode
 from saleor.checkout.models import Checkout
-from saleor.checkout.utils import is_fully_paid
+from saleor.checkout.utils import add_variant_to_checkout, is_fully_paid
 from saleor.core.payments import PaymentInterface
 from saleor.core.taxes import zero_money
 from saleor.graphql.checkout.mutations import (
     clean_shipping_method,
     update_checkout_shipping_method_if_invalid,
 )
+from saleor.graphql.checkout.price_snapshots import calculate_checkout_prices
 from saleor.graphql.checkout.utils import (
     clean_checkout_payment,
     clean_checkout_shipping,
@@ -29,7 +30,7 @@ from saleor.payment.interface import GatewayResponse
 from saleor.plugins.manager import PluginsManager
 from saleor.warehouse.models import Stock
 
-from ..utils import get_available_quantity_for_stock
+from ..utils import flush_post_commit_hooks, get_available_quantity_for_stock
 from .utils import assert_no_permission, get_graphql_content
 
 
@@ -830,6 +831,51 @@ def test_checkout_lines_add_check_lines_quantity(user_api_client, checkout, stoc
     assert data["errors"][0]["field"] == "quantity"
 
 
+def test_checkout_lines_add_check_resulting_lines_quantity(
+    user_api_client, checkout, stock
+):
+    variant = stock.product_variant
+    add_variant_to_checkout(checkout, variant, 10)
+    variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
+    checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
+
+    variables = {
+        "checkoutId": checkout_id,
+        "lines": [{"variantId": variant_id, "quantity": 6}],
+    }
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_LINES_ADD, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["checkoutLinesAdd"]
+    assert data["errors"][0]["message"] == (
+        "Could not add item Test product (SKU_A). Only 15 remaining in stock."
+    )
+    assert data["errors"][0]["field"] == "quantity"
+    assert checkout.lines.get().quantity == 10
+
+
+def test_checkout_lines_add_many_lines(user_api_client, checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
+
+    variables = {
+        "checkoutId": checkout_id,
+        "lines": [
+            {
+                "variantId": graphene.Node.to_global_id("ProductVariant", variant.pk),
+                "quantity": quantity,
+            }
+            for variant, quantity in zip(variants, [1, 2, 3])
+        ],
+    }
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_LINES_ADD, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["checkoutLinesAdd"]
+    assert not data["errors"]
+    assert [line["quantity"] for line in data["checkout"]["lines"]] == [1, 2, 3]
+    checkout.refresh_from_db()
+    assert checkout.quantity == 6
+
+
 def test_checkout_lines_invalid_variant_id(user_api_client, checkout, stock):
     variant = stock.product_variant
     variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
@@ -2150,8 +2196,7 @@ def test_fetch_checkout_invalid_token(user_api_client):
     assert data is None
 
 
-def test_checkout_prices(user_api_client, checkout_with_item):
-    query = """
+QUERY_CHECKOUT_PRICES = """
     query getCheckout($token: UUID!) {
         checkout(token: $token) {
            token,
@@ -2178,6 +2223,10 @@ def test_checkout_prices(user_api_client, checkout_with_item):
         }
     }
     """
+
+
+def test_checkout_prices(user_api_client, checkout_with_item):
+    query = QUERY_CHECKOUT_PRICES
     variables = {"token": str(checkout_with_item.token)}
     response = user_api_client.post_graphql(query, variables)
     content = get_graphql_content(response)
@@ -2194,6 +2243,65 @@ def test_checkout_prices(user_api_client, checkout_with_item):
     assert data["subtotalPrice"]["gross"]["amount"] == (subtotal.gross.amount)
 
 
+@patch(
+    "saleor.graphql.checkout.dataloaders.calculate_checkout_prices",
+    wraps=calculate_checkout_prices,
+)
+def test_checkout_prices_are_cached(
+    mocked_calculate_checkout_prices, user_api_client, checkout_with_item
+):
+    # Invalidations scheduled when the fixtures were saved.
+    flush_post_commit_hooks()
+    variables = {"token": str(checkout_with_item.token)}
+    user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+    assert mocked_calculate_checkout_prices.call_count == 1
+
+    response = user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+
+    content = get_graphql_content(response)
+    assert mocked_calculate_checkout_prices.call_count == 1
+    total = calculations.checkout_total(
+        checkout=checkout_with_item, lines=list(checkout_with_item)
+    )
+    data = content["data"]["checkout"]
+    assert data["totalPrice"]["gross"]["amount"] == total.gross.amount
+
+
+def test_checkout_prices_cache_invalidated_by_checkout_change(
+    user_api_client, checkout_with_item
+):
+    flush_post_commit_hooks()
+    variables = {"token": str(checkout_with_item.token)}
+    response = user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+    total = get_graphql_content(response)["data"]["checkout"]["totalPrice"]
+    line = checkout_with_item.lines.get()
+
+    add_variant_to_checkout(checkout_with_item, line.variant, line.quantity)
+
+    response = user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+    data = get_graphql_content(response)["data"]["checkout"]
+    assert data["totalPrice"]["gross"]["amount"] == 2 * total["gross"]["amount"]
+    assert data["lines"][0]["totalPrice"] == data["subtotalPrice"]
+
+
+def test_checkout_prices_cache_invalidated_by_product_change(
+    user_api_client, checkout_with_item
+):
+    flush_post_commit_hooks()
+    variables = {"token": str(checkout_with_item.token)}
+    response = user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+    total = get_graphql_content(response)["data"]["checkout"]["totalPrice"]
+    line = checkout_with_item.lines.get()
+    product = line.variant.product
+
+    product.price_amount *= 2
+    product.save(update_fields=["price_amount"])
+
+    response = user_api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+    data = get_graphql_content(response)["data"]["checkout"]
+    assert data["totalPrice"]["gross"]["amount"] == 2 * total["gross"]["amount"]
+
+
 MUTATION_UPDATE_SHIPPING_METHOD = """
     mutation checkoutShippingMethodUpdate(
             $checkoutId:ID!, $shippingMethodId:ID!){
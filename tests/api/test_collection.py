@@ -632,6 +632,42 @@ def test_add_products_to_collection(
     assert data["products"]["totalCount"] == no_products_before + len(product_ids)
 
 
+def test_add_products_to_collection_appends_sorted_products(
+    staff_api_client, collection, product_list, permission_manage_products
+):
+    query = """
+        mutation collectionAddProducts(
+            $id: ID!, $products: [ID]!) {
+            collectionAddProducts(collectionId: $id, products: $products) {
+                collection {
+                    products {
+                        totalCount
+                    }
+                }
+            }
+        }
+    """
+    collection.products.add(product_list[0])
+    collection.collectionproduct.update(sort_order=0)
+    collection_id = to_global_id("Collection", collection.id)
+    product_ids = [to_global_id("Product", product.pk) for product in product_list]
+    variables = {"id": collection_id, "products": product_ids}
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+    content = get_graphql_content(response)
+    data = content["data"]["collectionAddProducts"]["collection"]
+    assert data["products"]["totalCount"] == len(product_list)
+    sort_orders = list(
+        collection.collectionproduct.order_by("sort_order").values_list(
+            "product_id", "sort_order"
+        )
+    )
+    assert sort_orders == [
+        (product.pk, index * 1024) for index, product in enumerate(product_list)
+    ]
+
+
 def test_remove_products_from_collection(
     staff_api_client, collection, product_list, permission_manage_products
 ):
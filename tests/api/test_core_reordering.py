@@ -7,7 +7,7 @@ SortedModel = models.AttributeValue
 
 
 def _sorted_by_order(items):
-    return sorted(items, key=lambda o: o[1])
+    return [pk for pk, _sort_order in sorted(items, key=lambda o: o[1])]
 
 
 def _get_sorted_map():
@@ -16,6 +16,10 @@ def _get_sorted_map():
     )
 
 
+def _get_sorted_pks():
+    return [pk for pk, _sort_order in _get_sorted_map()]
+
+
 @pytest.fixture
 def dummy_attribute():
     return models.Attribute.objects.create(name="Dummy")
@@ -72,7 +76,7 @@ def test_reordering_sequential(sorted_entries_seq):
 
     perform_reordering(qs, operations)
 
-    actual = _get_sorted_map()
+    actual = _get_sorted_pks()
     assert actual == expected
 
 
@@ -99,7 +103,7 @@ def test_reordering_non_sequential(sorted_entries_gaps):
 
     perform_reordering(qs, operations)
 
-    actual = _get_sorted_map()
+    actual = _get_sorted_pks()
     assert actual == expected
 
 
@@ -127,7 +131,7 @@ def test_inserting_at_the_edges(sorted_entries_seq, operation, expected_operatio
 
     perform_reordering(qs, operations)
 
-    actual = _get_sorted_map()
+    actual = _get_sorted_pks()
     assert actual == expected
 
 
@@ -155,7 +159,7 @@ def test_reordering_out_of_bound(sorted_entries_seq):
 
     perform_reordering(qs, operations)
 
-    actual = _get_sorted_map()
+    actual = _get_sorted_pks()
     assert actual == expected
 
 
@@ -198,16 +202,16 @@ def test_reordering_null_sort_orders(dummy_attribute):
     operations = {null_sorted_entries[0].pk: -2}
 
     expected = [
-        (non_null_sorted_entries[1].pk, 0),
-        (non_null_sorted_entries[0].pk, 1),
-        (null_sorted_entries[0].pk, 2),
-        (null_sorted_entries[2].pk, 3),
-        (null_sorted_entries[1].pk, 4),
+        non_null_sorted_entries[1].pk,
+        non_null_sorted_entries[0].pk,
+        null_sorted_entries[0].pk,
+        null_sorted_entries[2].pk,
+        null_sorted_entries[1].pk,
     ]
 
     perform_reordering(qs, operations)
 
-    actual = _get_sorted_map()
+    actual = _get_sorted_pks()
     assert actual == expected
 
 
@@ -275,9 +279,8 @@ def test_reordering_concurrently(dummy_attribute, assert_num_queries):
     assert ctx[1]["sql"] == (
         'UPDATE "product_attributevalue" '
         'SET "sort_order" = (CASE WHEN ("product_attributevalue"."id" = 1) '
-        'THEN 1 WHEN ("product_attributevalue"."id" = 2) '
-        "THEN 0 ELSE NULL END)::integer "
-        'WHERE "product_attributevalue"."id" IN (1, 2)'
+        "THEN 1025 ELSE NULL END)::integer "
+        'WHERE "product_attributevalue"."id" IN (1)'
     )
 
 
@@ -311,7 +314,78 @@ def test_reordering_deleted_node_from_concurrent(dummy_attribute, assert_num_que
     assert ctx[1]["sql"] == (
         'UPDATE "product_attributevalue" '
         'SET "sort_order" = (CASE WHEN ("product_attributevalue"."id" = 1) '
-        'THEN 1 WHEN ("product_attributevalue"."id" = 2) '
-        "THEN 0 ELSE NULL END)::integer "
-        'WHERE "product_attributevalue"."id" IN (1, 2)'
+        "THEN 1025 ELSE NULL END)::integer "
+        'WHERE "product_attributevalue"."id" IN (1)'
+    )
+
+
+@pytest.fixture
+def sparse_sorted_entries(dummy_attribute):
+    return SortedModel.objects.bulk_create(
+        [
+            SortedModel(
+                attribute=dummy_attribute,
+                slug=f"value-{i}",
+                name=f"Value-{i}",
+                sort_order=i * 1024,
+            )
+            for i in range(6)
+        ]
     )
+
+
+def test_reordering_updates_only_moved_nodes(sparse_sorted_entries, assert_num_queries):
+    """Ensures a node moved between two others with sparse sort orders gets
+    a sort order between theirs and no other node is updated."""
+    qs = SortedModel.objects
+    nodes = sparse_sorted_entries
+
+    operations = {nodes[4].pk: -3}
+
+    with assert_num_queries(2) as ctx:
+        perform_reordering(qs, operations)
+
+    assert ctx[1]["sql"].endswith(
+        f'WHERE "product_attributevalue"."id" IN ({nodes[4].pk})'
+    )
+    assert _get_sorted_map() == [
+        (nodes[0].pk, 0),
+        (nodes[4].pk, 512),
+        (nodes[1].pk, 1024),
+        (nodes[2].pk, 2048),
+        (nodes[3].pk, 3072),
+        (nodes[5].pk, 5120),
+    ]
+
+
+def test_reordering_spreads_out_sort_orders_without_gaps(sorted_entries_seq):
+    """Ensures all the sort orders are spread out again when a moved node
+    doesn't fit between its neighbours."""
+    qs = SortedModel.objects
+    nodes = sorted_entries_seq
+
+    operations = {nodes[0].pk: +2}
+
+    perform_reordering(qs, operations)
+
+    assert _get_sorted_map() == [
+        (nodes[1].pk, 0),
+        (nodes[2].pk, 1024),
+        (nodes[0].pk, 2048),
+        (nodes[3].pk, 3072),
+        (nodes[4].pk, 4096),
+        (nodes[5].pk, 5120),
+    ]
+
+
+def test_bulk_append(dummy_attribute, sparse_sorted_entries, assert_num_queries):
+    new_values = [
+        SortedModel(attribute=dummy_attribute, slug=f"new-{i}", name=f"New-{i}")
+        for i in range(3)
+    ]
+
+    with assert_num_queries(2):
+        SortedModel.bulk_append(new_values)
+
+    assert [value.sort_order for value in new_values] == [6144, 7168, 8192]
+    assert _get_sorted_pks()[-3:] == [value.pk for value in new_values]
@@ -0,0 +1,122 @@
+import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from saleor.core.db.routers import ReplicaRouter, use_read_database
+from saleor.page.models import Page
+
+from .utils import get_graphql_content
+
+QUERY_PAGES = """
+    query {
+        pages(first: 10) {
+            edges {
+                node {
+                    title
+                }
+            }
+        }
+    }
+"""
+
+MUTATION_TOKEN_VERIFY = """
+    mutation {
+        tokenVerify(token: "") {
+            isValid
+        }
+    }
+"""
+
+
+@pytest.fixture
+def replica(settings, transactional_db):
+    # The replica is a second connection to the test database, so it sees
+    # only data committed by the primary one.
+    settings.DATABASE_REPLICAS = ["replica"]
+    cache.clear()
+    yield "replica"
+    cache.clear()
+
+
+def query_pages(client, query=QUERY_PAGES):
+    """Return page titles and numbers of queries sent to each database."""
+    with CaptureQueriesContext(
+        connections[DEFAULT_DB_ALIAS]
+    ) as primary_queries, CaptureQueriesContext(
+        connections["replica"]
+    ) as replica_queries:
+        content = get_graphql_content(client.post_graphql(query))
+    titles = [edge["node"]["title"] for edge in content["data"]["pages"]["edges"]]
+    return titles, len(primary_queries), len(replica_queries)
+
+
+def test_query_reads_from_replica(replica, api_client, page):
+    titles, primary_queries, replica_queries = query_pages(api_client)
+
+    assert titles == [page.title]
+    assert primary_queries == 0
+    assert replica_queries > 0
+
+
+def test_query_reads_from_primary_without_replicas(replica, settings, api_client, page):
+    settings.DATABASE_REPLICAS = []
+
+    titles, primary_queries, replica_queries = query_pages(api_client)
+
+    assert titles == [page.title]
+    assert replica_queries == 0
+
+
+def test_query_reads_from_primary_after_mutation(replica, api_client, page):
+    api_client.post_graphql(MUTATION_TOKEN_VERIFY)
+
+    titles, primary_queries, replica_queries = query_pages(api_client)
+
+    assert titles == [page.title]
+    assert replica_queries == 0
+
+
+def test_read_after_write_delay_is_per_client(
+    replica, api_client, staff_api_client, page
+):
+    staff_api_client.post_graphql(MUTATION_TOKEN_VERIFY)
+
+    _titles, primary_queries, replica_queries = query_pages(api_client)
+
+    assert primary_queries == 0
+    assert replica_queries > 0
+
+
+def test_concurrently_executed_fields_read_from_replica(
+    replica, settings, api_client, page, site_settings
+):
+    settings.GRAPHQL_CONCURRENT_EXECUTION = True
+    query = """
+        query {
+            pages(first: 10) { edges { node { title } } }
+            shop { name }
+        }
+    """
+
+    titles, primary_queries, _replica_queries = query_pages(api_client, query)
+
+    assert titles == [page.title]
+    assert primary_queries == 0
+
+
+def test_router_writes_to_primary(transactional_db, settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    router = ReplicaRouter()
+
+    with use_read_database("replica"):
+        assert router.db_for_read(Page) == "replica"
+        assert router.db_for_write(Page) == DEFAULT_DB_ALIAS
+
+
+def test_router_reads_from_primary_in_transaction(transactional_db, settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    router = ReplicaRouter()
+
+    with use_read_database("replica"), transaction.atomic():
+        assert router.db_for_read(Page) == DEFAULT_DB_ALIAS
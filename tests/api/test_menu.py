@@ -9,6 +9,7 @@ from saleor.menu.models import Menu, MenuItem
 from saleor.product.models import Category
 from tests.api.utils import get_graphql_content
 
+from ..utils import flush_post_commit_hooks
 from .utils import assert_no_permission, menu_item_to_json
 
 
@@ -114,6 +115,42 @@ def test_menu_query(user_api_client, menu):
     assert not content["data"]["menu"]
 
 
+def test_menu_items_tree_query_without_queries_per_level(
+    api_client, menu, django_assert_num_queries
+):
+    parent = None
+    for level in range(4):
+        parent = MenuItem.objects.create(
+            menu=menu, parent=parent, name="level %s" % level
+        )
+    query = """
+    query menu($id: ID) {
+        menu(id: $id) {
+            items {
+                name
+                children { name children { name children { name } } }
+            }
+        }
+    }
+    """
+    variables = {"id": graphene.Node.to_global_id("Menu", menu.pk)}
+    flush_post_commit_hooks()
+    # Build the menu tree.
+    api_client.post_graphql(query, variables)
+
+    # Only the menu is fetched.
+    with django_assert_num_queries(1):
+        response = api_client.post_graphql(query, variables)
+
+    content = get_graphql_content(response)
+    item = content["data"]["menu"]["items"][0]
+    names = []
+    while item:
+        names.append(item["name"])
+        item = (item.get("children") or [None])[0]
+    assert names == ["level %s" % level for level in range(4)]
+
+
 @pytest.mark.parametrize(
     "menu_filter, count", [({"search": "Menu1"}, 1), ({"search": "Menu"}, 2)]
 )
@@ -862,17 +899,12 @@ def test_menu_cannot_get_menu_item_not_from_same_menu(
         QUERY_REORDER_MENU, {"moves": moves, "menu": menu_id}, [permission_manage_menus]
     )
 
-    assert json.loads(response.content) == {
-        "data": {
-            "menuItemMove": {
-                "errors": [
-                    {
-                        "field": "item",
-                        "message": f"Couldn't resolve to a node: {node_id}",
-                    }
-                ],
-                "menu": None,
-            }
+    assert json.loads(response.content)["data"] == {
+        "menuItemMove": {
+            "errors": [
+                {"field": "item", "message": f"Couldn't resolve to a node: {node_id}"}
+            ],
+            "menu": None,
         }
     }
 
@@ -893,11 +925,9 @@ def test_menu_cannot_pass_an_invalid_menu_item_node_type(
         QUERY_REORDER_MENU, {"moves": moves, "menu": menu_id}, [permission_manage_menus]
     )
 
-    assert json.loads(response.content) == {
-        "data": {
-            "menuItemMove": {
-                "errors": [{"field": "item", "message": "Must receive a MenuItem id"}],
-                "menu": None,
-            }
+    assert json.loads(response.content)["data"] == {
+        "menuItemMove": {
+            "errors": [{"field": "item", "message": "Must receive a MenuItem id"}],
+            "menu": None,
         }
     }
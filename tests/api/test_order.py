@@ -23,6 +23,7 @@ from saleor.graphql.payment.types import PaymentChargeStatusEnum
 from saleor.order import OrderStatus, events as order_events
 from saleor.order.error_codes import OrderErrorCode
 from saleor.order.models import Order, OrderEvent
+from saleor.order.search import update_orders_search_document
 from saleor.payment import ChargeStatus, CustomPaymentChoices, PaymentError
 from saleor.payment.models import Payment
 from saleor.plugins.manager import PluginsManager
@@ -2324,6 +2325,7 @@ def test_order_query_with_filter_customer_fields(
 
     order = Order(user=customer_user, token=str(uuid.uuid4()))
     Order.objects.bulk_create([order, Order(token=str(uuid.uuid4()))])
+    update_orders_search_document(Order.objects.all())
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -2361,6 +2363,7 @@ def test_draft_order_query_with_filter_customer_fields(
     Order.objects.bulk_create(
         [order, Order(token=str(uuid.uuid4()), status=OrderStatus.DRAFT)]
     )
+    update_orders_search_document(Order.objects.all())
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -2598,6 +2601,7 @@ def test_orders_query_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(orders_query_with_filter, variables)
@@ -2661,6 +2665,7 @@ def test_draft_orders_query_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(draft_orders_query_with_filter, variables)
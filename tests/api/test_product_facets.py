@@ -0,0 +1,148 @@
+import graphene
+import pytest
+from django.core.cache import cache
+
+from saleor.product.models import Product
+from saleor.product.utils.attributes import associate_attribute_values_to_instance
+from saleor.warehouse.models import Stock
+
+from ..utils import flush_post_commit_hooks
+from .utils import get_graphql_content
+
+QUERY_PRODUCT_FACETS = """
+    query ProductFacets($filter: ProductFilterInput, $priceStep: Decimal) {
+        productFacets(filter: $filter, priceStep: $priceStep) {
+            totalCount
+            attributes {
+                attribute {
+                    slug
+                }
+                values {
+                    value {
+                        slug
+                    }
+                    count
+                }
+            }
+            categories {
+                category {
+                    id
+                }
+                count
+            }
+            prices {
+                start {
+                    amount
+                }
+                stop {
+                    amount
+                }
+                count
+            }
+            stockAvailability {
+                stockAvailability
+                count
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def facet_products(product_list_published, color_attribute):
+    products = list(product_list_published.order_by("pk"))
+    for product in products:
+        Product.objects.filter(pk=product.pk).update(
+            minimal_variant_price_amount=product.price_amount
+        )
+    # The last product is blue and out of stock
+    associate_attribute_values_to_instance(
+        products[2], color_attribute, color_attribute.values.get(slug="blue")
+    )
+    Stock.objects.filter(product_variant__product=products[2]).update(quantity=0)
+    # Invalidations scheduled when the fixtures were saved.
+    flush_post_commit_hooks()
+    cache.clear()
+    return products
+
+
+def test_product_facets(api_client, facet_products, category):
+    variables = {"priceStep": 15}
+
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    facets = get_graphql_content(response)["data"]["productFacets"]
+    assert facets["totalCount"] == 3
+    assert facets["attributes"] == [
+        {
+            "attribute": {"slug": "color"},
+            "values": [
+                {"value": {"slug": "red"}, "count": 2},
+                {"value": {"slug": "blue"}, "count": 1},
+            ],
+        }
+    ]
+    assert facets["categories"] == [
+        {
+            "category": {"id": graphene.Node.to_global_id("Category", category.pk)},
+            "count": 3,
+        }
+    ]
+    assert facets["prices"] == [
+        {"start": {"amount": 0.0}, "stop": {"amount": 15.0}, "count": 1},
+        {"start": {"amount": 15.0}, "stop": {"amount": 30.0}, "count": 1},
+        {"start": {"amount": 30.0}, "stop": {"amount": 45.0}, "count": 1},
+    ]
+    assert sorted(
+        facets["stockAvailability"], key=lambda facet: facet["stockAvailability"]
+    ) == [
+        {"stockAvailability": "IN_STOCK", "count": 2},
+        {"stockAvailability": "OUT_OF_STOCK", "count": 1},
+    ]
+
+
+def test_product_facets_counted_without_own_filter(api_client, facet_products):
+    variables = {
+        "filter": {
+            "attributes": [{"slug": "color", "values": ["red"]}],
+            "stockAvailability": "IN_STOCK",
+        },
+        "priceStep": 100,
+    }
+
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    facets = get_graphql_content(response)["data"]["productFacets"]
+    assert facets["totalCount"] == 2
+    # The blue product is out of stock
+    assert facets["attributes"][0]["values"] == [{"value": {"slug": "red"}, "count": 2}]
+    # The out of stock product is blue
+    assert facets["stockAvailability"] == [
+        {"stockAvailability": "IN_STOCK", "count": 2}
+    ]
+    assert facets["prices"] == [
+        {"start": {"amount": 0.0}, "stop": {"amount": 100.0}, "count": 2}
+    ]
+
+
+def test_product_facets_are_cached(
+    api_client, facet_products, django_assert_num_queries
+):
+    variables = {"filter": {"attributes": [{"slug": "color", "values": ["red"]}]}}
+    api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    with django_assert_num_queries(2):
+        # Only the attribute values and the categories are fetched.
+        response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    facets = get_graphql_content(response)["data"]["productFacets"]
+    assert facets["totalCount"] == 2
+
+
+def test_product_facets_invalid_price_step(api_client):
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, {"priceStep": 0})
+
+    content = get_graphql_content(response, ignore_errors=True)
+    assert content["errors"][0]["message"] == (
+        "The price step has to be greater than zero."
+    )
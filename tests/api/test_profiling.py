@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from saleor.graphql.profiling import (
+    FieldStats,
+    ProfilingRegistry,
+    collect_stats,
+    registry,
+    render_metrics,
+)
+
+QUERY_PRODUCTS = """
+    query {
+        products(first: 10) {
+            edges {
+                node {
+                    name
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.GRAPHQL_PROFILING_SAMPLE_RATE = 1
+    settings.GRAPHQL_PROFILING_FLUSH_INTERVAL = 0
+    settings.GRAPHQL_PROFILING_METRICS_TOKEN = "secret"
+    cache.clear()
+    registry.reset()
+    yield
+    cache.clear()
+    registry.reset()
+
+
+def test_sampled_request_records_field_stats(profiling, api_client, product):
+    api_client.post_graphql(QUERY_PRODUCTS)
+
+    stats = collect_stats()
+    assert stats["Query.products"].calls == 1
+    assert stats["Query.products"].sql_queries >= 1
+    assert stats["Query.products"].duration > 0
+    assert stats["Product.category"].calls == 1
+
+
+def test_not_sampled_request_is_not_profiled(profiling, settings, api_client, product):
+    settings.GRAPHQL_PROFILING_SAMPLE_RATE = 0
+
+    api_client.post_graphql(QUERY_PRODUCTS)
+
+    assert collect_stats() == {}
+
+
+def test_batch_entries_are_sampled_separately(profiling, settings, api_client):
+    settings.GRAPHQL_PROFILING_SAMPLE_RATE = 0.5
+    queries = [{"query": "{ shop { name } }"}, {"query": "{ shop { name } }"}]
+
+    with patch("saleor.graphql.views.random.random", side_effect=[0.1, 0.9]):
+        api_client.post(queries)
+
+    assert collect_stats()["Query.shop"].calls == 1
+
+
+def test_stats_of_processes_are_summed(profiling):
+    other_process = ProfilingRegistry()
+    registry.add({"Query.shop": FieldStats(calls=1, duration=0.1, sql_queries=1)})
+    other_process.add({"Query.shop": FieldStats(calls=2, duration=0.2, sql_queries=3)})
+
+    stats = collect_stats()
+
+    assert registry.slot != other_process.slot
+    assert stats["Query.shop"].calls == 3
+    assert stats["Query.shop"].sql_queries == 4
+
+
+def test_metrics_view(profiling, client, api_client, product):
+    api_client.post_graphql(QUERY_PRODUCTS)
+
+    response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'graphql_field_calls_total{field="Query.products"} 1' in content
+
+
+def test_metrics_view_requires_token(profiling, client):
+    response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer invalid")
+    assert response.status_code == 401
+
+
+def test_metrics_view_disabled_without_token(profiling, settings, client):
+    settings.GRAPHQL_PROFILING_METRICS_TOKEN = None
+    response = client.get(reverse("metrics"))
+    assert response.status_code == 404
+
+
+def test_render_metrics():
+    stats = {"Query.shop": FieldStats(calls=2, duration=0.5, sql_queries=3)}
+
+    content = render_metrics(stats)
+
+    assert "# TYPE graphql_field_calls_total counter" in content
+    assert 'graphql_field_calls_total{field="Query.shop"} 2' in content
+    assert 'graphql_field_duration_seconds_total{field="Query.shop"} 0.5' in content
+    assert 'graphql_field_sql_queries_total{field="Query.shop"} 3' in content
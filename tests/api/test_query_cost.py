@@ -0,0 +1,181 @@
+import pytest
+from graphene_django.settings import graphene_settings
+from graphql import parse
+
+from saleor.graphql.api import schema
+from saleor.graphql.query_cost import QueryCostAnalyzer
+
+from .utils import _get_graphql_content_from_response, get_graphql_content
+
+PRODUCTS_QUERY = """
+    query Products($first: Int) {
+        products(first: $first) {
+            edges {
+                node {
+                    name
+                    variants {
+                        name
+                    }
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def calculate_cost(query, variables=None, field_weights=None):
+    analyzer = QueryCostAnalyzer(
+        schema, parse(query), variables=variables, field_weights=field_weights
+    )
+    return analyzer.calculate()
+
+
+def test_query_cost_scalar_fields_are_free():
+    assert calculate_cost("{ shop { name description } }") == 1
+
+
+def test_query_cost_multiplied_by_connection_size():
+    # products + first * (edges + node + variants + category)
+    assert calculate_cost(PRODUCTS_QUERY, {"first": 10}) == 1 + 10 * 4
+
+
+def test_query_cost_uses_max_limit_without_pagination_arguments():
+    max_limit = graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+    assert calculate_cost(PRODUCTS_QUERY) == 1 + max_limit * 4
+
+
+def test_query_cost_with_field_weights():
+    cost = calculate_cost(
+        PRODUCTS_QUERY, {"first": 10}, field_weights={"Product.variants": 5}
+    )
+    assert cost == 1 + 10 * 8
+
+
+def test_query_cost_of_nested_connections():
+    query = """
+        {
+            categories(first: 10) {
+                edges {
+                    node {
+                        products(first: 20) {
+                            edges {
+                                node {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+    assert calculate_cost(query) == 1 + 10 * (2 + 1 + 20 * 2)
+
+
+def test_query_cost_of_nested_lists(settings):
+    settings.GRAPHQL_QUERY_COST_LIST_SIZE = 10
+    query = """
+        {
+            products(first: 100) {
+                edges {
+                    node {
+                        variants {
+                            stocks {
+                                quantity
+                            }
+                        }
+                        attributes {
+                            values {
+                                translation(languageCode: EN) {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+    variants_cost = 1 + 10 * 1
+    attributes_cost = 1 + 10 * (1 + 10 * 1)
+    node_cost = 1 + variants_cost + attributes_cost
+    assert calculate_cost(query) == 1 + 100 * (1 + node_cost)
+
+
+def test_query_cost_with_fragments():
+    query = """
+        query {
+            products(first: 10) {
+                edges {
+                    node {
+                        ...ProductFragment
+                    }
+                }
+            }
+        }
+        fragment ProductFragment on Product {
+            category {
+                name
+            }
+            ... on Product {
+                productType {
+                    name
+                }
+            }
+        }
+    """
+    assert calculate_cost(query) == 1 + 10 * 4
+
+
+def test_query_cost_reported_in_extensions(settings, api_client, product):
+    settings.GRAPHQL_QUERY_MAX_COST = 1000
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, {"first": 10})
+
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 41,
+        "maximumAvailable": 1000,
+    }
+
+
+def test_query_cost_reported_without_limit(settings, api_client, product):
+    settings.GRAPHQL_QUERY_MAX_COST = 0
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, {"first": 10})
+
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 41,
+        "maximumAvailable": None,
+    }
+
+
+def test_batch_exceeding_max_cost_is_rejected(settings, api_client, product):
+    settings.GRAPHQL_QUERY_MAX_COST = 50
+    entry = {"query": PRODUCTS_QUERY, "variables": {"first": 10}}
+
+    response = api_client.post([entry, entry])
+
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert len(content) == 2
+    assert "data" not in content[0]
+    assert "exceeds the maximum cost of 50" in content[0]["errors"][0]["message"]
+    assert content[0]["extensions"]["cost"]["requestedQueryCost"] == 82
+
+
+@pytest.mark.parametrize("first", [20, None])
+def test_query_exceeding_max_cost_is_rejected(settings, api_client, product, first):
+    settings.GRAPHQL_QUERY_MAX_COST = 50
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, {"first": first})
+
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert "data" not in content
+    assert "exceeds the maximum cost of 50" in content["errors"][0]["message"]
+    assert content["extensions"]["cost"]["requestedQueryCost"] > 50
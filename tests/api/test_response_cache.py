@@ -0,0 +1,169 @@
+import json
+from unittest.mock import patch
+
+import graphene
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from graphql import parse
+
+from saleor.graphql.response_cache import (
+    get_response_cache_tags,
+    get_tag_versions,
+    is_anonymous_request,
+)
+from saleor.graphql.views import GraphQLView
+
+from ..utils import flush_post_commit_hooks
+from .conftest import API_PATH
+from .utils import get_graphql_content
+
+QUERY_PRODUCT = """
+    query Product($id: ID!) {
+        product(id: $id) {
+            name
+        }
+    }
+"""
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def execute_document_mock():
+    with patch.object(
+        GraphQLView,
+        "execute_document",
+        side_effect=GraphQLView.execute_document,
+        autospec=True,
+    ) as mocked:
+        yield mocked
+
+
+def query_product(client, product):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    response = client.post_graphql(QUERY_PRODUCT, variables)
+    return get_graphql_content(response)["data"]["product"]
+
+
+def test_response_cache_miss_and_hit(
+    response_cache, execute_document_mock, api_client, product
+):
+    # Invalidations scheduled when the fixtures were saved.
+    flush_post_commit_hooks()
+
+    first = query_product(api_client, product)
+    second = query_product(api_client, product)
+
+    assert first == second == {"name": product.name}
+    assert execute_document_mock.call_count == 1
+
+
+def test_response_cache_disabled(
+    response_cache, settings, execute_document_mock, api_client, product
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+
+    query_product(api_client, product)
+    query_product(api_client, product)
+
+    assert execute_document_mock.call_count == 2
+
+
+def test_response_cache_invalidated_after_save(response_cache, api_client, product):
+    query_product(api_client, product)
+
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    assert query_product(api_client, product) == {"name": "New name"}
+
+
+def test_response_cache_bypassed_for_authenticated_requests(
+    response_cache, execute_document_mock, staff_api_client, product
+):
+    query_product(staff_api_client, product)
+    query_product(staff_api_client, product)
+
+    assert execute_document_mock.call_count == 2
+
+
+def test_saving_tagged_model_bumps_tag_version(response_cache, product):
+    versions = get_tag_versions(["product"])
+
+    product.save()
+
+    assert get_tag_versions(["product"]) != versions
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        'mutation { tokenVerify(token: "") { isValid } }',
+        "{ me { email } }",
+        "{ shop { name geolocalization { country { code } } } }",
+        "{ ...ShopFragment } fragment ShopFragment on Query { shop { name } }",
+    ],
+)
+def test_response_cache_tags_of_uncacheable_queries(query):
+    assert get_response_cache_tags(parse(query), None) is None
+
+
+def test_response_cache_tags():
+    query = "{ shop { name } products(first: 1) { edges { node { name } } } }"
+
+    tags = get_response_cache_tags(parse(query), None)
+
+    assert tags == {"site", "menu", "collection", "vat", "product", "category", "sale"}
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"HTTP_AUTHORIZATION": "JWT token"},
+        {"HTTP_AUTHORIZATION": "Bearer app-token"},
+        {"HTTP_COOKIE": "JWT=token"},
+    ],
+)
+def test_request_with_credentials_is_not_anonymous(headers):
+    request = RequestFactory().get(API_PATH, **headers)
+    assert not is_anonymous_request(request)
+
+
+def test_get_query_with_http_cache_headers(
+    response_cache, settings, api_client, product
+):
+    settings.GRAPHQL_RESPONSE_CACHE_HTTP_HEADERS = True
+    params = {
+        "query": QUERY_PRODUCT,
+        "variables": json.dumps(
+            {"id": graphene.Node.to_global_id("Product", product.pk)}
+        ),
+    }
+
+    response = api_client.get(API_PATH, params)
+
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "public, max-age=60"
+    etag = response["ETag"]
+    response = api_client.get(API_PATH, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+def test_get_request_rejects_mutations(api_client):
+    query = 'mutation { tokenVerify(token: "") { isValid } }'
+
+    response = api_client.get(API_PATH, {"query": query})
+
+    assert response.status_code == 400
+    content = json.loads(response.content)
+    assert content["errors"][0]["message"] == (
+        "Only queries can be sent with GET requests."
+    )
@@ -3,8 +3,11 @@ from unittest import mock
 import graphene
 import pytest
 from django.test import override_settings
+from graphql import parse
+from graphql.execution import ExecutionResult
 
 from saleor.demo.views import EXAMPLE_QUERY
+from saleor.graphql.executor import merge_execution_results, split_top_level_fields
 from saleor.graphql.product.types import Product
 
 from .conftest import API_PATH
@@ -210,3 +213,111 @@ def test_example_query(api_client, product):
     response = api_client.post_graphql(EXAMPLE_QUERY)
     content = get_graphql_content(response)
     assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+def test_split_top_level_fields():
+    document_ast = parse(
+        """
+        query Shop {
+            shop { name }
+            categories(first: 1) { totalCount }
+            shop { description }
+        }
+        """
+    )
+
+    documents = split_top_level_fields(document_ast, "Shop")
+
+    assert len(documents) == 2
+    shop_fields = documents[0].definitions[0].selection_set.selections
+    assert [field.name.value for field in shop_fields] == ["shop", "shop"]
+    categories_fields = documents[1].definitions[0].selection_set.selections
+    assert [field.name.value for field in categories_fields] == ["categories"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    (
+        'mutation { tokenVerify(token: "") { isValid } }',
+        "query { shop { name } }",
+        "query { ...ShopFragment } fragment ShopFragment on Query { shop { name } }",
+    ),
+)
+def test_split_top_level_fields_not_splittable(query):
+    assert split_top_level_fields(parse(query), None) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_execution_of_top_level_fields(
+    settings, category, product, api_client
+):
+    settings.GRAPHQL_CONCURRENT_EXECUTION = True
+    query = """
+        query GetProductAndCategory($productId: ID!, $categoryId: ID!) {
+            category(id: $categoryId) {
+                name
+            }
+            product(id: $productId) {
+                name
+            }
+        }
+    """
+    variables = {
+        "productId": graphene.Node.to_global_id("Product", product.pk),
+        "categoryId": graphene.Node.to_global_id("Category", category.pk),
+    }
+
+    response = api_client.post_graphql(query, variables)
+
+    content = get_graphql_content(response)
+    assert list(content["data"]) == ["category", "product"]
+    assert content["data"]["product"]["name"] == product.name
+    assert content["data"]["category"]["name"] == category.name
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_execution_of_batch_queries(settings, category, api_client):
+    settings.GRAPHQL_CONCURRENT_EXECUTION = True
+    query = """
+        query GetCategory($id: ID!) {
+            category(id: $id) {
+                name
+            }
+        }
+    """
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    data = [{"query": query, "variables": variables}, {"query": "{ invalid }"}]
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    batch_content = _get_graphql_content_from_response(response)
+    assert batch_content[0]["data"]["category"]["name"] == category.name
+    assert "errors" in batch_content[1]
+
+
+def test_batch_with_mutation_is_executed_serially(settings, api_client):
+    settings.GRAPHQL_CONCURRENT_EXECUTION = True
+    data = [
+        {"query": 'mutation { tokenVerify(token: "") { isValid } }'},
+        {"query": "{ shop { name } }"},
+    ]
+
+    with mock.patch("saleor.graphql.views.execute_concurrently") as concurrent_mock:
+        response = api_client.post(data)
+
+    concurrent_mock.assert_not_called()
+    batch_content = get_graphql_content(response)
+    assert len(batch_content) == 2
+
+
+def test_merge_execution_results_keeps_extensions():
+    results = [
+        ExecutionResult(data={"shop": None}, extensions={"a": 1}),
+        ExecutionResult(data={"menu": None}, extensions={"b": 2}),
+    ]
+
+    merged = merge_execution_results(results)
+
+    assert merged.data == {"shop": None, "menu": None}
+    assert merged.extensions == {"a": 1, "b": 2}
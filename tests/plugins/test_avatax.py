@@ -1,22 +1,42 @@
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock
 
 import pytest
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from prices import Money, TaxedMoney
 
 from saleor.checkout.utils import add_variant_to_checkout
 from saleor.core.taxes import TaxError, quantize_price
 from saleor.plugins.avatax import (
+    CIRCUIT_BREAKER_MAX_FAILURES,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
     AvataxConfiguration,
-    checkout_needs_new_fetch,
+    TransactionType,
+    api_get_request,
+    api_post_request,
+    circuit_breaker,
     generate_request_data_from_checkout,
+    get_api_url,
+    get_cached_response_or_fetch,
     get_cached_tax_codes_or_fetch,
+    get_request_cache_key,
 )
 from saleor.plugins.avatax.plugin import AvataxPlugin
 from saleor.plugins.manager import get_plugins_manager
 from saleor.plugins.models import PluginConfiguration
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Identical requests share cached responses, while the recorded responses
+    # differ between tests.
+    cache.clear()
+
+
 @pytest.fixture
 def plugin_configuration(db):
     def set_configuration(username="test", password="test", sandbox=True):
@@ -347,14 +367,138 @@ def test_get_cached_tax_codes_or_fetch_wrong_response(monkeypatch):
     assert len(tax_codes) == 0
 
 
-def test_checkout_needs_new_fetch(monkeypatch, checkout_with_item, address):
-    monkeypatch.setattr("saleor.plugins.avatax.cache.get", lambda x: None)
+def test_get_request_cache_key_shared_between_checkouts(checkout_with_item, address):
     checkout_with_item.shipping_address = address
-    config = AvataxConfiguration(
-        username_or_account="wrong_data", password_or_license="wrong_data"
-    )
+    config = AvataxConfiguration(username_or_account="test", password_or_license="test")
     checkout_data = generate_request_data_from_checkout(checkout_with_item, config)
-    assert checkout_needs_new_fetch(checkout_data, str(checkout_with_item.token))
+    other_checkout_data = generate_request_data_from_checkout(
+        checkout_with_item, config, transaction_token=str(uuid.uuid4())
+    )
+    invoice_data = generate_request_data_from_checkout(
+        checkout_with_item, config, transaction_type=TransactionType.INVOICE
+    )
+    other_invoice_data = generate_request_data_from_checkout(
+        checkout_with_item,
+        config,
+        transaction_token=str(uuid.uuid4()),
+        transaction_type=TransactionType.INVOICE,
+    )
+
+    key = get_request_cache_key(checkout_data, config)
+
+    assert key == get_request_cache_key(other_checkout_data, config)
+    assert get_request_cache_key(invoice_data, config) != get_request_cache_key(
+        other_invoice_data, config
+    )
+    other_config = AvataxConfiguration(
+        username_or_account="other", password_or_license="test"
+    )
+    assert key != get_request_cache_key(checkout_data, other_config)
+
+
+class AvataxStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append(self.client_address)
+        status, body = self.server.responses.pop(0)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def avatax_stub(settings):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AvataxStubHandler)
+    server.requests = []
+    server.responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.AVATAX_API_URL = "http://127.0.0.1:%s/api/v2/" % server.server_port
+    circuit_breaker.reset()
+    yield server
+    server.shutdown()
+    server.server_close()
+    circuit_breaker.reset()
+
+
+@pytest.fixture
+def stub_config():
+    # Responses are cached per credentials, so every test has its own.
+    return AvataxConfiguration(
+        username_or_account=str(uuid.uuid4()), password_or_license="test"
+    )
+
+
+def test_api_request_keeps_connection_alive(avatax_stub, stub_config):
+    avatax_stub.responses = [(200, {"value": []})] * 3
+    url = get_api_url()
+
+    responses = [api_get_request(url, stub_config) for _ in range(3)]
+
+    assert responses == [{"value": []}] * 3
+    assert len(avatax_stub.requests) == 3
+    assert len(set(avatax_stub.requests)) == 1
+
+
+def test_api_request_retries_unavailable_service(avatax_stub, stub_config):
+    avatax_stub.responses = [(503, {}), (200, {"totalTax": 1})]
+
+    response = api_post_request(get_api_url(), {}, stub_config)
+
+    assert response == {"totalTax": 1}
+    assert len(avatax_stub.requests) == 2
+
+
+def test_api_request_circuit_breaker(avatax_stub, stub_config):
+    avatax_stub.responses = [(500, {})] * CIRCUIT_BREAKER_MAX_FAILURES
+    url = get_api_url()
+    for _ in range(CIRCUIT_BREAKER_MAX_FAILURES):
+        api_post_request(url, {}, stub_config)
+
+    assert api_post_request(url, {}, stub_config) == {}
+    assert len(avatax_stub.requests) == CIRCUIT_BREAKER_MAX_FAILURES
+
+    # A trial request is let through after the reset timeout and closes the circuit.
+    circuit_breaker.opened_at -= CIRCUIT_BREAKER_RESET_TIMEOUT
+    avatax_stub.responses = [(200, {"totalTax": 1})] * 2
+    assert api_post_request(url, {}, stub_config) == {"totalTax": 1}
+    assert api_post_request(url, {}, stub_config) == {"totalTax": 1}
+    assert len(avatax_stub.requests) == CIRCUIT_BREAKER_MAX_FAILURES + 2
+
+
+def test_get_cached_response_or_fetch_shared_between_checkouts(
+    avatax_stub, stub_config
+):
+    avatax_stub.responses = [(200, {"totalTax": 1})]
+    data = {
+        "createTransactionModel": {
+            "type": TransactionType.ORDER,
+            "code": str(uuid.uuid4()),
+            "lines": [{"quantity": 1, "amount": "10.00"}],
+        }
+    }
+    other_checkout_data = {
+        "createTransactionModel": {
+            **data["createTransactionModel"],
+            "code": str(uuid.uuid4()),
+        }
+    }
+
+    response = get_cached_response_or_fetch(data, stub_config)
+    other_response = get_cached_response_or_fetch(other_checkout_data, stub_config)
+
+    assert response == other_response == {"totalTax": 1}
+    assert len(avatax_stub.requests) == 1
 
 
 def test_get_plugin_configuration(settings):
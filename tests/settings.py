@@ -20,6 +20,13 @@ def lazy_re_compile(regex, flags=0):
     return SimpleLazyObject(_compile)
 
 
+# A second connection standing in for a read replica; reads are routed to it
+# only in tests that add it to `DATABASE_REPLICAS`.
+DATABASES["replica"] = {  # noqa: F405
+    **DATABASES["default"],  # noqa: F405
+    "TEST": {"MIRROR": "default"},
+}
+
 CELERY_TASK_ALWAYS_EAGER = True
 
 SECRET_KEY = "NOTREALLY"
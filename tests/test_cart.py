@@ -6,7 +6,8 @@ from prices import Money, TaxedMoney
 
 from saleor.checkout import calculations, utils
 from saleor.checkout.models import Checkout
-from saleor.checkout.utils import add_variant_to_checkout
+from saleor.checkout.utils import add_variant_to_checkout, add_variants_to_checkout
+from saleor.core.exceptions import InsufficientStock
 from saleor.product.models import Category
 
 
@@ -90,6 +91,49 @@ def test_adding_invalid_quantity(checkout, product):
         add_variant_to_checkout(checkout, variant, -1)
 
 
+def test_adding_variants_in_bulk(
+    checkout, product, product_list, django_assert_max_num_queries
+):
+    variant = product.variants.get()
+    add_variant_to_checkout(checkout, variant, 1)
+    variants = [variant] + [product.variants.get() for product in product_list]
+
+    with django_assert_max_num_queries(8):
+        add_variants_to_checkout(checkout, variants + [variants[1]], [2, 1, 2, 3, 4])
+
+    quantities = {line.variant: line.quantity for line in checkout}
+    assert quantities == {
+        variants[0]: 3,
+        variants[1]: 5,
+        variants[2]: 2,
+        variants[3]: 3,
+    }
+    assert checkout.quantity == 13
+
+
+def test_replacing_variants_in_bulk(checkout_with_item, product_list):
+    line = checkout_with_item.lines.get()
+    variants = [line.variant] + [product.variants.get() for product in product_list]
+
+    add_variants_to_checkout(
+        checkout_with_item, variants + [variants[1]], [0, 1, 2, 3, 4], replace=True
+    )
+
+    quantities = {line.variant: line.quantity for line in checkout_with_item}
+    assert quantities == {variants[1]: 4, variants[2]: 2, variants[3]: 3}
+    assert checkout_with_item.quantity == 9
+
+
+def test_adding_variants_in_bulk_insufficient_stock(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+
+    with pytest.raises(InsufficientStock) as exc:
+        add_variants_to_checkout(checkout, variants + [variants[2]], [1, 1, 50, 51])
+
+    assert exc.value.item == variants[2]
+    assert checkout.lines.count() == 0
+
+
 def test_getting_line(checkout, product):
     variant = product.variants.get()
     assert checkout.get_line(variant) is None
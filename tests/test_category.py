@@ -1,8 +1,11 @@
 from unittest.mock import patch
 
+from saleor.product.category_tree import category_tree
 from saleor.product.models import Category
 from saleor.product.utils import collect_categories_tree_products, delete_categories
 
+from .utils import flush_post_commit_hooks
+
 
 def test_collect_categories_tree_products(categories_tree):
     parent = categories_tree
@@ -41,3 +44,42 @@ def test_delete_categories(
         assert not product.category
         assert not product.is_published
         assert not product.publication_date
+
+
+def test_category_tree_lookups(categories_tree):
+    parent = categories_tree
+    child = parent.children.get()
+    grandchild = child.children.create(name="Grandchild", slug="grandchild")
+
+    tree = category_tree.get()
+
+    assert tree.get_descendant_ids(parent.pk) == {parent.pk, child.pk, grandchild.pk}
+    assert tree.get_descendant_ids(child.pk, include_self=False) == {grandchild.pk}
+    assert tree.get_ancestor_ids(grandchild.pk) == [parent.pk, child.pk]
+    assert tree.get_children_ids(parent.pk) == [child.pk]
+    assert tree.get_slug_path(grandchild.pk) == ["parent", "child", "grandchild"]
+    assert tree.get_name_path(child.pk) == ["Parent", "Child"]
+
+
+def test_category_tree_lookups_without_queries(
+    categories_tree, django_assert_num_queries
+):
+    flush_post_commit_hooks()
+    category_tree.get()
+
+    with django_assert_num_queries(0):
+        assert category_tree.get().get_descendant_ids(categories_tree.pk)
+
+
+def test_category_tree_rebuilt_on_category_move(categories_tree):
+    parent = categories_tree
+    child = parent.children.get()
+    flush_post_commit_hooks()
+    assert child.pk in category_tree.get().get_descendant_ids(parent.pk)
+
+    child.move_to(None)
+    child.save()
+    flush_post_commit_hooks()
+
+    assert child.pk not in category_tree.get().get_descendant_ids(parent.pk)
+    assert category_tree.get().get_ancestor_ids(child.pk) == []
@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
 import pytest
+from django.core.cache import cache
 from django.core.management import CommandError, call_command
 from django.db.utils import DataError
 from django.templatetags.static import static
@@ -12,6 +13,12 @@ from measurement.measures import Weight
 
 from saleor.account.models import Address, User
 from saleor.account.utils import create_superuser
+from saleor.core.renditions import (
+    RenditionWarmer,
+    get_rendition,
+    get_size_keys,
+    is_rendition_known,
+)
 from saleor.core.storages import S3MediaStorage
 from saleor.core.templatetags.placeholder import placeholder
 from saleor.core.utils import (
@@ -200,6 +207,35 @@ def test_create_thumbnails(product_with_image, settings):
             )  # noqa
 
 
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False})
+def test_rendition_warmer_skips_existing_renditions(product_with_image):
+    cache.clear()
+    product_image = product_with_image.images.first()
+    queryset = ProductImage.objects.all()
+    size_keys = get_size_keys("products")
+
+    num_created, failed = RenditionWarmer("products").warm(queryset)
+    assert num_created == len(size_keys)
+    assert not failed
+
+    warmer = RenditionWarmer("products")
+    with patch.object(
+        product_image.image.storage.__class__,
+        "listdir",
+        autospec=True,
+        side_effect=product_image.image.storage.__class__.listdir,
+    ) as listdir_mock:
+        num_created, failed = warmer.warm(queryset)
+
+    assert num_created == 0
+    assert not failed
+    # All thumbnails of the image are in one directory.
+    assert listdir_mock.call_count == 1
+    product_image.image.create_on_demand = False
+    for size_key in size_keys:
+        assert is_rendition_known(get_rendition(product_image.image, size_key))
+
+
 @patch("storages.backends.s3boto3.S3Boto3Storage")
 def test_storages_set_s3_bucket_domain(storage, settings):
     settings.AWS_MEDIA_BUCKET_NAME = "media-bucket"
@@ -1,17 +1,22 @@
 import csv
+import gzip
 from io import StringIO
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from django.core.files.storage import default_storage
 from django.utils.encoding import smart_text
 
+from saleor.data_feeds import google_merchant
 from saleor.data_feeds.google_merchant import (
+    get_category_paths,
     get_feed_items,
     item_attributes,
     item_availability,
     item_google_product_category,
+    update_feed,
     write_feed,
 )
-from saleor.product.models import AttributeValue, Category
+from saleor.product.models import AttributeValue, Category, ProductVariant
 
 
 def test_saleor_feed_items(product, site_settings):
@@ -77,3 +82,59 @@ def test_write_feed(product, monkeypatch):
     ]
     for field in google_required_fields:
         assert field in header
+
+
+def test_get_category_paths(django_assert_num_queries, db):
+    main_category = Category.objects.create(name="Main", slug="main")
+    sub_category = Category.objects.create(name="Sub", slug="sub", parent=main_category)
+    leaf_category = Category.objects.create(
+        name="Leaf", slug="leaf", parent=sub_category
+    )
+
+    with django_assert_num_queries(1):
+        category_paths = get_category_paths()
+
+    assert category_paths == {
+        main_category.pk: "Main",
+        sub_category.pk: "Main > Sub",
+        leaf_category.pk: "Main > Sub > Leaf",
+    }
+
+
+def read_feed_lines():
+    with default_storage.open(google_merchant.FILE_PATH, "rb") as feed_file:
+        content = gzip.decompress(feed_file.read()).decode()
+    return list(csv.reader(StringIO(content), dialect=csv.excel_tab))
+
+
+def test_update_feed_concatenates_shards(media_root, product_list):
+    shard_size = 1
+    variants = ProductVariant.objects.order_by("pk")
+
+    update_feed(shard_size=shard_size)
+
+    lines = read_feed_lines()
+    assert lines[0] == google_merchant.ATTRIBUTES
+    skus = [line[google_merchant.ATTRIBUTES.index("mpn")] for line in lines[1:]]
+    assert skus == [variant.sku for variant in variants]
+
+
+def test_update_feed_incremental_rewrites_changed_shards(media_root, product_list):
+    shard_size = 1
+    update_feed(shard_size=shard_size)
+    changed_product = product_list[1]
+    changed_product.name = "Changed name"
+    changed_product.save()
+    changed_variant = changed_product.variants.get()
+
+    with patch.object(
+        google_merchant, "write_feed_shard", wraps=google_merchant.write_feed_shard,
+    ) as write_feed_shard_mock:
+        update_feed(shard_size=shard_size, incremental=True)
+
+    assert [call.args[1] for call in write_feed_shard_mock.call_args_list] == [
+        changed_variant.pk // shard_size
+    ]
+    lines = read_feed_lines()
+    assert len(lines) == len(product_list) + 1
+    assert any(line[1].startswith("Changed name") for line in lines)
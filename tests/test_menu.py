@@ -1,13 +1,21 @@
 from unittest import mock
 
+from django.core.cache import cache
+
 from saleor.menu.models import MenuItem, MenuItemTranslation
+from saleor.menu.tree import menu_tree
 from saleor.menu.utils import (
+    MENU_UPDATE_DELAY,
+    MENU_UPDATE_SCHEDULED_KEY,
     get_menu_as_json,
     get_menu_item_as_dict,
+    schedule_menus_update,
     update_menu,
     update_menus,
 )
 
+from .utils import flush_post_commit_hooks
+
 
 def test_get_menu_item_as_dict(menu):
     item = MenuItem.objects.create(name="Name", menu=menu, url="http://url.com")
@@ -51,12 +59,58 @@ def test_get_menu_as_json(menu):
     child_item_data = get_menu_item_as_dict(child_item)
     grand_child_data = get_menu_item_as_dict(grand_child_item)
 
+    grand_child_data["child_items"] = []
     child_item_data["child_items"] = [grand_child_data]
     top_item_data["child_items"] = [child_item_data]
     proper_data = [top_item_data]
     assert proper_data == get_menu_as_json(menu)
 
 
+def test_get_menu_as_json_of_any_depth(menu):
+    parent = None
+    for level in range(5):
+        parent = MenuItem.objects.create(
+            menu=menu, parent=parent, name="level %s" % level
+        )
+
+    items = get_menu_as_json(menu)
+
+    names = []
+    while items:
+        names.append(items[0]["name"])
+        items = items[0]["child_items"]
+    assert names == ["level %s" % level for level in range(5)]
+
+
+def test_menu_tree(menu):
+    second = MenuItem.objects.create(menu=menu, name="second")
+    first = MenuItem.objects.create(menu=menu, name="first")
+    child = MenuItem.objects.create(menu=menu, parent=first, name="child")
+    MenuItem.objects.filter(pk=second.pk).update(sort_order=1)
+    MenuItem.objects.filter(pk=first.pk).update(sort_order=0)
+    menu_tree.invalidate()
+
+    tree = menu_tree.get()
+
+    assert tree.get_top_items(menu.pk) == [first, second]
+    assert tree.get_children(first.pk) == [child]
+    assert tree.get_children(child.pk) == []
+
+
+@mock.patch("saleor.menu.tasks.update_menu_task.apply_async")
+def test_schedule_menus_update_is_debounced(mock_apply_async, menu):
+    cache.delete(MENU_UPDATE_SCHEDULED_KEY % menu.pk)
+
+    schedule_menus_update([menu.pk])
+    schedule_menus_update([menu.pk])
+    flush_post_commit_hooks()
+
+    mock_apply_async.assert_called_once_with(
+        args=[menu.pk], countdown=MENU_UPDATE_DELAY
+    )
+    cache.delete(MENU_UPDATE_SCHEDULED_KEY % menu.pk)
+
+
 @mock.patch("saleor.menu.utils.update_menu")
 def test_update_menus(mock_update_menu, menu):
     update_menus([menu.pk])
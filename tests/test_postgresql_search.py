@@ -1,10 +1,13 @@
 from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
 from django.utils.text import slugify
 from prices import Money
 
-from saleor.account.models import Address
+from saleor.account.models import Address, User
+from saleor.account.search import prepare_user_search_document_value
+from saleor.order.models import Order
 from saleor.product.models import Product
 from saleor.search.backends.postgresql import search_storefront
 
@@ -82,3 +85,70 @@ def gen_address_for_user(first_name, last_name):
         postal_code="53-601",
         country="PL",
     )
+
+
+@pytest.fixture
+def named_users():
+    users = []
+    for first_name, last_name, email in USERS:
+        address = gen_address_for_user(first_name, last_name)
+        users.append(
+            User.objects.create(
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                default_shipping_address=address,
+            )
+        )
+    return users
+
+
+def test_user_search_document(named_users):
+    user = named_users[0]
+
+    assert user.search_document.split("\n") == [
+        "adreas.knop@example.com",
+        "andreas",
+        "knop",
+        "andreas",
+        "knop",
+        "wrocław",
+        "pl",
+        "poland",
+    ]
+
+
+def test_user_search_document_updated_with_default_shipping_address(named_users):
+    user = named_users[0]
+    address = user.default_shipping_address
+
+    address.city = "Poznań"
+    address.save()
+
+    user.refresh_from_db()
+    assert "poznań" in user.search_document.split("\n")
+
+
+def test_order_search_document_updated_with_user(named_users):
+    user = named_users[0]
+    order = Order.objects.create(user=user, user_email=user.email)
+
+    user.last_name = "Knopf"
+    user.save(update_fields=["last_name"])
+
+    order.refresh_from_db()
+    assert "knopf" in order.search_document.split("\n")
+
+
+def test_update_search_documents_command(named_users):
+    User.objects.update(search_document="")
+    Order.objects.bulk_create(
+        [Order(user=user, token=str(pk)) for pk, user in zip(ORDER_IDS, named_users)]
+    )
+
+    call_command("update_search_documents", batch_size=2)
+
+    assert not User.objects.filter(search_document="").exists()
+    assert not Order.objects.filter(search_document="").exists()
+    user = User.objects.get(pk=named_users[1].pk)
+    assert user.search_document == prepare_user_search_document_value(user)
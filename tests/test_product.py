@@ -8,7 +8,10 @@ from prices import Money, MoneyRange
 
 from saleor.account import events as account_events
 from saleor.product import models
-from saleor.product.filters import filter_products_by_attributes_values
+from saleor.product.filters import (
+    filter_products_by_attributes_values,
+    get_attribute_values_facets,
+)
 from saleor.product.models import DigitalContentUrl
 from saleor.product.thumbnails import create_product_thumbnails
 from saleor.product.utils.attributes import associate_attribute_values_to_instance
@@ -75,6 +78,60 @@ def test_filtering_by_attribute(db, color_attribute, category, settings):
     assert product_b.pk in list(filtered)
 
 
+def test_product_attribute_values_include_variant_values(
+    product, color_attribute, size_attribute
+):
+    product_color = product.attributes.get().values.get()
+    variant_size = product.variants.get().attributes.get().values.get()
+
+    product.refresh_from_db()
+    assert set(product.attribute_values) == {product_color.pk, variant_size.pk}
+
+    product.variants.all().delete()
+
+    product.refresh_from_db()
+    assert product.attribute_values == [product_color.pk]
+
+
+def test_product_attribute_values_updated_after_attribute_unassigned(
+    product, color_attribute
+):
+    product.product_type.attributeproduct.filter(attribute=color_attribute).delete()
+
+    product.refresh_from_db()
+    assert color_attribute.values.first().pk not in product.attribute_values
+
+
+def test_get_attribute_values_facets(
+    product_list, color_attribute, size_attribute, assert_num_queries
+):
+    color, color_2 = color_attribute.values.all()
+    size = size_attribute.values.first()
+    product_a, product_b, product_c = product_list
+    product_d = models.Product.objects.create(
+        name="Product D",
+        slug="product-d",
+        price=product_a.price,
+        product_type=product_a.product_type,
+        category=product_a.category,
+    )
+    models.Product.objects.filter(pk=product_a.pk).update(
+        attribute_values=[color.pk, size.pk]
+    )
+    models.Product.objects.filter(pk=product_b.pk).update(
+        attribute_values=[color_2.pk, size.pk]
+    )
+    models.Product.objects.filter(pk=product_c.pk).update(attribute_values=[color.pk])
+    models.Product.objects.filter(pk=product_d.pk).update(attribute_values=[color_2.pk])
+    queries = {color_attribute.pk: [color.pk], size_attribute.pk: [size.pk]}
+
+    with assert_num_queries(4):
+        facets = get_attribute_values_facets(models.Product.objects.all(), queries)
+
+    # Each value is counted with the filters of the other attributes
+    assert facets == {color.pk: 1, color_2.pk: 1, size.pk: 1}
+
+
 @pytest.mark.parametrize(
     "expected_price, include_discounts",
     [(Decimal("10.00"), True), (Decimal("15.0"), False)],
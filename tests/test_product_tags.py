@@ -1,9 +1,11 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from django.core.cache import cache
 from django.templatetags.static import static
 from django.test import override_settings
 
+from saleor.core.renditions import create_renditions
 from saleor.product.templatetags.product_images import (
     choose_placeholder,
     get_product_image_thumbnail,
@@ -11,6 +13,47 @@ from saleor.product.templatetags.product_images import (
 )
 
 
+@override_settings(
+    VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False},
+    QUEUE_MISSING_RENDITIONS=True,
+)
+@patch("saleor.core.tasks.create_renditions_task.delay")
+def test_get_thumbnail_queues_missing_rendition(delay_mock, product_with_image):
+    cache.clear()
+    product_image = product_with_image.images.first()
+    product_image.image.create_on_demand = False
+
+    url = get_thumbnail(product_image.image, 540, method="thumbnail")
+    get_thumbnail(product_image.image, 540, method="thumbnail")
+
+    assert url == product_image.image.url
+    delay_mock.assert_called_once_with(
+        model="product.ProductImage",
+        pk=product_image.pk,
+        image_attr="image",
+        size_keys=["thumbnail__540x540"],
+    )
+
+
+@override_settings(
+    VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False},
+    QUEUE_MISSING_RENDITIONS=True,
+)
+@patch("saleor.core.tasks.create_renditions_task.delay")
+def test_get_thumbnail_of_known_rendition(delay_mock, product_with_image):
+    cache.clear()
+    product_image = product_with_image.images.first()
+    create_renditions(
+        "product.ProductImage", product_image.pk, "image", ["thumbnail__540x540"]
+    )
+    product_image.image.create_on_demand = False
+
+    url = get_thumbnail(product_image.image, 540, method="thumbnail")
+
+    assert url == product_image.image.thumbnail["540x540"].url
+    delay_mock.assert_not_called()
+
+
 @override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": True})
 def test_get_thumbnail():
     instance = Mock()
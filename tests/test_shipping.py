@@ -1,11 +1,15 @@
+from decimal import Decimal
+
 import pytest
+from django.db import DatabaseError, transaction
 from measurement.measures import Weight
 from prices import Money
 
+from saleor.shipping.index import ShippingBand, shipping_zone_index
 from saleor.shipping.models import ShippingMethod, ShippingMethodType, ShippingZone
 from saleor.shipping.utils import default_shipping_zone_exists
 
-from .utils import money
+from .utils import flush_post_commit_hooks, money
 
 
 def test_shipping_get_total(monkeypatch, shipping_zone):
@@ -144,3 +148,115 @@ def test_default_shipping_zone_exists(shipping_zone):
     shipping_zone.save()
     assert default_shipping_zone_exists()
     assert not default_shipping_zone_exists(shipping_zone.pk)
+
+
+def test_shipping_zone_index_rebuilt_on_shipping_method_change(shipping_zone):
+    method = shipping_zone.shipping_methods.get()
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert method in result
+
+    method.minimum_order_price = money(10)
+    method.save()
+
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert method not in result
+
+
+def test_shipping_zone_index_rebuilt_on_shipping_zone_delete(shipping_zone):
+    assert ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    default_zone = ShippingZone.objects.create(default=True, name="Default")
+    default_method = default_zone.shipping_methods.create(
+        minimum_order_price=money(0), type=ShippingMethodType.PRICE_BASED,
+    )
+
+    shipping_zone.delete()
+
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert list(result) == [default_method]
+
+
+def test_shipping_zone_index_ignores_methods_in_other_currency(shipping_zone):
+    shipping_zone.shipping_methods.update(currency="EUR")
+    shipping_zone_index.invalidate()
+
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert not result
+
+
+def test_shipping_zone_index_not_kept_after_rollback(shipping_zone):
+    method = shipping_zone.shipping_methods.get()
+    method.minimum_order_price = money(10)
+    flush_post_commit_hooks()
+
+    try:
+        with transaction.atomic():
+            method.save()
+            result = ShippingMethod.objects.applicable_shipping_methods(
+                price=money(5), weight=Weight(kg=0), country_code="PL"
+            )
+            assert method not in result
+            raise DatabaseError()
+    except DatabaseError:
+        pass
+
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert method in result
+
+
+def test_shipping_zone_index_rebuilt_after_max_age(settings, shipping_zone):
+    flush_post_commit_hooks()
+    shipping_zone_index.get()
+    shipping_zone.shipping_methods.update(currency="EUR")
+
+    settings.PROCESS_SNAPSHOT_MAX_AGE = 0
+
+    result = ShippingMethod.objects.applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+    assert not result
+
+
+def test_applicable_shipping_methods_of_filtered_queryset(shipping_zone):
+    default_zone = ShippingZone.objects.create(default=True, name="Default")
+    default_method = default_zone.shipping_methods.create(
+        minimum_order_price=money(0), type=ShippingMethodType.PRICE_BASED,
+    )
+
+    result = ShippingMethod.objects.filter(
+        shipping_zone=default_zone
+    ).applicable_shipping_methods(
+        price=money(5), weight=Weight(kg=0), country_code="PL"
+    )
+
+    assert list(result) == [default_method]
+
+
+def test_shipping_band_matches_decimal_edges():
+    band = ShippingBand()
+    band.add(Decimal("10.00"), Decimal("20.10"), 1)
+
+    assert band.matching(Decimal("20.10")) == [1]
+    assert band.matching(Decimal("20.11")) == []
+
+
+def test_shipping_band_matching():
+    band = ShippingBand()
+    band.add(10, 20, 1)
+    band.add(0, None, 2)
+    band.add(15, 15, 3)
+
+    assert band.matching(5) == [2]
+    assert band.matching(15) == [2, 1, 3]
+    assert band.matching(21) == [2]
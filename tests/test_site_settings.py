@@ -2,8 +2,12 @@ import pytest
 from django.contrib.sites.models import Site
 from django.db.utils import IntegrityError
 
+from saleor.core.taxes import charge_taxes_on_shipping, include_taxes_in_prices
 from saleor.site import utils
 from saleor.site.models import AuthorizationKey, SiteSettings
+from saleor.site.snapshot import get_site_settings, get_site_settings_translation
+
+from .utils import flush_post_commit_hooks
 
 
 def test_get_authorization_key_for_backend(
@@ -51,3 +55,53 @@ def test_new_get_current():
     assert result.domain == "mirumee.com"
     assert type(result.settings) == SiteSettings
     assert str(result.settings) == "mirumee.com"
+
+
+def test_site_settings_helpers_without_queries(
+    site_settings, django_assert_num_queries
+):
+    flush_post_commit_hooks()
+    get_site_settings()
+
+    with django_assert_num_queries(0):
+        assert include_taxes_in_prices() == site_settings.include_taxes_in_prices
+        assert charge_taxes_on_shipping() == site_settings.charge_taxes_on_shipping
+        assert get_site_settings().site.domain == "mirumee.com"
+        assert get_site_settings_translation("pl") is None
+
+
+def test_site_settings_snapshot_refreshed_on_save(site_settings):
+    flush_post_commit_hooks()
+    assert include_taxes_in_prices()
+
+    site_settings.include_taxes_in_prices = False
+    site_settings.save(update_fields=["include_taxes_in_prices"])
+
+    # Changes are visible in the transaction before it commits.
+    assert not include_taxes_in_prices()
+    flush_post_commit_hooks()
+    assert not include_taxes_in_prices()
+
+
+def test_site_settings_snapshot_refreshed_on_company_address_change(
+    site_settings, address
+):
+    site_settings.company_address = address
+    site_settings.save(update_fields=["company_address"])
+    flush_post_commit_hooks()
+    assert get_site_settings().company_address.city == address.city
+
+    address.city = "New City"
+    address.save(update_fields=["city"])
+    flush_post_commit_hooks()
+
+    assert get_site_settings().company_address.city == "New City"
+
+
+def test_site_settings_snapshot_includes_translations(site_settings):
+    site_settings.translations.create(language_code="pl", header_text="Witaj")
+    flush_post_commit_hooks()
+
+    translation = get_site_settings_translation("pl")
+
+    assert translation.header_text == "Witaj"
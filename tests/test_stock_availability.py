@@ -5,9 +5,13 @@ from saleor.core.exceptions import InsufficientStock
 from saleor.warehouse.availability import (
     are_all_product_variants_in_stock,
     check_stock_quantity,
+    check_stock_quantity_bulk,
+    get_available_quantities,
     get_available_quantity,
     get_available_quantity_for_customer,
     get_quantity_allocated,
+    get_variant_ids_in_stock,
+    is_variant_in_stock,
 )
 from saleor.warehouse.models import Allocation, Stock
 
@@ -47,6 +51,45 @@ def test_check_stock_quantity_without_one_stock(variant_with_many_stocks):
     assert check_stock_quantity(variant_with_many_stocks, COUNTRY_CODE, 4) is None
 
 
+def test_check_stock_quantity_bulk(
+    product_list, variant_with_many_stocks, order_line_with_allocation_in_many_stocks
+):
+    variants = [product.variants.get() for product in product_list]
+    variants.append(variant_with_many_stocks)
+
+    check_stock_quantity_bulk(variants, COUNTRY_CODE, [100, 100, 100, 4])
+
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_quantity_bulk(variants, COUNTRY_CODE, [100, 100, 100, 5])
+    assert exc.value.item == variant_with_many_stocks
+
+
+def test_check_stock_quantity_bulk_without_stocks(
+    product_list, django_assert_num_queries
+):
+    variants = [product.variants.get() for product in product_list]
+    variants[1].stocks.all().delete()
+    variants[1].track_inventory = False
+
+    with django_assert_num_queries(1):
+        with pytest.raises(InsufficientStock) as exc:
+            check_stock_quantity_bulk(variants, COUNTRY_CODE, [1, 1, 1])
+    assert exc.value.item == variants[1]
+
+
+def test_get_available_quantities(product_list, variant_with_many_stocks):
+    variants = [product.variants.get() for product in product_list]
+    variants.append(variant_with_many_stocks)
+    variants[0].stocks.all().delete()
+
+    available_quantities = get_available_quantities(variants, COUNTRY_CODE)
+
+    assert available_quantities == {
+        variant.pk: get_available_quantity(variant, COUNTRY_CODE)
+        for variant in variants[1:]
+    }
+
+
 def test_get_available_quantity_without_allocation(order_line, stock):
     assert not Allocation.objects.filter(order_line=order_line, stock=stock).exists()
     available_quantity = get_available_quantity(order_line.variant, COUNTRY_CODE)
@@ -137,6 +180,23 @@ def test_get_available_quantity_for_customer_without_country(
     assert available_quantity == 12
 
 
+def test_get_variant_ids_in_stock(product_list, variant_with_many_stocks):
+    variants = [product.variants.get() for product in product_list]
+    variants.append(variant_with_many_stocks)
+    variants[0].stocks.all().delete()
+    Stock.objects.filter(product_variant=variants[1]).update(quantity=0)
+    variants[2].track_inventory = False
+    variants[2].save(update_fields=["track_inventory"])
+    Stock.objects.filter(product_variant=variants[2]).update(quantity=0)
+
+    variant_ids = get_variant_ids_in_stock(variants, COUNTRY_CODE)
+
+    assert variant_ids == {variants[2].pk, variant_with_many_stocks.pk}
+    assert variant_ids == {
+        variant.pk for variant in variants if is_variant_in_stock(variant, COUNTRY_CODE)
+    }
+
+
 def test_get_quantity_allocated(
     variant_with_many_stocks, order_line_with_allocation_in_many_stocks
 ):